@@ -0,0 +1,93 @@
+# 핵심 기능:
+#   대시보드 데이터셋 캐시(module/datasets.py)의 세션당 비용을 st.cache_data 방식과 비교합니다.
+#   st.cache_data는 호출마다 캐시된 값을 pickle에서 되살린 사본을 주므로, 세션 수만큼 역직렬화 시간과 메모리가 듭니다.
+#   datasets.cached는 메모리 맵 Arrow 표의 zero-copy 뷰를 주므로 세션이 늘어도 공유 표 하나만 남습니다.
+#   - pickle: pickle.loads(캐시된 bytes) 한 번에 걸리는 시간, 세션 SESSIONS개가 들고 있는 사본 크기
+#   - arrow : datasets.cached 적중 한 번에 걸리는 시간, 세션 SESSIONS개의 뷰가 따로 쓰는 메모리(memory_report)
+#
+# 실행 예시:
+#   python benchmarks/dataset_cache.py
+#   python benchmarks/dataset_cache.py --sessions 20 --repeat 50
+
+import os
+import sys
+import time
+import pickle
+import shutil
+import tempfile
+import statistics
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import datasets, post_store
+
+SESSIONS = 8
+REPEAT = 20
+
+
+def load_handbags():
+    return post_store.read("handbags_subreddit")
+
+
+def load_yt():
+    # pages/6_🎧_Music_Streaming.py의 load_yt_data와 같은 읽기
+    df = pd.read_csv(os.path.join(BASE_DIR, "data", "us_weekly_yt.csv"),
+                     usecols=["date", "Artist Name", "Views"], parse_dates=["date"])
+    return df.rename(columns={"Artist Name": "artist", "Views": "views"})
+
+
+CASES = [
+    ("handbags_subreddit", "handbags_subreddit", load_handbags),
+    ("us_weekly_yt.csv", "data/us_weekly_yt.csv", load_yt),
+]
+
+
+def per_call(run, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def mb(n):
+    return n / 1024 / 1024
+
+
+def main(sessions=SESSIONS, repeat=REPEAT):
+    datasets.ARROW_DIR = tempfile.mkdtemp(prefix="arrow_cache_")
+    print(f"세션 {sessions}개, 반복 {repeat}회 중앙값")
+    print(f"{'dataset':<20} {'rows':>7} {'path':<7} {'ms/call':>8} {'MB/session':>11} {'MB total':>9}")
+    try:
+        for name, source, loader in CASES:
+            df = loader()
+            size = df.memory_usage(deep=True).sum()
+
+            blob = pickle.dumps(df)
+            ms = per_call(lambda: pickle.loads(blob), repeat)
+            copies = [pickle.loads(blob) for _ in range(sessions)]
+            print(f"{name:<20} {len(df):>7} {'pickle':<7} {ms:>8.2f} {mb(size):>11.2f} {mb(size * len(copies)):>9.2f}")
+            del copies
+
+            cached = datasets.cached(source)(loader)
+            cached()
+            ms = per_call(cached, repeat)
+            views = [cached() for _ in range(sessions)]
+            report = datasets.memory_report()
+            shared = next(d["shared_bytes"] for d in report["datasets"] if d["source"] == source)
+            private = sum(s["private_bytes"] for s in report["sessions"])
+            print(f"{'':<20} {'':>7} {'arrow':<7} {ms:>8.2f} {mb(private / len(views)):>11.2f} "
+                  f"{mb(shared + private):>9.2f}")
+            del views
+            datasets.clear()
+    finally:
+        shutil.rmtree(datasets.ARROW_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    sessions = int(args[args.index("--sessions") + 1]) if "--sessions" in args else SESSIONS
+    repeat = int(args[args.index("--repeat") + 1]) if "--repeat" in args else REPEAT
+    main(sessions, repeat)
@@ -0,0 +1,273 @@
+# 핵심 기능:
+#   오프라인 부하 측정용 로컬 Reddit API 대역(stand-in) 서버. 수집기가 쓰는 엔드포인트만 흉내 냅니다.
+#   - POST /api/v1/access_token            : 스크립트 앱(password grant) 토큰 발급
+#   - GET  /r/{sub}/new, /r/{sub}/search   : 최신순 목록 (limit ≤ 100, after=t3_... 페이지 넘김)
+#   - GET  /comments/{id}                  : 게시글 + 댓글 트리 (앞 INLINE개만 트리로, 나머지는 "more")
+#   - POST /api/morechildren               : "more" 펼치기 (한 번에 MORE_BATCH개, 남으면 다시 "more")
+#   - GET  /api/info?id=t3_...             : 게시글 지표 조회
+#   게시글/댓글은 서브레딧 이름과 순번에서 결정적으로 만들어 내므로 100만 개 규모도 메모리를 쓰지 않습니다.
+#   모든 응답에 x-ratelimit-used/remaining/reset 헤더를 붙이고, 창(window)마다 quota를 넘으면 429를 돌려줍니다.
+#
+# 사용 예:
+#   python benchmarks/fake_reddit.py --port 8765 --posts 1000000 --comments 10
+#   REDDIT_OAUTH_URL=http://127.0.0.1:8765 REDDIT_URL=http://127.0.0.1:8765 python module/reddit_search_subreddit.py hoka
+#
+#   from benchmarks.fake_reddit import start
+#   server = start(posts=20000, comments=10)     # 스레드에서 실행, server.url / server.reddit.requests
+
+import sys
+import json
+import time
+import zlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+POSTS = 10000          # 서브레딧(또는 검색 결과)별 게시글 수
+COMMENTS = 10          # 게시글당 평균 댓글 수
+HOT_EVERY = 50         # 게시글 HOT_EVERY개 중 하나는 평균의 HOT_FACTOR배 댓글이 달린 인기 게시글
+HOT_FACTOR = 40
+INTERVAL = 60          # 게시글 사이 간격(초)
+INLINE = 200           # /comments 응답에 트리로 바로 넣는 댓글 수
+MORE_BATCH = 100       # /api/morechildren 한 번에 돌려주는 댓글 수
+QUOTA = 1000           # 창마다 허용하는 요청 수 (Reddit OAuth: 10분에 1000회)
+WINDOW = 600           # 쿼터 창(초)
+
+_BASE = 36 ** 6        # 게시글 id 번호 시작값 (6자리 이상 36진수)
+_SLOT_BITS = 24        # 서브레딧 슬롯 안의 순번 비트 수 (슬롯당 최대 약 1,600만 개)
+_COMMENT_BITS = 14     # 게시글 안의 댓글 순번 비트 수 (게시글당 최대 16,383개)
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def base36(num):
+    out = ""
+    while num:
+        num, r = divmod(num, 36)
+        out = _DIGITS[r] + out
+    return out or "0"
+
+
+class FakeReddit:
+    """
+    결정적으로 생성되는 게시글/댓글 데이터와 요청 쿼터.
+    """
+
+    def __init__(self, posts=POSTS, comments=COMMENTS, interval=INTERVAL, quota=QUOTA, window=WINDOW, now=None):
+        self.posts = posts
+        self.comments = comments
+        self.interval = interval
+        self.quota = quota
+        self.window = window
+        self.now = now or time.time()
+        self.slots = {}              # 슬롯 번호 -> 서브레딧 이름
+        self.requests = 0
+        self.throttled = 0
+        self._window_start = time.monotonic()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    # ---- 쿼터 ----
+    def take(self):
+        """
+        요청 하나를 세고 (허용 여부, 응답 헤더)를 반환합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._window_start, self._used = now, 0
+            self.requests += 1
+            allowed = self._used < self.quota
+            if allowed:
+                self._used += 1
+            else:
+                self.throttled += 1
+            reset = max(0, int(self.window - (now - self._window_start)))
+            headers = {"x-ratelimit-used": str(self._used),
+                       "x-ratelimit-remaining": str(float(self.quota - self._used)),
+                       "x-ratelimit-reset": str(reset)}
+            return allowed, headers
+
+    # ---- 게시글 ----
+    def slot(self, sub):
+        slot = zlib.crc32(sub.lower().encode()) % 4096
+        self.slots.setdefault(slot, sub)
+        return slot
+
+    def post_num(self, sub, i):
+        return _BASE + (self.slot(sub) << _SLOT_BITS) + i
+
+    def post(self, num):
+        slot, i = (num - _BASE) >> _SLOT_BITS, (num - _BASE) & ((1 << _SLOT_BITS) - 1)
+        sub = self.slots.get(slot, "unknown")
+        pid = base36(num)
+        n_comments = self.num_comments(i)
+        return {
+            "id": pid, "name": f"t3_{pid}", "subreddit": sub, "subreddit_id": f"t5_{base36(slot + 1000)}",
+            "subreddit_name_prefixed": f"r/{sub}", "author": f"user{i % 997}",
+            "title": f"{sub} post {i}" + (f" about {sub}" if i % 3 == 0 else ""),
+            "selftext": f"synthetic body {i} " * (1 + i % 5),
+            "created_utc": float(int(self.now) - i * self.interval), "score": (i * 7) % 500,
+            "num_comments": n_comments, "permalink": f"/r/{sub}/comments/{pid}/", "url": f"/r/{sub}/comments/{pid}/",
+            "is_self": True,
+        }
+
+    def num_comments(self, i):
+        """
+        평균이 self.comments가 되도록: 인기 게시글은 HOT_FACTOR배, 나머지는 남은 몫을 0 ~ 2배 사이로 분포
+        """
+        if i % HOT_EVERY == 0:
+            return HOT_FACTOR * self.comments
+        rest = self.comments * (HOT_EVERY - HOT_FACTOR) // (HOT_EVERY - 1)
+        return (i * 2654435761 >> 7) % (2 * rest + 1)
+
+    def listing(self, sub, after=None, limit=100, query=None):
+        """
+        sub의 최신순 목록 한 페이지. query가 있으면 순번이 3의 배수인 게시글만 (검색 결과 흉내)
+        """
+        start = 0
+        if after:
+            start = ((int(after.split("_", 1)[1], 36) - _BASE) & ((1 << _SLOT_BITS) - 1)) + 1
+        step = 3 if query else 1
+        start = -(-start // step) * step
+        indices = range(start, self.posts, step)[:max(1, min(100, limit))]
+        children = [{"kind": "t3", "data": self.post(self.post_num(sub, i))} for i in indices]
+        last = indices[-1] if len(indices) else None
+        has_more = last is not None and last + step < self.posts
+        return _listing(children, after=children[-1]["data"]["name"] if has_more else None)
+
+    def info(self, fullnames):
+        return _listing([{"kind": "t3", "data": self.post(int(name.split("_", 1)[1], 36))}
+                         for name in fullnames if name.startswith("t3_")])
+
+    # ---- 댓글 ----
+    def comment(self, post_num, j, replies=""):
+        post = self.post(post_num)
+        num = (post_num << _COMMENT_BITS) + j
+        cid = base36(num)
+        parent = post["name"] if j % 3 == 0 else f"t1_{base36((post_num << _COMMENT_BITS) + j - j % 3)}"
+        return {"kind": "t1", "data": {
+            "id": cid, "name": f"t1_{cid}", "parent_id": parent, "link_id": post["name"],
+            "subreddit": post["subreddit"], "author": f"commenter{j % 211}", "body": f"comment {j} on {post['id']}",
+            "created_utc": post["created_utc"] + 30 * (j + 1), "score": j % 17, "replies": replies,
+            "depth": 0 if j % 3 == 0 else 1,
+        }}
+
+    def more(self, post_num, js):
+        ids = [base36((post_num << _COMMENT_BITS) + j) for j in js]
+        return {"kind": "more", "data": {"count": len(ids), "name": f"t1_{ids[0]}", "id": ids[0],
+                                         "parent_id": f"t3_{base36(post_num)}", "depth": 0, "children": ids}}
+
+    def comment_page(self, post_id):
+        """
+        [게시글 목록, 댓글 목록]. 앞 INLINE개는 (최상위 댓글 + 답글) 트리로, 나머지는 "more" 하나로.
+        """
+        post_num = int(post_id, 36)
+        n = min(self.post(post_num)["num_comments"], (1 << _COMMENT_BITS) - 1)
+        inline = min(n, INLINE)
+        top = []
+        for j in range(0, inline, 3):
+            replies = [self.comment(post_num, k) for k in range(j + 1, min(j + 3, inline))]
+            top.append(self.comment(post_num, j, _listing(replies) if replies else ""))
+        if n > inline:
+            top.append(self.more(post_num, range(inline, n)))
+        return [_listing([{"kind": "t3", "data": self.post(post_num)}]), _listing(top)]
+
+    def morechildren(self, link_id, children):
+        """
+        children 중 앞 MORE_BATCH개를 평평한 목록으로, 남은 id는 새 "more"로 돌려줍니다.
+        """
+        post_num = int(link_id.split("_", 1)[1], 36)
+        js = [int(c, 36) & ((1 << _COMMENT_BITS) - 1) for c in children if c]
+        things = [self.comment(post_num, j) for j in js[:MORE_BATCH]]
+        if len(js) > MORE_BATCH:
+            things.append(self.more(post_num, js[MORE_BATCH:]))
+        return {"json": {"errors": [], "data": {"things": things}}}
+
+
+def _listing(children, after=None):
+    return {"kind": "Listing", "data": {"after": after, "before": None, "dist": len(children), "children": children}}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    reddit = None    # FakeReddit
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self, method):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if method == "POST":
+            length = int(self.headers.get("Content-Length", 0))
+            query.update({k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()})
+        parts = [p for p in url.path.split("/") if p]
+        if parts == ["api", "v1", "access_token"]:
+            return 200, {"access_token": "fake-token", "token_type": "bearer", "expires_in": 86400, "scope": "*"}
+        allowed, headers = self.reddit.take()
+        self._ratelimit = headers
+        if not allowed:
+            return 429, {"message": "Too Many Requests", "error": 429}
+        limit = int(query.get("limit", 100))
+        if len(parts) == 3 and parts[0] == "r" and parts[2] in ("new", "search"):
+            q = query.get("q") if parts[2] == "search" else None
+            return 200, self.reddit.listing(parts[1], query.get("after"), limit, q)
+        if len(parts) >= 2 and parts[0] == "comments":
+            return 200, self.reddit.comment_page(parts[1])
+        if parts == ["api", "morechildren"]:
+            return 200, self.reddit.morechildren(query["link_id"], query.get("children", "").split(","))
+        if parts == ["api", "info"]:
+            return 200, self.reddit.info(query.get("id", "").split(","))
+        return 404, {"message": "Not Found", "error": 404}
+
+    def _handle(self, method):
+        self._ratelimit = {}
+        status, body = self._route(method)
+        self._send(status, body, self._ratelimit)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+def start(port=0, **config):
+    """
+    서버를 데몬 스레드에서 시작합니다. 반환된 서버의 .url로 접속하고 .reddit(FakeReddit)로 통계를 봅니다.
+    """
+    reddit = FakeReddit(**config)
+    handler = type("FakeRedditHandler", (Handler,), {"reddit": reddit})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.reddit = reddit
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(name, default):
+        return type(default)(args[args.index(name) + 1]) if name in args else default
+
+    server = start(port=option("--port", 8765), posts=option("--posts", POSTS), comments=option("--comments", COMMENTS),
+                   quota=option("--quota", QUOTA), window=option("--window", WINDOW))
+    print(f"🟢 fake Reddit API: {server.url} (게시글 {server.reddit.posts}개/서브레딧, 댓글 평균 {server.reddit.comments}개)")
+    print(f"   REDDIT_OAUTH_URL={server.url} REDDIT_URL={server.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
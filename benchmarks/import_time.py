@@ -0,0 +1,66 @@
+# 핵심 기능:
+#   Data Collection 페이지가 불러오는 수집 모듈 4개의 import 시간을 측정합니다.
+#   페이지에서는 pandas/pyarrow/requests가 이미 로드되어 있으므로 미리 import한 뒤,
+#   새 인터프리터에서 수집 모듈 import에 걸린 시간만 잽니다. (REPEAT회 반복 후 중앙값)
+#
+# 실행 예시:
+#   python benchmarks/import_time.py
+#   python benchmarks/import_time.py --repeat 20
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REPEAT = 10
+
+MODULES = [
+    "module.reddit",
+    "module.reddit_other_subreddits",
+    "module.reddit_search",
+    "module.reddit_search_subreddit",
+]
+
+SNIPPET = """
+import sys, json, time
+import pandas, pyarrow.parquet, requests
+t = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - t
+print(json.dumps({{"ms": elapsed * 1000, "praw_loaded": "praw" in sys.modules}}))
+"""
+
+# 수집 모듈이 import 시점에 secrets를 읽던 구조에서도 측정할 수 있도록 더미 값을 넣어 둠
+DUMMY_ENV = {
+    "REDDIT_CLIENT_ID": "bench",
+    "REDDIT_CLIENT_SECRET": "bench",
+    "USERNAME": "bench",
+    "PASSWORD": "bench",
+    "REDDIT_USER_AGENT": "import-benchmark",
+}
+
+
+def run_once():
+    env = {**DUMMY_ENV, **os.environ}
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(modules=MODULES)],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(repeat=REPEAT):
+    results = [run_once() for _ in range(repeat)]
+    times = [r["ms"] for r in results]
+    print(f"collector import: median {statistics.median(times):.1f} ms "
+          f"(min {min(times):.1f} / max {max(times):.1f}, n={repeat}), "
+          f"praw loaded at import: {results[0]['praw_loaded']}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    repeat = int(args[args.index("--repeat") + 1]) if "--repeat" in args else REPEAT
+    main(repeat)
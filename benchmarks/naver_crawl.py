@@ -0,0 +1,117 @@
+# 핵심 기능:
+#   record/replay HTTP 캐시(module/http_cache.py)에 저장해 둔 네이버 증권 응답으로 크롤러 처리량을 측정합니다.
+#   네트워크 없이 같은 응답을 재생하므로, 크롤러 성능 변경 전후를 같은 조건에서 비교할 수 있습니다.
+#   - board: crawl_pages 순차(window=1) / 미리 요청(window=PREFETCH)
+#   - body:  fetch_bodies 작업자 1개 / WORKERS개
+#   - parse: 저장된 응답을 naver_parse로 파싱하는 데 걸린 시간 (페이지당 ms)
+#   재생 중에는 요청 속도 제한(rate_limit.naver_bucket)을 풀어 크롤러 자체의 처리량만 잽니다.
+#   녹화된 응답은 저장소에 포함되어 있지 않습니다. 캐시 디렉터리에 manifest.json이 없으면 첫 실행에서
+#   RECORD_CODE 종목의 최근 RECORD_HOURS시간 게시글과 본문을 네트워크에서 한 번 저장(record)한 뒤 측정하고,
+#   그다음 실행부터는 네트워크 없이 저장된 응답만 재생합니다. (다른 대상을 녹화하려면 --record)
+#
+# 실행 예시:
+#   python benchmarks/naver_crawl.py                                                  # 처음에는 자동 녹화 후 측정
+#   python benchmarks/naver_crawl.py --record 005930 "2025.05.18 00:00" --bodies 200   # 대상을 정해 다시 녹화
+#   python benchmarks/naver_crawl.py --cache data/http_cache --repeat 5
+
+import os
+import sys
+import json
+import time
+import statistics
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import http_cache, naver_board, naver_content, naver_parse, rate_limit
+
+REPEAT = 3
+BODIES = 200
+MANIFEST = "manifest.json"
+RECORD_CODE = "005930"   # 녹화된 응답이 없을 때 자동으로 녹화하는 종목
+RECORD_HOURS = 6         # 자동 녹화 기준 날짜: 지금부터 RECORD_HOURS시간 전
+
+
+def record(code, threshold_str, bodies=BODIES, directory=http_cache.CACHE_DIR):
+    """
+    실제로 수집하면서 응답을 저장하고, 측정에 쓸 대상(종목, 기준 날짜, 본문 URL)을 manifest에 남깁니다.
+    미리 요청하는 페이지까지 저장되도록 window=PREFETCH로 수집합니다.
+    """
+    http_cache.enable("record", directory)
+    threshold = datetime.strptime(threshold_str, "%Y.%m.%d %H:%M")
+    posts = naver_board.crawl_pages(code, threshold, window=naver_board.PREFETCH)
+    body_urls = [p["url"] for p in posts if p["url"]][:bodies]
+    for _ in naver_content.fetch_bodies(body_urls):
+        pass
+    manifest = {"code": code, "threshold": threshold_str, "rows": len(posts), "body_urls": body_urls}
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(f"✅ {code}: 게시글 {len(posts)}개, 본문 {len(body_urls)}개 응답을 {directory}에 저장했습니다")
+
+
+def timed(run, repeat):
+    """
+    run()을 repeat회 실행해 (중앙값 초, 마지막 결과)를 반환합니다.
+    """
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def report(name, seconds, pages, rows):
+    print(f"{name:<26} {pages:>6} {rows:>7} {seconds:>8.3f} {pages / seconds:>9.1f} {rows / seconds:>9.1f} "
+          f"{seconds / pages * 1000:>8.2f}")
+
+
+def main(directory=http_cache.CACHE_DIR, repeat=REPEAT):
+    manifest_path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(manifest_path):
+        threshold_str = (datetime.now() - timedelta(hours=RECORD_HOURS)).strftime("%Y.%m.%d %H:%M")
+        print(f"📥 {manifest_path}가 없어 {RECORD_CODE} 최근 {RECORD_HOURS}시간 응답을 네트워크에서 한 번 저장합니다")
+        record(RECORD_CODE, threshold_str, BODIES, directory)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    code, threshold = manifest["code"], datetime.strptime(manifest["threshold"], "%Y.%m.%d %H:%M")
+    body_urls = manifest["body_urls"]
+
+    http_cache.enable("replay", directory)
+    rate_limit.naver_bucket.rate = rate_limit.naver_bucket.capacity = float("inf")
+
+    print(f"{code} (기준 {manifest['threshold']}), 반복 {repeat}회 중앙값")
+    print(f"{'path':<26} {'pages':>6} {'rows':>7} {'sec':>8} {'pages/s':>9} {'rows/s':>9} {'ms/page':>8}")
+    for window in (1, naver_board.PREFETCH):
+        pages = []
+        seconds, posts = timed(lambda: naver_board.crawl_pages(
+            code, threshold, window=window, progress=lambda page, rows: pages.append(page)), repeat)
+        report(f"board window={window}", seconds, pages[-1], len(posts))
+    for workers in (1, naver_content.WORKERS):
+        seconds, bodies = timed(lambda: list(naver_content.fetch_bodies(body_urls, workers)), repeat)
+        report(f"body workers={workers}", seconds, len(bodies), sum(1 for b in bodies if b))
+
+    # 파싱만: 저장된 응답 바이트를 바로 파싱
+    boards = [http_cache.get(url, directory)[2] for url in http_cache.urls(directory) if "/item/board.naver?" in url]
+    bodies = [http_cache.get(url, directory)[2] for url in body_urls]
+    for backend in ("lxml", "bs4"):
+        seconds, rows = timed(lambda: [r for c in boards for r in naver_parse.board_rows(c, backend) or []], repeat)
+        report(f"parse board ({backend})", seconds, len(boards), len(rows))
+        seconds, texts = timed(lambda: [naver_parse.body_text(c, backend) for c in bodies], repeat)
+        report(f"parse body ({backend})", seconds, len(bodies), sum(1 for t in texts if t))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    directory = http_cache.CACHE_DIR
+    if "--cache" in args:
+        i = args.index("--cache")
+        directory = os.path.abspath(args[i + 1])
+        del args[i:i + 2]
+    if "--record" in args:
+        i = args.index("--record")
+        bodies = int(args[args.index("--bodies") + 1]) if "--bodies" in args else BODIES
+        record(args[i + 1], args[i + 2], bodies, directory)
+    else:
+        repeat = int(args[args.index("--repeat") + 1]) if "--repeat" in args else REPEAT
+        main(directory, repeat)
@@ -0,0 +1,50 @@
+# 핵심 기능:
+#   저장해 둔 네이버 증권 HTML(benchmarks/fixtures)로 목록/본문 파싱 처리량을 측정합니다.
+#   기존 BeautifulSoup 방식("bs4")과 lxml/XPath 방식("lxml")의 결과가 같은지 먼저 확인한 뒤,
+#   각 방식으로 REPEAT회 파싱해 초당 페이지 수를 출력합니다.
+#
+# 실행 예시:
+#   python benchmarks/naver_parse.py
+#   python benchmarks/naver_parse.py --repeat 500
+
+import os
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+FIXTURE_DIR = os.path.join(BASE_DIR, "benchmarks", "fixtures")
+sys.path.append(BASE_DIR)
+from module import naver_parse
+
+REPEAT = 200
+
+CASES = [
+    ("board", "naver_board.html", naver_parse.board_rows),
+    ("body", "naver_body.html", naver_parse.body_text),
+]
+
+
+def measure(parse, content, backend, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(content, backend=backend)
+    return repeat / (time.perf_counter() - start)
+
+
+def main(repeat=REPEAT):
+    for name, filename, parse in CASES:
+        with open(os.path.join(FIXTURE_DIR, filename), "rb") as f:
+            content = f.read()
+        expected = parse(content, backend="bs4")
+        if parse(content, backend="lxml") != expected:
+            raise SystemExit(f"❌ {name}: bs4와 lxml 결과가 다릅니다")
+        bs4_rate = measure(parse, content, "bs4", repeat)
+        lxml_rate = measure(parse, content, "lxml", repeat)
+        print(f"{name:<6} {len(content) / 1024:5.1f} KB | bs4 {bs4_rate:7.1f} pages/s | "
+              f"lxml {lxml_rate:7.1f} pages/s | x{lxml_rate / bs4_rate:.1f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    repeat = int(args[args.index("--repeat") + 1]) if "--repeat" in args else REPEAT
+    main(repeat)
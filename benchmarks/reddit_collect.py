@@ -0,0 +1,100 @@
+# 핵심 기능:
+#   로컬 Reddit API 대역 서버(benchmarks/fake_reddit.py)를 띄우고, 실제 수집 코드 경로를 처음부터 끝까지 측정합니다.
+#   풀에서 빌린 praw 클라이언트(reddit_client.get_reddit)를 REDDIT_OAUTH_URL / REDDIT_URL로 로컬 서버에 연결하고,
+#   저장 경로(post_store, cursors, 실패 목록, 로그)는 임시 디렉터리로 돌려 실제 data/를 건드리지 않습니다.
+#   - listing : reddit_search_subreddit.get_new_posts (최신순 목록 페이지 넘김)
+#   - store   : post_store.append 새 게시글 / 같은 게시글 다시 추가 (중복 제거)
+#   - comments: reddit_search_subreddit.harvest_comments (댓글 트리 + more 펼치기, 청크 단위 저장)
+#   - search  : reddit_search.get_new_posts
+#   - refresh : reddit_refresh.fetch_metrics (/api/info 100개씩)
+#
+# 실행 예시:
+#   python benchmarks/reddit_collect.py                                  # 게시글 2만 개, 댓글 평균 10개
+#   python benchmarks/reddit_collect.py --posts 1000000 --comments 10    # 100만 게시글 / 약 1,000만 댓글 (CI)
+#   python benchmarks/reddit_collect.py --posts 5000 --quota 1000 --window 60   # 쿼터 헤더/429 동작 확인
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import fake_reddit
+
+POSTS = 20000
+COMMENTS = 10
+QUOTA = 10 ** 9       # 기본은 쿼터 제한 없이 수집 코드의 처리량만 측정
+WINDOW = 600
+SUBREDDIT = "benchsub"
+
+DUMMY_ENV = {
+    "REDDIT_CLIENT_ID": "bench",
+    "REDDIT_CLIENT_SECRET": "bench",
+    "USERNAME": "bench",
+    "PASSWORD": "bench",
+    "REDDIT_USER_AGENT": "collect-benchmark",
+}
+
+
+def redirect_storage(directory):
+    """
+    수집 모듈의 저장 경로를 directory 아래로 바꿉니다.
+    """
+    from module import post_store, cursors, comment_harvester, reddit_search_subreddit, reddit_search, reddit_refresh
+    post_store.DATA_DIR = directory
+    post_store.STORE_DIR = os.path.join(directory, "store")
+    cursors.CURSOR_PATH = os.path.join(directory, "cursors.json")
+    comment_harvester.DATA_DIR = directory
+    for module in (reddit_search_subreddit, reddit_search, reddit_refresh):
+        module.LOG_PATH = os.path.join(directory, "run_log.txt")
+
+
+def report(stage, items, requests, seconds):
+    print(f"{stage:<22} {items:>10} {requests:>9} {seconds:>9.2f} {items / seconds if seconds else 0:>11.0f}")
+
+
+def main(posts=POSTS, comments=COMMENTS, quota=QUOTA, window=WINDOW):
+    server = fake_reddit.start(posts=posts, comments=comments, quota=quota, window=window)
+    os.environ.update({**DUMMY_ENV, "REDDIT_OAUTH_URL": server.url, "REDDIT_URL": server.url})
+    workdir = tempfile.mkdtemp(prefix="reddit_bench_")
+    redirect_storage(workdir)
+    from module import post_store, reddit_search_subreddit, reddit_search, reddit_refresh, rate_limit
+    from module.reddit_client import get_reddit, clients_created
+
+    stats = server.reddit
+    print(f"fake Reddit {server.url}: 게시글 {posts}개, 댓글 평균 {comments}개, 쿼터 {quota}/{window}초")
+    print(f"{'stage':<22} {'items':>10} {'requests':>9} {'sec':>9} {'items/s':>11}")
+
+    def stage(name, run, count):
+        before, start = stats.requests, time.perf_counter()
+        result = run()
+        report(name, count(result), stats.requests - before, time.perf_counter() - start)
+        return result
+
+    try:
+        df = stage("listing", lambda: reddit_search_subreddit.get_new_posts(
+            SUBREDDIT, days_window=posts * fake_reddit.INTERVAL // 86400 + 2, limit=posts), len)
+        dataset = f"{SUBREDDIT}_subreddit"
+        stage("store (new)", lambda: post_store.append(dataset, df), lambda added: added)
+        stage("store (duplicates)", lambda: post_store.append(dataset, df), lambda _: len(df))
+        stage("comments", lambda: reddit_search_subreddit.harvest_comments(
+            f"{SUBREDDIT}_comments", df["id"]), lambda added: added)
+        stage("search", lambda: reddit_search.get_new_posts("bench", subreddit=SUBREDDIT, limit=1000), len)
+        stage("refresh", lambda: reddit_refresh.fetch_metrics(get_reddit(), df["id"]), len)
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(f"서버 요청 {stats.requests}회 (429 {stats.throttled}회) / 쿼터 대기 {rate_limit.reddit_quota.waited:.1f}초"
+          f" / praw 클라이언트 {clients_created()}개")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(name, default):
+        return type(default)(args[args.index(name) + 1]) if name in args else default
+
+    main(option("--posts", POSTS), option("--comments", COMMENTS), option("--quota", QUOTA), option("--window", WINDOW))
@@ -0,0 +1,99 @@
+# 핵심 기능:
+#   여러 수집 대상(서브레딧, 키워드 검색, 서브레딧+키워드)을 작업자 풀에서 동시에 수집합니다.
+#   모든 작업자는 rate_limit.reddit_quota 하나를 공유하므로, 전체 소요 시간은 고정 sleep의 합이 아니라
+#   Reddit 쿼터(응답 헤더 기준)에 의해 결정됩니다. 각 대상은 끝나는 즉시 해당 모듈의 update()가 저장소에 기록합니다.
+#
+# 대상 표기:
+#   r/hoka                       -> 서브레딧 hoka 신규 게시글 (reddit_search_subreddit.update)
+#   r/askrunningshoegeeks:hoka   -> 서브레딧 안에서 키워드 hoka 검색 (reddit_search.update)
+#   hoka                         -> 전체 서브레딧에서 키워드 hoka 검색 (reddit_search.update)
+#
+# reddit.py(r/Hoka 고정)와 reddit_other_subreddits.py(전체 서브레딧 키워드 검색)는 대상으로 받지 않습니다.
+# 두 모듈은 단일 대상용 수집기이며, 같은 dataset(hoka_subreddit, {keyword}_posts)은 각각 r/hoka, hoka 대상으로 수집됩니다.
+#
+# 대시보드의 일괄 수집 작업은 대상들이 쓰는 dataset(batch_datasets)을 모두 jobs claims로 잡아,
+# 같은 dataset을 쓰는 다른 작업(개별 수집 등)과 동시에 실행되지 않게 합니다.
+#
+# CLI 실행 예시:
+#   python batch_collect.py r/hoka r/handbags hoka "r/askrunningshoegeeks:hoka"
+#   python batch_collect.py -f targets.txt --workers 6 --with-comments
+
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import request_policy, rate_limit, batch_runner
+from module import reddit_search, reddit_search_subreddit
+
+WORKERS = 4
+
+
+def parse_target(spec):
+    """
+    대상 문자열을 {"spec", "kind", "subreddit", "keyword"} dict로 변환합니다.
+    """
+    spec = spec.strip()
+    if spec.startswith("r/"):
+        name, _, keyword = spec[2:].partition(":")
+        if keyword:
+            return {"spec": spec, "kind": "search", "subreddit": name, "keyword": keyword}
+        return {"spec": spec, "kind": "subreddit", "subreddit": name, "keyword": None}
+    return {"spec": spec, "kind": "search", "subreddit": "all", "keyword": spec}
+
+
+def search_base(target):
+    # 전체 서브레딧 검색은 키워드 dataset, 서브레딧 안 검색은 {subreddit}_{keyword} dataset에 저장
+    return None if target["subreddit"] == "all" else f"{target['subreddit']}_{target['keyword']}"
+
+
+def target_datasets(target):
+    """
+    대상이 쓰는 dataset 이름 목록. (서브레딧은 댓글 dataset 포함)
+    """
+    if target["kind"] == "subreddit":
+        return list(reddit_search_subreddit.dataset_names(target["subreddit"]))
+    return [reddit_search.dataset_name(target["keyword"], search_base(target))]
+
+
+def batch_datasets(specs):
+    return sorted({name for s in specs if s.strip() for name in target_datasets(parse_target(s))})
+
+
+def collect_target(target, collect_comments=False):
+    if target["kind"] == "subreddit":
+        reddit_search_subreddit.update(target["subreddit"], collect_comments=collect_comments)
+    else:
+        reddit_search.update(search_subreddit=target["subreddit"], keyword=target["keyword"],
+                             csv_filename_base=search_base(target))
+
+
+def run_batch(specs, workers=WORKERS, collect_comments=False, on_done=None):
+    """
+    대상 목록을 동시에 수집하고 대상별 결과 dict 목록을 완료 순서대로 반환합니다.
+    on_done(result)가 주어지면 대상 하나가 끝날 때마다 호출합니다.
+    """
+    def work(target, result):
+        result["target"] = target["spec"]
+        collect_target(target, collect_comments)
+
+    targets = [parse_target(s) for s in specs if s.strip()]
+    return batch_runner.run_all(targets, work, workers, on_done=on_done)
+
+
+def print_summary(results):
+    batch_runner.print_table(results, [("target", "target", 40, "<"), ("sec", "seconds", 7, ">")])
+    requests_made = sum(e["requests"] for e in request_policy.stats.targets.values())
+    print(f"API 요청 {requests_made}회 / 쿼터 대기 {rate_limit.reddit_quota.waited:.1f}초")
+    print(request_policy.stats.summary())
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args:
+        print("❗ 수집 대상을 입력하세요. 예: python batch_collect.py r/hoka hoka \"r/askrunningshoegeeks:hoka\" [-f targets.txt] [--workers 4] [--with-comments]\n"
+              "   (reddit.py, reddit_other_subreddits.py는 대상이 아님: 같은 dataset을 r/hoka, hoka 대상으로 수집)")
+        sys.exit(1)
+
+    specs, options = batch_runner.parse_args(args, {"workers": WORKERS}, flags=("with-comments",))
+    print_summary(run_batch(specs, workers=options["workers"], collect_comments=options["with_comments"]))
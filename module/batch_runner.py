@@ -0,0 +1,80 @@
+# 핵심 기능:
+#   일괄 수집기(batch_collect, naver_batch)가 함께 쓰는 실행 틀.
+#   - run_all: 대상마다 work(target, result)를 작업자 풀에서 실행하고, 소요 시간과 오류를 result에 기록
+#   - print_table: 대상별 결과 표 출력 (마지막 status 컬럼은 공통)
+#   - parse_args: 대상 목록(인수 + -f 파일)과 --옵션 값을 읽음
+#   대상 표기 해석과 대상별 수집 작업, 요약의 합계 줄은 각 수집기 모듈에 둡니다.
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def run_all(targets, work, workers, on_done=None):
+    """
+    targets를 작업자 workers개로 동시에 처리하고 대상별 결과 dict 목록을 완료 순서대로 반환합니다.
+    work(target, result)는 result에 대상별 값을 채웁니다. 예외가 나면 result["error"]에 메시지를 남깁니다.
+    on_done(result)가 주어지면 대상 하나가 끝날 때마다 호출합니다.
+    """
+    results = []
+
+    def run(target):
+        result = {}
+        started = time.monotonic()
+        try:
+            work(target, result)
+            result["error"] = None
+        except Exception as e:
+            result["error"] = str(e)
+        result["seconds"] = round(time.monotonic() - started, 1)
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run, t) for t in targets]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_done is not None:
+                on_done(result)
+    return results
+
+
+def print_table(results, columns):
+    """
+    columns [(제목, result 키, 폭, 정렬 "<" 또는 ">")] 순서로 결과 표를 출력합니다.
+    """
+    print(" ".join(f"{title:{align}{width}}" for title, _, width, align in columns) + "  status")
+    for r in results:
+        status = "ok" if r["error"] is None else f"🔴 {r['error']}"
+        print(" ".join(f"{r[key]:{align}{width}}" for _, key, width, align in columns) + f"  {status}")
+
+
+def parse_args(args, options=None, flags=()):
+    """
+    CLI 인수를 (대상 목록, 옵션 dict)로 변환합니다.
+    - -f 파일: 한 줄에 대상 하나 (빈 줄과 #으로 시작하는 줄 제외)
+    - options {"이름": 기본값}: --이름 값 (기본값의 타입으로 변환, 기본값이 None이면 문자열)
+    - flags ("이름", ...): --이름 (있으면 True)
+    옵션 dict의 키는 이름의 "-"를 "_"로 바꾼 것입니다.
+    """
+    options = dict(options or {})
+    values = {name.replace("-", "_"): default for name, default in options.items()}
+    values.update({name.replace("-", "_"): False for name in flags})
+    specs = []
+    i = 0
+    while i < len(args):
+        name = args[i][2:] if args[i].startswith("--") else None
+        if args[i] == "-f":
+            with open(args[i + 1], encoding="utf-8") as f:
+                specs.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+            i += 2
+        elif name in options:
+            default = options[name]
+            values[name.replace("-", "_")] = args[i + 1] if default is None else type(default)(args[i + 1])
+            i += 2
+        elif name in flags:
+            values[name.replace("-", "_")] = True
+            i += 1
+        else:
+            specs.append(args[i])
+            i += 1
+    return specs, values
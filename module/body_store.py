@@ -0,0 +1,126 @@
+# 핵심 기능:
+#   네이버 증권 게시글 본문 저장소. 종목별 SQLite 파일(data/debate/{code}_bodies.sqlite)에
+#   nid를 키로 zlib 압축한 본문을 보관합니다.
+#   본문을 게시글 CSV({code}_board.csv)와 분리해 두므로, 본문이 아무리 쌓여도
+#   게시글 목록의 추가/읽기는 메타데이터 크기만큼만 걸리고 본문은 필요할 때 nid로 꺼내 읽습니다.
+#
+# 사용 예:
+#   store = BodyStore("005930")
+#   store.put_many({302758375: "본문 ..."})
+#   store.get_many([302758375])            # {302758375: "본문 ..."}
+#   df = with_bodies(df, "005930")         # df["nid"]로 content 컬럼을 붙임
+
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(BASE_DIR, "data", "debate")
+
+LEVEL = 6            # zlib 압축 수준
+BATCH = 500          # get_many 한 번의 쿼리에 넣는 nid 수 (SQLite 변수 개수 제한)
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _compress(text):
+    return zlib.compress(text.encode("utf-8"), LEVEL)
+
+
+def _decompress(blob):
+    return zlib.decompress(blob).decode("utf-8")
+
+
+class BodyStore:
+    """
+    nid -> 본문 텍스트. 쓰기는 종목별 잠금으로 직렬화하고, 읽기는 WAL 모드라 쓰는 중에도 가능합니다.
+    """
+
+    def __init__(self, code, data_dir=DATA_DIR):
+        self.path = os.path.join(data_dir, f"{code}_bodies.sqlite")
+        with _locks_guard:
+            self._lock = _locks.setdefault(os.path.abspath(self.path), threading.Lock())
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def mtime(self):
+        """
+        마지막 저장 시각. WAL 모드에서는 본 파일보다 -wal 파일이 먼저 바뀌므로 둘 중 늦은 값입니다.
+        """
+        paths = [p for p in (self.path, self.path + "-wal") if os.path.exists(p)]
+        return max(os.path.getmtime(p) for p in paths) if paths else None
+
+    @contextmanager
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS bodies (nid INTEGER PRIMARY KEY, body BLOB NOT NULL)")
+            yield conn
+        finally:
+            conn.close()
+
+    def put_many(self, bodies):
+        """
+        {nid: 본문}을 한 트랜잭션으로 저장합니다. 이미 있는 nid는 덮어씁니다.
+        """
+        rows = [(int(nid), _compress(text or "")) for nid, text in bodies.items()]
+        if not rows:
+            return
+        with self._lock, self._connect() as conn:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO bodies (nid, body) VALUES (?, ?)", rows)
+
+    def get_many(self, nids):
+        """
+        저장된 nid의 {nid: 본문}을 반환합니다. 없는 nid는 빠집니다.
+        """
+        nids = [int(nid) for nid in nids]
+        if not nids or not self.exists():
+            return {}
+        result = {}
+        with self._connect() as conn:
+            for i in range(0, len(nids), BATCH):
+                chunk = nids[i:i + BATCH]
+                marks = ",".join("?" * len(chunk))
+                for nid, blob in conn.execute(f"SELECT nid, body FROM bodies WHERE nid IN ({marks})", chunk):
+                    result[nid] = _decompress(blob)
+        return result
+
+    def get(self, nid):
+        return self.get_many([nid]).get(int(nid))
+
+    def nids(self):
+        """
+        본문이 저장된 nid 집합. (본문은 읽지 않음)
+        """
+        if not self.exists():
+            return set()
+        with self._connect() as conn:
+            return {nid for (nid,) in conn.execute("SELECT nid FROM bodies")}
+
+    def __len__(self):
+        if not self.exists():
+            return 0
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM bodies").fetchone()[0]
+
+
+def with_bodies(df, code):
+    """
+    df의 nid로 본문을 찾아 content 컬럼을 붙인 복사본을 반환합니다. (본문이 없으면 "")
+    """
+    df = df.copy()
+    if "nid" not in df.columns:
+        df["content"] = ""
+        return df
+    nids = df["nid"].astype("Int64").tolist()
+    bodies = BodyStore(code).get_many(nid for nid in nids if not pd.isna(nid))
+    df["content"] = ["" if pd.isna(nid) else bodies.get(nid, "") for nid in nids]
+    return df
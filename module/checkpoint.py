@@ -0,0 +1,113 @@
+# 핵심 기능:
+#   오래 걸리는 수집 작업이 중간에 중단돼도 파일이 깨지거나 끝낸 작업을 다시 하지 않도록 하는 도구 모음.
+#   - atomic_write / write_csv: 임시 파일에 쓰고 fsync한 뒤 os.replace로 교체 (읽는 쪽은 항상 완전한 파일만 봄)
+#   - append_csv / recover: 기존 파일 크기를 저널(.journal)에 남긴 뒤 끝에 추가합니다.
+#     추가 도중 중단되면 다음 실행의 recover()가 파일을 추가 전 크기로 되돌립니다.
+#   - Checkpoint: data/checkpoints/{name}.json에 재개 위치(cursor) 등 진행 상태를 기록
+#   - file_lock: 같은 파일을 쓰는 작업(스레드)끼리 순서를 맞추는 잠금
+#
+# 사용 예:
+#   ckpt = Checkpoint(f"{code}_bodies")
+#   start = (ckpt.load() or {}).get("position", -1)
+#   ...                                   # N개마다 결과를 write_csv로 저장하고
+#   ckpt.save(position=last_index)        # 재개 위치를 기록
+#   ckpt.clear()                          # 끝까지 마치면 삭제
+
+import os
+import json
+import threading
+from contextlib import contextmanager
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CHECKPOINT_DIR = os.path.join(BASE_DIR, "data", "checkpoints")
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def file_lock(path):
+    with _locks_guard:
+        return _locks.setdefault(os.path.abspath(path), threading.RLock())
+
+
+@contextmanager
+def atomic_write(path, mode="w", **open_kwargs):
+    """
+    path 대신 임시 파일을 열어 주고, 블록이 예외 없이 끝나면 path로 교체합니다.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_csv(df, path, encoding="utf-8-sig", **to_csv_kwargs):
+    to_csv_kwargs.setdefault("index", False)
+    with atomic_write(path, "w", encoding=encoding, newline="") as f:
+        df.to_csv(f, **to_csv_kwargs)
+
+
+def _journal_path(path):
+    return path + ".journal"
+
+
+def append_csv(df, path, done=None):
+    """
+    df를 헤더 없이 path 끝에 추가합니다. (BOM은 파일 처음에만 있으므로 utf-8)
+    done()이 주어지면 추가가 끝난 뒤, 저널을 지우기 전에 호출합니다. (예: id 인덱스 저장)
+    """
+    with atomic_write(_journal_path(path), "w", encoding="utf-8") as f:
+        json.dump({"size": os.path.getsize(path)}, f)
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        df.to_csv(f, header=False, index=False)
+        f.flush()
+        os.fsync(f.fileno())
+    if done is not None:
+        done()
+    os.remove(_journal_path(path))
+
+
+def recover(path):
+    """
+    끝나지 못한 append_csv가 있으면 파일을 추가 전 크기로 되돌리고 True를 반환합니다.
+    """
+    journal = _journal_path(path)
+    if not os.path.exists(journal):
+        return False
+    with open(journal, encoding="utf-8") as f:
+        size = json.load(f)["size"]
+    with open(path, "r+b") as f:
+        f.truncate(size)
+    os.remove(journal)
+    print(f"⚠️ 중단된 추가 작업을 되돌렸습니다: {path}")
+    return True
+
+
+class Checkpoint:
+    """
+    작업 하나의 재개 상태(JSON). 저장은 atomic_write로 합니다.
+    """
+
+    def __init__(self, name):
+        self.path = os.path.join(CHECKPOINT_DIR, f"{name}.json")
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, **state):
+        with atomic_write(self.path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,200 @@
+# 핵심 기능:
+#   여러 게시글의 댓글 트리를 작업자 풀에서 동시에 가져옵니다.
+#   요청 속도와 개별 요청의 재시도는 praw 클라이언트의 rate_limit.LimitedRequestor가 처리합니다.
+#   praw 클라이언트는 스레드 안전하지 않으므로 작업자마다 클라이언트 함수(get_reddit)로 자기 클라이언트를 받습니다.
+#   작업자는 댓글을 한 행씩 크기가 정해진 큐에 넣고, 호출한 스레드가 CHUNK_SIZE행씩 모아
+#   on_chunk(comments_df)로 넘겨 저장합니다. 큐가 차면 작업자가 기다리므로 메모리 사용량은
+#   서브레딧/스레드 크기와 상관없이 (큐 + 청크 하나) 수준으로 유지됩니다.
+#   실패한 게시글은 마지막에 다시 시도하고, 끝까지 실패한 게시글은 data/{dataset}_failed.json에 남겨
+#   다음 실행에서 다시 수집합니다.
+#
+# 주요 함수:
+#   iter_comments(reddit, post_id, existing_ids): 게시글 하나의 댓글을 한 행씩 생성.
+#   harvest(get_client, post_ids, on_chunk, existing_ids, workers, retries, progress): 댓글 수집 실행.
+#   load_failed(dataset) / save_failed(dataset, post_ids): 재시도 대기 중인 게시글 목록.
+
+import os
+import sys
+import json
+import time
+import queue
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+sys.path.append(BASE_DIR)
+from module import request_policy, checkpoint
+
+WORKERS = 8       # 동시에 댓글을 가져오는 게시글 수
+RETRIES = 2       # 실패한 게시글 재시도 횟수
+CHUNK_SIZE = 1000   # 한 번에 저장하는 댓글 수
+QUEUE_SIZE = 2000   # 작업자와 저장 스레드 사이에 쌓아 둘 수 있는 댓글 수
+PUT_TIMEOUT = 0.5   # 큐가 찼을 때 작업자가 중단 신호를 확인하는 간격(초)
+
+COMMENT_COLUMNS = ["post_id", "comment_id", "comment_author", "comment_body", "comment_time", "comment_score"]
+
+
+def _failed_path(dataset):
+    return os.path.join(DATA_DIR, f"{dataset}_failed.json")
+
+
+def load_failed(dataset):
+    path = _failed_path(dataset)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_failed(dataset, post_ids):
+    path = _failed_path(dataset)
+    if not post_ids:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    # 쓰는 도중 중단돼도 이전 실패 목록이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    with checkpoint.atomic_write(path, "w", encoding="utf-8") as f:
+        json.dump(sorted(set(post_ids)), f)
+
+
+def iter_comments(reddit, post_id, existing_ids=None):
+    """
+    게시글 하나의 전체 댓글을 한 행(dict)씩 생성합니다. (existing_ids에 있는 댓글은 제외)
+    """
+    existing_ids = existing_ids or set()
+    submission = reddit.submission(id=post_id)
+    submission.comments.replace_more(limit=None)
+    for comment in submission.comments.list():
+        if comment.id in existing_ids:
+            continue
+        yield {
+            "post_id": post_id,
+            "comment_id": comment.id,
+            "comment_author": str(comment.author),
+            "comment_body": comment.body,
+            "comment_time": datetime.fromtimestamp(comment.created_utc, tz=timezone.utc),
+            "comment_score": comment.score
+        }
+
+
+def fetch_comments(reddit, post_id, existing_ids=None):
+    """
+    게시글 하나의 전체 댓글을 DataFrame으로 반환합니다.
+    """
+    return pd.DataFrame(list(iter_comments(reddit, post_id, existing_ids)), columns=COMMENT_COLUMNS)
+
+
+class ChunkWriter:
+    """
+    행을 chunk_size개씩 모아 on_chunk(DataFrame)로 넘깁니다. close()로 남은 행을 넘깁니다.
+    """
+
+    def __init__(self, on_chunk, chunk_size=CHUNK_SIZE):
+        self.on_chunk = on_chunk
+        self.chunk_size = chunk_size
+        self.rows = []
+        self.written = 0
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.on_chunk(pd.DataFrame(self.rows, columns=COMMENT_COLUMNS))
+            self.written += len(self.rows)
+            self.rows = []
+
+    def close(self):
+        self.flush()
+
+
+class _PostDone:
+    def __init__(self, post_id, error=None):
+        self.post_id = post_id
+        self.error = error
+
+
+def harvest(get_client, post_ids, on_chunk, existing_ids=None, workers=WORKERS, retries=RETRIES,
+            progress=None, chunk_size=CHUNK_SIZE):
+    """
+    post_ids의 댓글을 동시에 수집합니다.
+
+    - get_client(): 작업자 스레드에서 호출해 그 스레드의 praw 클라이언트를 받는 함수 (reddit_client.get_reddit)
+
+    - on_chunk(comments_df): 댓글이 chunk_size개 모일 때마다 (호출한 스레드에서) 호출.
+      중간에 실패한 게시글의 댓글 일부가 이미 넘어갔을 수 있으므로, 저장 쪽에서 comment_id로 중복을 거릅니다.
+    - progress(done, total, failed): 진행 상황 콜백. Streamlit 화면 갱신 등에 사용.
+
+    {"posts": 완료 게시글 수, "comments": 수집 댓글 수, "failed": 끝까지 실패한 post_id 목록}을 반환합니다.
+    """
+    pending = list(dict.fromkeys(post_ids))
+    total = len(pending)
+    done = 0
+    errors = {}
+    rows = queue.Queue(maxsize=QUEUE_SIZE)
+    writer = ChunkWriter(on_chunk, chunk_size)
+    stop = threading.Event()
+
+    def put(item):
+        """
+        큐에 넣습니다. 저장 쪽이 오류로 멈췄으면(stop) 큐가 비워지지 않으므로 기다리지 않고 False.
+        """
+        while not stop.is_set():
+            try:
+                rows.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(pid):
+        if stop.is_set():
+            return
+        try:
+            for row in iter_comments(get_client(), pid, existing_ids):
+                if not put(row):
+                    return
+            put(_PostDone(pid))
+        except Exception as e:
+            put(_PostDone(pid, e))
+
+    for attempt in range(retries + 1):
+        if not pending:
+            break
+        if attempt:
+            time.sleep(request_policy.backoff(attempt + 1))
+        failed = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for pid in pending:
+                pool.submit(produce, pid)
+            finished = 0
+            try:
+                while finished < len(pending):
+                    item = rows.get()
+                    if not isinstance(item, _PostDone):
+                        writer.write(item)
+                        continue
+                    finished += 1
+                    if item.error is None:
+                        done += 1
+                    else:
+                        errors[item.post_id] = str(item.error)
+                        failed.append(item.post_id)
+                    if progress is not None:
+                        progress(done, total, len(failed))
+            except BaseException:
+                # on_chunk(저장) 실패 등: 작업자를 멈추고, 모두 끝난 뒤(풀 종료 대기) 오류를 다시 올림
+                stop.set()
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        pending = failed
+    writer.close()
+
+    for pid in pending:
+        print(f"🔴 Error getting comments for post {pid}: {errors.get(pid)}")
+    return {"posts": done, "comments": writer.written, "failed": pending}
@@ -0,0 +1,138 @@
+# 핵심 기능:
+#   수집 대상(target)별로 이미 저장한 가장 최신 게시글의 created_utc/id(high-water mark)를 data/cursors.json에 기록합니다.
+#   수집기는 최신순 목록을 순회하다가 커서에 도달하면 바로 멈춰, 이미 수집한 페이지를 다시 요청하지 않습니다.
+#
+# 사용 예:
+#   scan = ListingScan(f"{dataset}:subreddit:{name}", limit=1000)
+#   for post in listing:
+#       if scan.reached(post.created_utc, post.id):
+#           break
+#       ...
+#   scan.finish()                 # 예외 없이 순회를 마쳤을 때만
+#   post_store.append(...)
+#   scan.commit(new_posts)        # 저장 후에 커서 이동
+#   log(scan.summary())           # 기존 커서 전에 limit에서 끊겼으면 받지 못한 구간도 기록
+
+import os
+import json
+import math
+import threading
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CURSOR_PATH = os.path.join(BASE_DIR, "data", "cursors.json")
+
+PAGE_SIZE = 100   # Reddit 목록 API 한 번의 요청으로 받는 최대 게시글 수
+
+_lock = threading.Lock()
+
+
+def _load_all():
+    if not os.path.exists(CURSOR_PATH):
+        return {}
+    with open(CURSOR_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load(target):
+    """
+    target의 커서 {"created_utc": float, "id": str}를 반환합니다. 없으면 None.
+    """
+    with _lock:
+        return _load_all().get(target)
+
+
+def save(target, created_utc, post_id):
+    """
+    커서를 기록합니다. 임시 파일에 쓴 뒤 교체하므로 중간에 중단돼도 파일이 깨지지 않습니다.
+    """
+    with _lock:
+        cursors = _load_all()
+        cursors[target] = {"created_utc": float(created_utc), "id": str(post_id)}
+        os.makedirs(os.path.dirname(CURSOR_PATH), exist_ok=True)
+        tmp_path = CURSOR_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cursors, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, CURSOR_PATH)
+
+
+def pages_for(n_items):
+    return max(1, math.ceil(n_items / PAGE_SIZE))
+
+
+class ListingScan:
+    """
+    최신순 목록 한 번의 순회를 추적합니다.
+    커서 도달 여부를 판단하고, 요청한 페이지 수와 커서 덕분에 아낀 요청 수를 계산합니다.
+    """
+
+    def __init__(self, target, limit, progress=None):
+        self.target = target
+        self.limit = limit
+        self.progress = progress  # progress(fetched, limit): 게시글을 받을 때마다 호출
+        self.cursor = load(target)
+        self.fetched = 0          # 목록에서 받아 본 게시글 수 (커서에 닿은 게시글 포함)
+        self.stopped = False      # 커서에 닿아 멈췄는지
+        self.complete = False     # 순회를 예외 없이 마쳤는지
+        self.truncated = False    # 기존 커서에 닿기 전에 limit개를 모두 받아 목록이 끊겼는지
+        self.oldest = None        # 받아 본 게시글 중 가장 오래된 created_utc (truncated일 때 누락 구간의 끝)
+
+    def reached(self, created_utc, post_id):
+        """
+        목록에서 받은 게시글마다 호출합니다. 이미 수집한 영역이면 True.
+        """
+        self.fetched += 1
+        self.oldest = created_utc if self.oldest is None else min(self.oldest, created_utc)
+        if self.progress is not None:
+            self.progress(self.fetched, self.limit)
+        if self.cursor is None:
+            return False
+        if post_id == self.cursor["id"] or created_utc < self.cursor["created_utc"]:
+            self.stopped = True
+        return self.stopped
+
+    def finish(self):
+        """
+        순회가 예외 없이 끝났을 때 호출합니다. 기존 커서에 닿기 전에 limit개를 모두 받았다면 truncated로 표시합니다.
+        커서와의 사이에 남은 게시글은 최신순 목록(/new, 검색)에서 limit 너머라 다시 받을 수 없으므로,
+        이때도 커서는 옮기고 받지 못한 구간은 summary()로 로그에 남깁니다. (커서를 그대로 두면 사이가
+        계속 벌어져 매 실행이 limit까지 받고도 커서가 다시는 움직이지 않음)
+        """
+        self.truncated = self.cursor is not None and not self.stopped and self.fetched >= self.limit
+        self.complete = True
+
+    def api_calls(self):
+        return pages_for(self.fetched)
+
+    def saved_calls(self):
+        """
+        커서 없이 limit까지 모두 받았을 때와 비교해 아낀 요청 수 (추정).
+        """
+        if not self.stopped:
+            return 0
+        return max(0, pages_for(self.limit) - self.api_calls())
+
+    def commit(self, posts_df):
+        """
+        저장이 끝난 뒤 호출합니다. 순회가 예외 없이 끝난 경우에만 커서를 가장 최신 게시글로 옮깁니다.
+        """
+        if not self.complete or posts_df is None or posts_df.empty:
+            return
+        newest = posts_df.loc[posts_df["time"].idxmax()]
+        created_utc = newest["time"].timestamp()
+        if self.cursor is not None and created_utc <= self.cursor["created_utc"]:
+            return
+        save(self.target, created_utc, newest["id"])
+
+    def summary(self):
+        text = f"API 호출 {self.api_calls()}회 / 커서로 {self.saved_calls()}회 절약"
+        if self.truncated:
+            text += f" / {self.limit}개 제한에 닿아 {self.gap()} 구간은 받지 못함"
+        return text
+
+    def gap(self):
+        """
+        truncated일 때 받지 못한 구간 "기존 커서 시각 ~ 받은 게시글 중 가장 오래된 시각" (UTC).
+        """
+        fmt = lambda ts: datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        return f"{fmt(self.cursor['created_utc'])} ~ {fmt(self.oldest)}"
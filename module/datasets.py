@@ -0,0 +1,353 @@
+# 핵심 기능:
+#   대시보드 페이지들이 함께 쓰는 데이터셋 캐시.
+#   Streamlit 페이지는 모두 같은 프로세스에서 실행되므로, 이 모듈의 캐시 하나를 모든 페이지와 세션이 공유합니다.
+#   캐시 항목은 (로더 함수, 인자)별로 두고, 읽을 때마다 원본 파일의 시그니처(mtime, 크기)를 확인해
+#   수집기가 파일을 다시 쓰면 그 데이터셋만 다시 읽습니다. (다른 데이터셋의 캐시는 그대로)
+#   - 원본(source): post_store dataset 이름(예: "hoka_subreddit") 또는 파일 경로(예: "data/tiktok.csv")
+#   - post_store가 dataset에 쓰면 invalidate(dataset)를 호출하므로, 같은 프로세스의 수집 작업은
+#     mtime 해상도와 관계없이 바로 반영됩니다. 다른 프로세스(CLI 수집기)의 쓰기는 시그니처로 감지합니다.
+#
+#   로더가 돌려준 DataFrame은 Feather(Arrow IPC, 비압축) 파일(data/arrow_cache/)로 한 번 쓰고
+#   메모리 맵으로 연 읽기 전용 pa.Table로 보관합니다. 페이지에는 호출마다 이 표의 zero-copy 뷰
+#   (to_pandas(split_blocks=True))를 주므로, 세션/재실행마다 역직렬화하거나 복사하지 않습니다.
+#   (st.cache_data는 호출마다 pickle 사본을 만듦) 숫자/문자열/시간 컬럼은 메모리 맵을 그대로 가리키고,
+#   결측값이 있는 정수 컬럼처럼 변환이 필요한 컬럼만 뷰마다 따로 메모리를 씁니다.
+#   문자열 컬럼이 메모리 맵을 가리키려면 Arrow 기반 str dtype을 쓰는 pandas 3 이상이 필요합니다.
+#   (pandas 2는 뷰마다 Python str 객체를 새로 만듦. requirements.txt에서 pandas>=3으로 고정)
+#   뷰의 값은 읽기 전용이라 제자리 수정(df.loc[...] = ...)은 오류가 나며, 컬럼 추가/교체와 rename은 됩니다.
+#   Arrow로 그대로 옮길 수 없는 값(리스트, 타입이 섞인 컬럼 등)은 예전처럼 메모리에 두고 사본을 줍니다.
+#   캐시에서 빠진 항목의 Feather 파일은 그 파일을 가리키는 뷰가 모두 사라진 뒤에 지웁니다.
+#   (Windows에서는 메모리 맵으로 열린 파일을 지우거나 덮어쓸 수 없음) 같은 항목을 다시 읽으면
+#   쓰이지 않는 번호의 파일({키 해시}-{번호}.arrow)에 써서, 이전 파일을 가리키는 뷰와 겹치지 않게 합니다.
+#
+# 사용 예:
+#   @datasets.cached(lambda dataset, start, end: dataset)
+#   def load_dataset(dataset, start, end):
+#       return post_store.read(dataset, start=start, end=end)
+#
+#   @datasets.cached("data/album_sales.csv")
+#   def load_data():
+#       return pd.read_csv("data/album_sales.csv")
+#
+#   datasets.invalidate("hoka_subreddit")   # 이 데이터셋을 읽은 항목만 버림
+#   datasets.entries()                      # 캐시 상태 (페이지 3에서 표시)
+#   datasets.memory_report()                # 데이터셋별 공유 메모리 / 세션별 추가 메모리
+#
+# 벤치마크: python benchmarks/dataset_cache.py
+
+import os
+import time
+import hashlib
+import weakref
+import threading
+import functools
+from collections import OrderedDict
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ARROW_DIR = os.path.join(BASE_DIR, "data", "arrow_cache")
+
+MAX_ENTRIES = 64      # 날짜 범위 등 인자 조합이 많아도 최근 사용한 항목만 유지
+
+_ARROW_ERRORS = (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, ValueError)
+
+_lock = threading.Lock()
+_cache = OrderedDict()     # key -> {"source", "signature", "table", "value", "path", "bounds", "loaded", "seconds"}
+_views = []                # (세션 id, source, weakref(뷰), bounds, path) 페이지에 준 뷰
+_retired = set()           # 캐시에서 빠졌지만 아직 지우지 못한 Feather 파일 (뷰가 남아 있음)
+_writing = set()           # _share가 쓰는 중인 Feather 파일
+_stats = {"hits": 0, "misses": 0}
+
+
+def is_file(source):
+    """
+    source가 파일 경로인지(확장자가 있음), post_store dataset 이름인지 구분합니다.
+    """
+    return bool(os.path.splitext(source)[1])
+
+
+def _files(source):
+    """
+    source를 이루는 파일 목록. dataset은 저장소 디렉터리의 모든 파일과 이전 CSV입니다.
+    """
+    if is_file(source):
+        path = source if os.path.isabs(source) else os.path.join(BASE_DIR, source)
+        return [path]
+    from module import post_store
+    paths = [post_store._csv_path(source)]
+    for root, _, names in os.walk(post_store.dataset_dir(source)):
+        paths.extend(os.path.join(root, name) for name in names if not name.endswith(".tmp"))
+    return paths
+
+
+def signature(source):
+    """
+    source의 (파일 수, 최근 mtime_ns, 전체 크기). 파일이 추가/삭제/교체되면 값이 바뀝니다.
+    """
+    count, latest, size = 0, 0, 0
+    for path in _files(source):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        count += 1
+        latest = max(latest, st.st_mtime_ns)
+        size += st.st_size
+    return count, latest, size
+
+
+def _session():
+    """
+    현재 Streamlit 세션 id. Streamlit 밖(CLI, 벤치마크)에서는 None.
+    """
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def _view(table):
+    # split_blocks: 컬럼마다 따로 두어 같은 dtype 컬럼을 한 블록으로 합치는 복사를 피함
+    return table.to_pandas(split_blocks=True)
+
+
+def _bounds(table):
+    """
+    표의 버퍼들이 놓인 주소 범위 (메모리 맵 영역). 뷰의 컬럼이 이 안을 가리키면 복사 없이 공유 중입니다.
+    """
+    buffers = [b for column in table.columns for chunk in column.chunks for b in chunk.buffers() if b is not None]
+    if not buffers:
+        return 0, 0
+    return min(b.address for b in buffers), max(b.address + b.size for b in buffers)
+
+
+def _free_path(key):
+    """
+    key의 Feather 파일 경로 중 이 프로세스가 쓰고 있지 않은 첫 번호의 경로를 골라 예약합니다. (_lock 안에서 호출)
+    """
+    base = os.path.join(ARROW_DIR, hashlib.sha1(repr(key).encode("utf-8")).hexdigest())
+    busy = {entry["path"] for entry in _cache.values()} | _retired | _writing
+    n = 0
+    while f"{base}-{n}.arrow" in busy:
+        n += 1
+    path = f"{base}-{n}.arrow"
+    _writing.add(path)
+    return path
+
+
+def _share(key, df):
+    """
+    df를 Feather 파일로 쓰고 메모리 맵으로 다시 열어 (pa.Table, 경로)를 반환합니다.
+    Arrow로 옮기지 못하거나 되읽은 뷰의 컬럼/인덱스/dtype이 원본과 다르면 (None, None).
+    """
+    try:
+        table = pa.Table.from_pandas(df)
+    except _ARROW_ERRORS:
+        return None, None
+    os.makedirs(ARROW_DIR, exist_ok=True)
+    with _lock:
+        path = _free_path(key)
+    try:
+        tmp_path = path + ".tmp"
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        # path는 이 프로세스에서 열려 있지 않은 파일이므로 덮어써도 됨 (이전 실행이 남긴 파일일 수 있음)
+        os.replace(tmp_path, path)
+        shared = feather.read_table(path, memory_map=True)
+        view = _view(shared)
+        if view.columns.equals(df.columns) and view.index.equals(df.index) and view.dtypes.equals(df.dtypes):
+            return shared, path
+        del shared, view
+        with _lock:
+            _retired.add(path)
+            _sweep()
+        return None, None
+    finally:
+        with _lock:
+            _writing.discard(path)
+
+
+def _sweep():
+    """
+    _retired 중 가리키는 뷰가 없는 파일을 지웁니다. (_lock 안에서 호출)
+    메모리 맵이 아직 닫히지 않아 지우지 못한 파일(Windows)은 다음 호출에서 다시 시도합니다.
+    """
+    _views[:] = [v for v in _views if v[2]() is not None]
+    live = {v[4] for v in _views}
+    for path in list(_retired):
+        if path in live:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue
+        _retired.discard(path)
+
+
+def _remove(entry):
+    """
+    캐시에서 뺀 항목의 Feather 파일을 지웁니다. 그 파일을 가리키는 뷰가 남아 있으면 뷰가 사라진 뒤에 지웁니다. (_lock 안에서 호출)
+    """
+    if entry["path"]:
+        _retired.add(entry["path"])
+        _sweep()
+
+
+def _hand_out(entry):
+    """
+    캐시 항목의 값을 페이지에 줄 형태로 만듭니다. Arrow 표는 zero-copy 뷰, 그 밖의 값은 사본.
+    """
+    if entry["table"] is None:
+        value = entry["value"]
+        return value.copy() if hasattr(value, "copy") else value
+    view = _view(entry["table"])
+    record = (_session(), entry["source"], weakref.ref(view), entry["bounds"], entry["path"])
+    with _lock:
+        _sweep()
+        _views.append(record)
+    return view
+
+
+def cached(source):
+    """
+    로더 함수의 결과를 source의 시그니처가 바뀔 때까지 캐시하는 데코레이터.
+    source는 dataset 이름/파일 경로이거나, 로더와 같은 인자를 받아 그것을 반환하는 함수입니다.
+    """
+    def decorator(func):
+        # 페이지 스크립트는 실행마다 다시 정의되므로 (파일, 함수 이름)으로 로더를 구분
+        name = (func.__code__.co_filename, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            src = source(*args, **kwargs) if callable(source) else source
+            key = (name, args, tuple(sorted(kwargs.items())))
+            sig = signature(src)
+            with _lock:
+                entry = _cache.get(key)
+                hit = entry is not None and entry["signature"] == sig
+                if hit:
+                    _cache.move_to_end(key)
+                _stats["hits" if hit else "misses"] += 1
+            if hit:
+                return _hand_out(entry)
+            start = time.perf_counter()
+            value = func(*args, **kwargs)
+            table, path = _share(key, value) if isinstance(value, pd.DataFrame) else (None, None)
+            entry = {"source": src, "signature": sig, "table": table, "path": path,
+                     "value": None if table is not None else value,
+                     "bounds": _bounds(table) if table is not None else None,
+                     "loaded": time.time(), "seconds": time.perf_counter() - start}
+            with _lock:
+                old = _cache.pop(key, None)
+                if old is not None and old["path"] != path:
+                    _remove(old)
+                _cache[key] = entry
+                while len(_cache) > MAX_ENTRIES:
+                    _remove(_cache.popitem(last=False)[1])
+            return _hand_out(entry)
+
+        return wrapper
+    return decorator
+
+
+def invalidate(source):
+    """
+    source(dataset 이름 또는 파일 경로)를 읽은 캐시 항목만 버리고, 버린 항목 수를 반환합니다.
+    """
+    with _lock:
+        keys = [k for k, entry in _cache.items() if entry["source"] == source]
+        for k in keys:
+            _remove(_cache.pop(k))
+    return len(keys)
+
+
+def clear():
+    with _lock:
+        for entry in _cache.values():
+            _remove(entry)
+        _cache.clear()
+
+
+def entries():
+    """
+    source별 캐시 상태 [{"source", "entries", "loaded", "seconds"}] (최근 읽은 순).
+    """
+    with _lock:
+        summary = {}
+        for entry in _cache.values():
+            item = summary.setdefault(entry["source"], {"source": entry["source"], "entries": 0,
+                                                        "loaded": 0.0, "seconds": 0.0})
+            item["entries"] += 1
+            item["loaded"] = max(item["loaded"], entry["loaded"])
+            item["seconds"] += entry["seconds"]
+    return sorted(summary.values(), key=lambda item: item["loaded"], reverse=True)
+
+
+def stats():
+    with _lock:
+        return dict(_stats, entries=len(_cache))
+
+
+def _zero_copy(values, bounds):
+    """
+    pandas 배열 values의 버퍼가 모두 bounds(메모리 맵 영역) 안에 있으면 True.
+    """
+    try:
+        array = pa.array(values)
+    except _ARROW_ERRORS:
+        return False
+    chunks = array.chunks if isinstance(array, pa.ChunkedArray) else [array]
+    buffers = [b for chunk in chunks for b in chunk.buffers() if b is not None and b.size]
+    lo, hi = bounds
+    return bool(buffers) and all(lo <= b.address and b.address + b.size <= hi for b in buffers)
+
+
+def _private_bytes(df, bounds):
+    """
+    뷰 df 중 메모리 맵을 가리키지 않고 따로 메모리를 쓰는 컬럼/인덱스의 바이트 수.
+    """
+    total = sum(int(series.memory_usage(deep=True, index=False))
+                for _, series in df.items() if not _zero_copy(series.array, bounds))
+    if not _zero_copy(df.index.array, bounds):
+        total += int(df.index.memory_usage(deep=True))
+    return total
+
+
+def memory_report():
+    """
+    캐시 메모리 사용량.
+    - datasets: source별 {"source", "entries", "shared_bytes"(메모리 맵 표), "file_bytes", "heap_bytes"(Arrow로 못 옮긴 값)}
+    - sessions: 세션별 {"session", "views"(살아 있는 뷰 수), "view_bytes"(뷰의 논리 크기), "private_bytes"(뷰가 따로 쓰는 메모리)}
+    """
+    with _lock:
+        cache = list(_cache.values())
+        views = [(session, source, ref(), bounds) for session, source, ref, bounds, _ in _views]
+    datasets = {}
+    for entry in cache:
+        item = datasets.setdefault(entry["source"], {"source": entry["source"], "entries": 0,
+                                                     "shared_bytes": 0, "file_bytes": 0, "heap_bytes": 0})
+        item["entries"] += 1
+        if entry["table"] is not None:
+            item["shared_bytes"] += entry["table"].nbytes
+            if os.path.exists(entry["path"]):
+                item["file_bytes"] += os.path.getsize(entry["path"])
+        elif isinstance(entry["value"], pd.DataFrame):
+            item["heap_bytes"] += int(entry["value"].memory_usage(deep=True).sum())
+
+    sessions = {}
+    for session, source, view, bounds in views:
+        if view is None:
+            continue
+        item = sessions.setdefault(session, {"session": session, "views": 0, "view_bytes": 0, "private_bytes": 0})
+        item["views"] += 1
+        item["view_bytes"] += int(view.memory_usage(deep=True).sum())
+        item["private_bytes"] += _private_bytes(view, bounds)
+    return {
+        "datasets": sorted(datasets.values(), key=lambda item: item["shared_bytes"] + item["heap_bytes"], reverse=True),
+        "sessions": sorted(sessions.values(), key=lambda item: item["private_bytes"], reverse=True),
+    }
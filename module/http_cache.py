@@ -0,0 +1,163 @@
+# 핵심 기능:
+#   네트워크 없이 크롤러를 돌리고 측정하기 위한 record/replay HTTP 캐시.
+#   http_pool 세션(SESSIONS)에 CacheAdapter를 붙여 GET 요청의 URL별 원본 응답(상태 코드, 헤더, 본문 바이트)을 디렉터리에 저장/재생합니다.
+#   - "record": 실제로 요청하고 응답을 저장합니다. (이미 저장된 URL도 새로 받아 덮어씀)
+#   - "replay": 저장된 응답만 돌려줍니다. 없는 URL은 CacheMiss 예외 (네트워크에 나가지 않음)
+#   환경 변수 HTTP_CACHE=record|replay (및 HTTP_CACHE_DIR)로도 켤 수 있어, CLI 실행에도 그대로 쓸 수 있습니다.
+#
+# 사용 예:
+#   http_cache.enable("record")                      # 한 번 실제로 수집하며 저장
+#   naver_board.update("005930", "2025.05.18 00:00")
+#   http_cache.enable("replay")                      # 이후에는 저장된 응답으로만 실행
+#   HTTP_CACHE=replay python module/naver_board.py 005930 "2025.05.18 00:00"
+#
+# 벤치마크: python benchmarks/naver_crawl.py
+
+import os
+import sys
+import json
+import hashlib
+import requests
+from requests.structures import CaseInsensitiveDict
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import request_policy
+
+CACHE_DIR = os.path.join(BASE_DIR, "data", "http_cache")
+MODES = ("record", "replay")
+SESSIONS = ("naver",)   # 캐시를 붙이는 http_pool 세션 이름
+
+# 저장하는 본문은 urllib3가 압축을 푼 바이트이므로 전송 관련 헤더는 남기지 않음
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+mode = None
+cache_dir = CACHE_DIR
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """
+    replay 모드에서 저장된 응답이 없는 URL을 요청했을 때 발생합니다. (재시도 대상 아님)
+    """
+
+
+def enable(new_mode, directory=CACHE_DIR):
+    """
+    캐시를 켜고(new_mode: "record"/"replay") 이미 만든 공유 세션을 버려, 다음 세션부터 CacheAdapter를 씁니다.
+    new_mode가 None이면 끕니다.
+    """
+    global mode, cache_dir
+    if new_mode not in MODES + (None,):
+        raise ValueError(f"HTTP 캐시 모드는 {MODES} 중 하나여야 합니다: {new_mode}")
+    mode, cache_dir = new_mode, directory
+    from module import http_pool
+    http_pool.reset()
+
+
+def from_env():
+    """
+    HTTP_CACHE / HTTP_CACHE_DIR 환경 변수로 캐시 설정을 읽습니다. (http_pool이 첫 세션을 만들 때 호출)
+    """
+    global mode, cache_dir
+    if mode is None and os.environ.get("HTTP_CACHE"):
+        if os.environ["HTTP_CACHE"] not in MODES:
+            raise ValueError(f"HTTP_CACHE는 {MODES} 중 하나여야 합니다: {os.environ['HTTP_CACHE']}")
+        mode = os.environ["HTTP_CACHE"]
+        cache_dir = os.environ.get("HTTP_CACHE_DIR", CACHE_DIR)
+    return mode
+
+
+def _key(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _paths(url, directory=None):
+    base = os.path.join(directory or cache_dir, _key(url))
+    return base + ".meta", base + ".body"
+
+
+def put(url, status_code, headers, content, directory=None):
+    """
+    url의 응답을 저장합니다. 본문을 먼저 쓰고 메타데이터를 나중에 써서, 중간에 중단돼도 반쪽 응답이 재생되지 않습니다.
+    """
+    meta_path, body_path = _paths(url, directory)
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    for path, data in ((body_path, content),
+                       (meta_path, json.dumps({
+                           "url": url,
+                           "status": status_code,
+                           "headers": {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS},
+                       }, ensure_ascii=False).encode("utf-8"))):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def get(url, directory=None):
+    """
+    저장된 응답 (status, headers, content)을 반환합니다. 없으면 None.
+    """
+    meta_path, body_path = _paths(url, directory)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    with open(body_path, "rb") as f:
+        content = f.read()
+    return meta["status"], meta["headers"], content
+
+
+def urls(directory=None):
+    """
+    저장된 URL 목록.
+    """
+    directory = directory or cache_dir
+    if not os.path.isdir(directory):
+        return []
+    result = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".meta"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                result.append(json.load(f)["url"])
+    return result
+
+
+def _response(request, status_code, headers, content):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response.url = request.url
+    response.request = request
+    response.reason = "OK" if status_code < 400 else "Cached"
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def wrap(adapter_class):
+    """
+    adapter_class(http_pool.PooledAdapter)에 record/replay를 더한 어댑터 클래스.
+    """
+    class CacheAdapter(adapter_class):
+        def __init__(self, *args, cache_mode=None, directory=None, **kwargs):
+            self.cache_mode = cache_mode or mode
+            self.directory = directory or cache_dir
+            super().__init__(*args, **kwargs)
+
+        def send(self, request, *args, **kwargs):
+            if request.method != "GET":
+                return super().send(request, *args, **kwargs)
+            if self.cache_mode == "replay":
+                cached = get(request.url, self.directory)
+                if cached is None:
+                    raise CacheMiss(f"캐시에 없는 URL: {request.url}", request=request)
+                self.counters.add(requests=1)
+                return _response(request, *cached)
+            response = super().send(request, *args, **kwargs)
+            # 일시적인 실패(429/5xx)는 저장하지 않음 (재생할 때 재시도만 반복하게 되므로)
+            if response.status_code not in request_policy.RETRY_STATUSES:
+                put(request.url, response.status_code, response.headers, response.content, self.directory)
+            return response
+
+    return CacheAdapter
@@ -0,0 +1,128 @@
+# 핵심 기능:
+#   크롤러가 함께 쓰는 keep-alive requests.Session 풀.
+#   이름별로 세션을 하나씩 만들어 재사용하므로 페이지마다 TCP/TLS 연결을 새로 맺지 않습니다.
+#   - 압축 전송: urllib3가 해제할 수 있는 인코딩(gzip, deflate, brotli/zstd 모듈이 있으면 br/zstd)을 요청
+#   - pool_maxsize: 호스트당 최대 연결 수 (pool_block=True이므로 넘으면 연결이 반환될 때까지 대기)
+#   - counters(name): 세션별로 새로 연 연결 수와 재사용한 요청 수
+#   - http_cache가 켜져 있으면(record/replay) "naver" 등 http_cache.SESSIONS 세션에 캐시 어댑터를 붙입니다.
+#
+# 사용 예:
+#   session = http_pool.get_session("naver", headers={"User-Agent": "Mozilla/5.0"})
+#   session.get(url, timeout=15)
+#   http_pool.counters("naver").summary()   # "연결 3개 생성 / 요청 120회 중 117회 재사용"
+
+import os
+import sys
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import http_cache
+
+POOL_CONNECTIONS = 4   # 세션이 유지하는 호스트별 풀 개수
+POOL_MAXSIZE = 8       # 호스트당 최대 연결 수
+
+
+class Counters:
+    def __init__(self):
+        self.opened = 0      # 새로 연 연결 수
+        self.requests = 0    # 보낸 요청 수
+        self._lock = threading.Lock()
+
+    def add(self, opened=0, requests=0):
+        with self._lock:
+            self.opened += opened
+            self.requests += requests
+
+    @property
+    def reused(self):
+        return max(0, self.requests - self.opened)
+
+    def summary(self):
+        return f"연결 {self.opened}개 생성 / 요청 {self.requests}회 중 {self.reused}회 재사용"
+
+
+def _counting(pool_class, counter):
+    """
+    새 연결을 만들 때마다 counter를 올리는 커넥션 풀 클래스.
+    """
+    class CountingPool(pool_class):
+        def _new_conn(self):
+            counter.add(opened=1)
+            return super()._new_conn()
+    return CountingPool
+
+
+class PooledAdapter(HTTPAdapter):
+    """
+    연결 생성 수와 요청 수를 self.counters에 세는 HTTPAdapter.
+    """
+
+    def __init__(self, *args, counters=None, **kwargs):
+        self.counters = counters or Counters()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting(HTTPConnectionPool, self.counters),
+            "https": _counting(HTTPSConnectionPool, self.counters),
+        }
+
+    def send(self, request, *args, **kwargs):
+        self.counters.add(requests=1)
+        return super().send(request, *args, **kwargs)
+
+
+_sessions = {}
+_counters = {}
+_lock = threading.Lock()
+
+
+def new_session(headers=None, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, counters=None,
+                cache=False):
+    session = requests.Session()
+    adapter_class = http_cache.wrap(PooledAdapter) if cache and http_cache.from_env() else PooledAdapter
+    adapter = adapter_class(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=True,
+                            counters=counters)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_session(name, headers=None, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """
+    name별 공유 세션을 반환합니다. 처음 호출할 때의 설정으로 만듭니다.
+    """
+    with _lock:
+        if name not in _sessions:
+            _counters[name] = Counters()
+            _sessions[name] = new_session(headers, pool_connections, pool_maxsize, _counters[name],
+                                          cache=name in http_cache.SESSIONS)
+        return _sessions[name]
+
+
+def counters(name):
+    """
+    name 세션의 Counters. 세션이 아직 없으면 빈 Counters를 반환합니다.
+    """
+    with _lock:
+        return _counters.get(name) or Counters()
+
+
+def reset():
+    """
+    공유 세션을 닫고 비웁니다. (다음 get_session에서 현재 설정으로 다시 만듦)
+    """
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _counters.clear()
@@ -0,0 +1,168 @@
+# 핵심 기능:
+#   수집 데이터의 중복 제거용 id 인덱스를 디스크에 유지합니다.
+#   id를 정수로 바꿔(Reddit id는 36진수, 네이버 nid는 10진수) 정렬된 int64 배열(.npy)로 저장하고,
+#   조회는 메모리 맵 + 이진 탐색으로 처리하므로 데이터 파일을 열지 않고도 중복 여부를 알 수 있습니다.
+#   bloom=True이면 비트 배열(.bloom) Bloom 필터를 앞에 두어, 새 id 대부분은 배열을 보지 않고 걸러냅니다.
+#
+# 사용 예:
+#   index = IdIndex(os.path.join(dataset_dir, "_index.npy"), base=36)
+#   mask = index.contains(df["id"])     # 이미 있는 id면 True
+#   index.add(df.loc[~mask, "id"])
+#   index.save()
+
+import os
+import threading
+import numpy as np
+
+BLOOM_BITS_PER_KEY = 10   # 키당 비트 수 (오탐률 약 1%)
+BLOOM_HASHES = 4
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def to_ints(ids, base=36):
+    """
+    id 목록을 int64 배열로 바꿉니다. (base=36: Reddit id, base=10: 네이버 nid)
+    """
+    if base == 10:
+        return np.asarray([int(i) for i in ids], dtype=np.int64)
+    return np.asarray([int(str(i), base) for i in ids], dtype=np.int64)
+
+
+def _hashes(values, n_bits):
+    """
+    splitmix64로 키마다 BLOOM_HASHES개의 비트 위치를 계산합니다.
+    """
+    x = values.astype(np.uint64)
+    positions = []
+    with np.errstate(over="ignore"):
+        for i in range(BLOOM_HASHES):
+            z = (x + np.uint64(0x9E3779B97F4A7C15) * np.uint64(i + 1)) & _MASK64
+            z = ((z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+            z = ((z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+            z = z ^ (z >> np.uint64(31))
+            positions.append((z % np.uint64(n_bits)).astype(np.int64))
+    return positions
+
+
+class BloomFilter:
+    def __init__(self, n_bits):
+        # 파일에서 다시 읽을 때 같은 크기가 되도록 8의 배수로 맞춤
+        self.n_bits = (max(64, int(n_bits)) + 7) // 8 * 8
+        self.bits = np.zeros(self.n_bits // 8, dtype=np.uint8)
+
+    def add(self, values):
+        for pos in _hashes(values, self.n_bits):
+            np.bitwise_or.at(self.bits, pos >> 3, (1 << (pos & 7)).astype(np.uint8))
+
+    def might_contain(self, values):
+        result = np.ones(len(values), dtype=bool)
+        for pos in _hashes(values, self.n_bits):
+            result &= (self.bits[pos >> 3] >> (pos & 7)) & 1 == 1
+        return result
+
+
+class IdIndex:
+    """
+    정렬된 int64 배열 기반의 영속 id 집합.
+    """
+
+    def __init__(self, path, base=36, bloom=False):
+        self.path = path
+        self.base = base
+        self.use_bloom = bloom
+        self.values = np.empty(0, dtype=np.int64)
+        self.bloom = None
+        self.mtime = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    @property
+    def bloom_path(self):
+        return os.path.splitext(self.path)[0] + ".bloom"
+
+    def on_disk(self):
+        return os.path.exists(self.path)
+
+    def reload(self, force=False):
+        """
+        파일이 다른 프로세스에서 바뀌었으면 다시 읽습니다. (메모리 맵이라 전체를 읽지 않음)
+        force=True이면 mtime이 같아도 다시 읽습니다. (mtime 해상도 안에 여러 번 저장된 경우)
+        """
+        if not self.on_disk():
+            return
+        mtime = os.path.getmtime(self.path)
+        if mtime == self.mtime and not force:
+            return
+        self.values = np.load(self.path, mmap_mode="r")
+        self.mtime = mtime
+        self.bloom = None
+        if self.use_bloom and os.path.exists(self.bloom_path):
+            bits = np.fromfile(self.bloom_path, dtype=np.uint8)
+            self.bloom = BloomFilter(len(bits) * 8)
+            self.bloom.bits = bits
+
+    def __len__(self):
+        return len(self.values)
+
+    def contains(self, ids):
+        """
+        ids 각각이 인덱스에 있는지 bool 배열로 반환합니다.
+        """
+        keys = to_ints(ids, self.base)
+        result = np.zeros(len(keys), dtype=bool)
+        if len(keys) == 0 or len(self.values) == 0:
+            return result
+        candidates = np.arange(len(keys))
+        if self.bloom is not None:
+            candidates = candidates[self.bloom.might_contain(keys)]
+        if len(candidates):
+            values = self.values
+            pos = np.searchsorted(values, keys[candidates])
+            hit = pos < len(values)
+            hit[hit] = values[pos[hit]] == keys[candidates][hit]
+            result[candidates] = hit
+        return result
+
+    def __contains__(self, id_):
+        return bool(self.contains([id_])[0])
+
+    def add(self, ids):
+        """
+        새 id를 정렬 위치에 끼워 넣습니다. 저장은 save()에서 합니다.
+        """
+        keys = np.unique(to_ints(ids, self.base))
+        if len(keys) == 0:
+            return
+        with self._lock:
+            values = np.asarray(self.values)
+            pos = np.searchsorted(values, keys)
+            present = pos < len(values)
+            present[present] = values[pos[present]] == keys[present]
+            keys, pos = keys[~present], pos[~present]
+            if len(keys) == 0:
+                return
+            self.values = np.insert(values, pos, keys)
+            if self.use_bloom:
+                if self.bloom is None or len(self.values) * BLOOM_BITS_PER_KEY > self.bloom.n_bits:
+                    # 용량을 넘으면 2배 크기로 다시 만듭니다
+                    self.bloom = BloomFilter(len(self.values) * BLOOM_BITS_PER_KEY * 2)
+                    self.bloom.add(self.values)
+                else:
+                    self.bloom.add(keys)
+
+    def save(self):
+        """
+        임시 파일에 쓴 뒤 교체합니다. Bloom 필터를 먼저 써서, 중간에 중단돼도
+        필터가 배열보다 적게 담는 일(= 있는 id를 없다고 판단)이 없도록 합니다.
+        """
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if self.bloom is not None:
+                tmp_bloom = self.bloom_path + ".tmp"
+                self.bloom.bits.tofile(tmp_bloom)
+                os.replace(tmp_bloom, self.bloom_path)
+            tmp_path = self.path + ".tmp.npy"
+            np.save(tmp_path, np.asarray(self.values))
+            os.replace(tmp_path, self.path)
+            self.mtime = os.path.getmtime(self.path)
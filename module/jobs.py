@@ -0,0 +1,215 @@
+# 핵심 기능:
+#   수집 작업을 Streamlit 스크립트 스레드가 아닌 백그라운드 작업자에서 실행합니다.
+#   같은 key(수집 대상)의 작업이 이미 대기/실행 중이면 새로 띄우지 않고 기존 작업을 돌려줍니다. (single-flight)
+#   작업이 쓰는 dataset은 claims(dataset_key(name) 목록)로 잡아 두므로, key가 달라도 같은 dataset을 쓰는
+#   작업(예: 서브레딧 수집과 그 서브레딧을 포함한 일괄 수집)은 동시에 실행되지 않습니다.
+#   작업 상태(진행률, ETA, 오류)는 data/jobs.json에 기록되어, 페이지를 새로고침하거나 다시 열어도
+#   같은 작업을 이어서 볼 수 있습니다. 프로세스가 재시작되면 끝나지 않은 작업은 "interrupted"로 표시됩니다.
+#
+# 사용 예:
+#   job = jobs.submit("naver:005930", "005930 게시글 수집",
+#                     lambda report: update_naver("005930", threshold, progress=lambda p, n: report(p, unit="페이지", note=f"신규 {n}개")))
+#   jobs.submit("reddit:sub:hoka", "r/hoka 수집", target, claims=[jobs.dataset_key("hoka_subreddit")])
+#   jobs.get(job["id"])                 # 상태 dict
+#   jobs.recent("naver:")               # key가 "naver:"로 시작하는 최근 작업들
+#   jobs.describe(job)                  # 화면 표시용 (문장, 진행률 0~1 또는 None)
+
+import os
+import json
+import time
+import uuid
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+JOBS_PATH = os.path.join(BASE_DIR, "data", "jobs.json")
+
+WORKERS = 3          # 동시에 실행되는 작업 수
+KEEP = 50            # 메모리와 jobs.json에 남겨 두는 최근 작업 수
+SAVE_INTERVAL = 1.0  # 진행률 기록 간격(초)
+
+ACTIVE = ("queued", "running")
+
+_lock = threading.RLock()
+_pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="job")
+_jobs = {}      # job id -> 상태 dict
+_active = {}    # key 또는 claim -> 대기/실행 중인 job id
+_saved_at = 0.0
+
+
+def _load():
+    if not os.path.exists(JOBS_PATH):
+        return {}
+    try:
+        with open(JOBS_PATH, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"🔴 Error reading {JOBS_PATH}: {e}")
+        return {}
+    # 이전 프로세스에서 끝나지 못한 작업
+    for job in saved:
+        if job["status"] in ACTIVE:
+            job["status"] = "interrupted"
+    return {job["id"]: job for job in saved}
+
+
+def _trim():
+    """
+    끝난 작업은 최근 것부터 KEEP개까지만 남깁니다. (대기/실행 중인 작업은 지우지 않음)
+    """
+    finished = sorted((j for j in _jobs.values() if j["status"] not in ACTIVE), key=lambda j: j["created"])
+    for job in finished[:max(0, len(_jobs) - KEEP)]:
+        del _jobs[job["id"]]
+
+
+def _save(force=False):
+    """
+    상태를 임시 파일에 쓴 뒤 교체합니다. 진행률 갱신은 SAVE_INTERVAL마다 한 번만 기록합니다.
+    """
+    global _saved_at
+    with _lock:
+        now = time.monotonic()
+        if not force and now - _saved_at < SAVE_INTERVAL:
+            return
+        _saved_at = now
+        _trim()
+        jobs = sorted(_jobs.values(), key=lambda j: j["created"])
+        os.makedirs(os.path.dirname(JOBS_PATH), exist_ok=True)
+        tmp_path = JOBS_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(jobs, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, JOBS_PATH)
+
+
+def _reporter(job):
+    def report(done, total=None, unit="", note=None):
+        """
+        진행 상황 기록. total을 알면 처리 속도로 ETA(초)를 계산합니다. note는 덧붙일 설명.
+        """
+        with _lock:
+            elapsed = time.time() - job["started"]
+            eta = None
+            if total and done:
+                eta = round(elapsed / done * (total - done), 1)
+            job["progress"] = {"done": done, "total": total, "unit": unit, "eta": eta, "note": note}
+            _save()
+    return report
+
+
+def _run(job, target):
+    with _lock:
+        job["status"] = "running"
+        job["started"] = time.time()
+        _save(force=True)
+    try:
+        target(_reporter(job))
+        status, error = "done", None
+    except Exception as e:
+        traceback.print_exc()
+        status, error = "failed", str(e)
+    with _lock:
+        job["status"] = status
+        job["error"] = error
+        job["finished"] = time.time()
+        for key in [job["key"], *job.get("claims", [])]:
+            if _active.get(key) == job["id"]:
+                del _active[key]
+        _save(force=True)
+
+
+def dataset_key(dataset):
+    """
+    dataset 하나를 잡는 claim key.
+    """
+    return f"dataset:{dataset}"
+
+
+def submit(key, label, target, claims=()):
+    """
+    target(report)를 백그라운드에서 실행하고 작업 상태 dict를 반환합니다.
+    같은 key나 claims 중 하나를 잡은 작업이 대기/실행 중이면 그 작업을 그대로 반환합니다.
+    """
+    claims = sorted(set(claims) - {key})
+    with _lock:
+        running = active([key, *claims])
+        if running is not None:
+            return running
+        job = {
+            "id": uuid.uuid4().hex[:8],
+            "key": key,
+            "claims": claims,
+            "label": label,
+            "status": "queued",
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "progress": None,
+            "error": None,
+        }
+        _jobs[job["id"]] = job
+        for claim in [key, *claims]:
+            _active[claim] = job["id"]
+        _save(force=True)
+    _pool.submit(_run, job, target)
+    return job
+
+
+def get(job_id):
+    with _lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+
+def is_active(key):
+    with _lock:
+        return key in _active
+
+
+def active(keys):
+    """
+    keys(key 또는 claim) 중 하나를 잡고 대기/실행 중인 작업. 없으면 None.
+    """
+    with _lock:
+        for key in keys:
+            if key in _active:
+                return _jobs[_active[key]]
+    return None
+
+
+def recent(prefix="", limit=10):
+    """
+    key가 prefix(문자열 또는 문자열 튜플)로 시작하는 작업을 최신순으로 반환합니다.
+    """
+    with _lock:
+        jobs = [dict(j) for j in _jobs.values() if j["key"].startswith(prefix)]
+    jobs.sort(key=lambda j: j["created"], reverse=True)
+    return jobs[:limit]
+
+
+def describe(job):
+    """
+    화면 표시용 (문장, 진행률)을 반환합니다. 진행률을 알 수 없으면 None.
+    """
+    icons = {"queued": "⏳", "running": "🔄", "done": "✅", "failed": "🔴", "interrupted": "⚠️"}
+    text = f"{icons.get(job['status'], '')} {job['label']} [{job['status']}]"
+    fraction = None
+    if job["started"]:
+        end = job["finished"] or time.time()
+        text += f" · {end - job['started']:.0f}초"
+    progress = job["progress"]
+    if progress:
+        done, total, unit = progress["done"], progress["total"], progress["unit"]
+        text += f" · {done}/{total} {unit}" if total else f" · {done} {unit}"
+        if progress["note"]:
+            text += f" ({progress['note']})"
+        if total:
+            fraction = min(1.0, done / total)
+        if progress["eta"] is not None and job["status"] == "running":
+            text += f" · 남은 시간 약 {progress['eta']:.0f}초"
+    if job["error"]:
+        text += f" · {job['error']}"
+    return text, fraction
+
+
+_jobs.update(_load())
@@ -0,0 +1,101 @@
+# 핵심 기능:
+#   여러 종목의 네이버 증권 토론방 게시글을 작업자 풀에서 동시에 수집합니다. (naver_board.update)
+#   모든 작업자는 네이버 호스트 하나에 대한 예산을 함께 씁니다.
+#     - rate_limit.naver_bucket: 초당 요청 수 (NAVER_QPS)
+#     - http_pool "naver" 세션: 호스트당 연결 수 (pool_maxsize, 넘으면 연결이 반환될 때까지 대기)
+#   따라서 전체 소요 시간은 종목별 소요 시간의 합이 아니라, 가장 오래 걸리는 종목과
+#   전체 페이지 수 / NAVER_QPS 중 큰 값에 가까워집니다. 각 종목의 CSV는 그 종목이 끝나는 즉시 기록됩니다.
+#
+# 대상 표기:
+#   005930                       -> --since 기준 날짜까지 수집
+#   005930:2025.05.18 09:00      -> 종목별 기준 날짜 지정
+#
+# CLI 실행 예시:
+#   python naver_batch.py 009830 012450 042660 034020 005930 --since "2025.05.17 00:00"
+#   python naver_batch.py -f codes.txt --since "2025.05.17 00:00" --workers 5 --window 2
+
+import os
+import sys
+import time
+from datetime import datetime
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import naver_board, rate_limit, http_pool, batch_runner
+
+WORKERS = 5   # 동시에 수집하는 종목 수
+WINDOW = 2    # 종목별로 미리 요청해 두는 페이지 수 (종목이 여러 개이므로 단독 실행보다 작게)
+
+
+def parse_target(spec, since=None):
+    """
+    대상 문자열을 {"code", "threshold"} dict로 변환합니다.
+    """
+    code, _, threshold = spec.strip().partition(":")
+    threshold = threshold.strip() or since
+    if not threshold:
+        raise ValueError(f"기준 날짜가 없습니다: {spec} (--since 또는 '종목코드:YYYY.MM.DD HH:MM')")
+    return {"code": code.strip(), "threshold": threshold}
+
+
+def parse_targets(specs, since=None):
+    """
+    대상 문자열 목록을 종목별 대상 하나씩으로 합칩니다. 같은 종목이 여러 번 나오면 가장 이른 기준 날짜를 씁니다.
+    (같은 종목의 update()가 동시에 돌면 같은 CSV에 중복 행을 쓰므로 종목당 작업은 하나)
+    """
+    targets = {}
+    for spec in specs:
+        if not spec.strip():
+            continue
+        target = parse_target(spec, since)
+        seen = targets.get(target["code"])
+        if seen is None or _threshold(target) < _threshold(seen):
+            targets[target["code"]] = target
+    return list(targets.values())
+
+
+def _threshold(target):
+    return datetime.strptime(target["threshold"], "%Y.%m.%d %H:%M")
+
+
+def run_batch(specs, since=None, workers=WORKERS, window=WINDOW, on_done=None):
+    """
+    종목 목록을 동시에 수집하고 종목별 결과 dict 목록을 완료 순서대로 반환합니다.
+    on_done(result)가 주어지면 종목 하나가 끝날 때마다 호출합니다.
+    """
+    def work(target, result):
+        result.update(code=target["code"], threshold=target["threshold"], rows=0, pages=0)
+
+        def progress(page, rows):
+            result["pages"] = page
+
+        df_new = naver_board.update(target["code"], target["threshold"], progress=progress, window=window)
+        result["rows"] = len(df_new)
+
+    targets = parse_targets(specs, since)
+    return batch_runner.run_all(targets, work, workers, on_done=on_done)
+
+
+def print_summary(results, elapsed=None):
+    batch_runner.print_table(results, [("code", "code", 8, "<"), ("since", "threshold", 17, "<"),
+                                       ("rows", "rows", 6, ">"), ("pages", "pages", 6, ">"),
+                                       ("sec", "seconds", 7, ">")])
+    total = (f"합계 {sum(r['rows'] for r in results)}행 / {sum(r['pages'] for r in results)}페이지 / "
+             f"종목별 시간 합 {sum(r['seconds'] for r in results):.1f}초")
+    if elapsed is not None:
+        total += f" / 전체 {elapsed:.1f}초"
+    print(total)
+    print(f"요청 속도 대기 {rate_limit.naver_bucket.waited:.1f}초 (작업자 합산), {http_pool.counters('naver').summary()}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args:
+        print("❗ 종목코드를 입력하세요. 예: python naver_batch.py 009830 005930 --since \"2025.05.17 00:00\" "
+              "[-f codes.txt] [--workers 5] [--window 2]")
+        sys.exit(1)
+
+    specs, options = batch_runner.parse_args(args, {"since": None, "workers": WORKERS, "window": WINDOW})
+    started = time.monotonic()
+    results = run_batch(specs, since=options["since"], workers=options["workers"], window=options["window"])
+    print_summary(results, elapsed=time.monotonic() - started)
@@ -1,130 +1,365 @@
+# 핵심 기능:
+#   네이버 증권 종목 토론방 게시글 목록을 종목별 CSV(data/debate/{code}_board.csv)에 수집합니다.
+#   - update(): 1페이지부터 지난 실행의 커서(watermark)까지 새 게시글만 추가
+#   - backfill(): 페이지 번호를 이진 탐색해 지정한 기간의 게시글만 추가
+#
+# CSV 행 순서:
+#   새 게시글은 실행마다 CSV 끝에 덧붙입니다. (파일 전체를 다시 쓰지 않음)
+#   한 번에 추가한 행들은 날짜 내림차순이지만, 파일 전체는 추가한 순서이므로 날짜순이 아닙니다.
+#   (backfill은 예전 기간을 나중에 추가하고, 본문 수집의 재개 위치도 이 행 순서를 기준으로 함)
+#   날짜순으로 읽으려면 read_posts(csv_path)를 사용합니다.
+#
+# 실행 예시:
+#   python naver_board.py 005930 "2025.05.18 00:00"
+#   python naver_board.py 005930 --backfill "2025.05.01 00:00" "2025.05.10 00:00"
+
 import os
+import re
 import sys
-import time
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-from datetime import datetime
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse 
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module.id_index import IdIndex
+from module import request_policy, rate_limit, checkpoint, http_pool, naver_parse, cursors
+
 # DATA_DIR = os.path.join(BASE_DIR, "data")
 DATA_DIR = os.path.join(BASE_DIR, "data", "debate")
 LOG_PATH = os.path.join(BASE_DIR, "naver_board_log.txt")
+PREFETCH = 4   # 미리 요청해 두는 페이지 수 (요청 속도는 rate_limit.naver_bucket이 제한)
+BASE_URL = "https://finance.naver.com"
+DTYPES = {"nid": "Int64"}   # 링크 없는 게시글은 nid가 비어 있으므로 nullable 정수
+MAX_PAGE = 100000   # PageProbe가 탐색하는 마지막 페이지 번호 (응답이 이상해도 탐색이 끝나도록 하는 상한)
 
-def crawl_page(page, threshold, code, existing_urls=None):
-    base = "https://finance.naver.com"
-    url = f"{base}/item/board.naver?code={code}&page={page}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(url, headers=headers)
-    r.encoding = "euc-kr"
-    soup = BeautifulSoup(r.text, "lxml")
-    
-    content_div = soup.find("div", id="content")
-    if content_div is None:
-        return [], False
-    table = content_div.find("table", class_="type2")
-    if table is None:
+_QUERY_PARAM = re.compile(r"[?&](code|nid)=([^&#]+)")
+
+def post_url(href):
+    """
+    게시글 링크에서 code와 nid만 남긴 URL과 정수 nid를 반환합니다. (nid가 없으면 None)
+    """
+    full_url = BASE_URL + href if href.startswith("/") else href
+    params = {}
+    for key, value in _QUERY_PARAM.findall(full_url):
+        params.setdefault(key, value)
+    path = full_url.split("?", 1)[0].split("#", 1)[0]
+    query = "&".join(f"{key}={params[key]}" for key in ("code", "nid") if key in params)
+    nid = params.get("nid")
+    return (f"{path}?{query}" if query else path), (int(nid) if nid and nid.isdigit() else None)
+
+def csv_header(csv_path):
+    """
+    CSV의 컬럼 목록. 파일이 없거나 비어 있으면(게시글 없이 처음 저장된 경우) 빈 목록입니다.
+    """
+    if not os.path.exists(csv_path):
+        return []
+    try:
+        return list(pd.read_csv(csv_path, encoding="utf-8-sig", nrows=0).columns)
+    except pd.errors.EmptyDataError:
+        return []
+
+def add_nid_column(csv_path):
+    """
+    nid 컬럼이 없는 예전 CSV에 url에서 뽑은 nid 컬럼을 한 번 추가합니다. (url 바로 뒤)
+    """
+    header = csv_header(csv_path)
+    if "nid" in header or "url" not in header:
+        return
+    df = pd.read_csv(csv_path, encoding="utf-8-sig")
+    nids = df["url"].str.extract(r"nid=(\d+)")[0]
+    df.insert(df.columns.get_loc("url") + 1, "nid", pd.to_numeric(nids).astype("Int64"))
+    checkpoint.write_csv(df, csv_path)
+
+def job_claims(code):
+    """
+    {code}_board.csv를 쓰는 작업(게시글 수집, 본문 업데이트)이 함께 잡는 jobs claim 목록.
+    같은 종목의 두 작업이 동시에 CSV를 추가/다시 쓰지 않도록 합니다.
+    """
+    return [f"naver:{code}"]
+
+def read_posts(csv_path, **read_csv_kwargs):
+    """
+    게시글 CSV를 최신순(date, nid 내림차순)으로 읽습니다. CSV 자체는 추가한 순서로 저장되어 있습니다.
+    """
+    df = pd.read_csv(csv_path, encoding="utf-8-sig", dtype=DTYPES, **read_csv_kwargs)
+    keys = [col for col in ("date", "nid") if col in df.columns]
+    if not keys:
+        return df
+    return df.sort_values(keys, ascending=False, na_position="last", kind="stable", ignore_index=True)
+
+def nid_index(code):
+    """
+    종목별 게시글 nid 인덱스. 없으면 기존 CSV의 url 컬럼만 읽어 한 번 만들어 둡니다.
+    """
+    index_path = os.path.join(DATA_DIR, f"{code}_nid.npy")
+    csv_path = os.path.join(DATA_DIR, f"{code}_board.csv")
+    if checkpoint.recover(csv_path):
+        # 되돌린 행의 nid가 인덱스에 이미 들어갔을 수 있으므로 CSV에서 다시 만듦
+        for path in (index_path, os.path.splitext(index_path)[0] + ".bloom"):
+            if os.path.exists(path):
+                os.remove(path)
+    add_nid_column(csv_path)
+    index = IdIndex(index_path, base=10, bloom=True)
+    if not index.on_disk() and "nid" in csv_header(csv_path):
+        nids = pd.read_csv(csv_path, encoding="utf-8-sig", usecols=["nid"], dtype=DTYPES)["nid"]
+        index.add(nids.dropna())
+        index.save()
+    return index
+
+def watermark(code):
+    """
+    update()가 끝까지 수집한 가장 큰 nid (data/cursors.json의 naver:{code}). 없으면 None.
+    nid 인덱스의 최댓값은 쓰지 않습니다. backfill()이 최신 구간을 먼저 채우면 인덱스 최댓값이
+    아직 수집하지 않은 구간을 건너뛰게 되므로, 인덱스는 중복 제거에만 씁니다.
+    """
+    cursor = cursors.load(f"naver:{code}")
+    return int(cursor["id"]) if cursor else None
+
+def crawl_page(page, threshold, code, last_nid=None):
+    url = f"{BASE_URL}/item/board.naver?code={code}&page={page}"
+    session = http_pool.get_session("naver", headers={"User-Agent": "Mozilla/5.0"})
+    r = request_policy.get(url, target=f"naver:{code}", bucket=rate_limit.naver_bucket, session=session)
+    r.raise_for_status()
+    rows = naver_parse.board_rows(r.content)
+    if rows is None:
         return [], False
     
     data, stop = [], False
-    for row in table.find_all("tr", attrs={"onmouseover": True}):
-        cells = row.find_all("td")
-        if len(cells) < 6:
-            continue
-        dt_str = cells[0].get_text(strip=True)
+    for dt_str, title, href, writer, view, like, dislike in rows:
         try:
             post_dt = datetime.strptime(dt_str, "%Y.%m.%d %H:%M")
         except Exception:
             continue
-        # 게시글 제목 및 URL 추출
-        link_tag = cells[1].find("a")
-        if link_tag:
-            title = link_tag.get_text(strip=True)
-            href = link_tag.get("href", "")
-            full_url = base + href if href.startswith("/") else href
-            
-            # URL에서 오직 code와 nid 파라미터만 사용
-            if full_url:
-                parsed_url = urlparse(full_url)
-                qs = parse_qs(parsed_url.query)
-                new_qs = {}
-                if 'code' in qs:
-                    new_qs['code'] = qs['code'][0]
-                if 'nid' in qs:
-                    new_qs['nid'] = qs['nid'][0]
-                new_query = urlencode(new_qs)
-                full_url = urlunparse((
-                    parsed_url.scheme,
-                    parsed_url.netloc,
-                    parsed_url.path,
-                    parsed_url.params,
-                    new_query,
-                    parsed_url.fragment
-                ))
-        else:
-            title = cells[1].get_text(strip=True)
-            full_url = ""
-        # 기준 날짜보다 이전이거나 이미 등록된 URL이면 중단
-        if post_dt < threshold or (existing_urls and full_url in existing_urls):
+        # 게시글 URL과 nid 추출 (URL에는 code와 nid만 남김)
+        full_url, nid = post_url(href) if href is not None else ("", None)
+        # 기준 날짜보다 이전이거나 이미 수집한 게시글(nid <= last_nid)이면 중단
+        if post_dt < threshold or (last_nid is not None and nid is not None and nid <= last_nid):
             stop = True
             break
         data.append({
             "date": post_dt,   # datetime 객체
             "title": title,
             "url": full_url,
-            "writer": cells[2].get_text(strip=True),
-            "view": cells[3].get_text(strip=True),
-            "like": cells[4].get_text(strip=True),
-            "dislike": cells[5].get_text(strip=True)
+            "nid": nid,
+            "writer": writer,
+            "view": view,
+            "like": like,
+            "dislike": dislike
         })
     return data, stop
 
-def update(code, threshold_str):  # removed max_pages parameter
-    threshold = datetime.strptime(threshold_str, "%Y.%m.%d %H:%M")
+def crawl_pages(code, threshold, last_nid=None, window=PREFETCH, progress=None):
+    """
+    1페이지부터 중단 조건(기준 날짜 또는 last_nid 이하의 nid)에 닿을 때까지 게시글을 모읍니다.
+    다음 window개 페이지를 미리 동시에 요청해 두지만, 결과는 페이지 순서대로 처리하므로
+    순차 크롤링(window=1)과 같은 행을 반환합니다. 중단되면 아직 시작하지 않은 요청은 취소합니다.
+    """
+    posts = []
+    with ThreadPoolExecutor(max_workers=window) as pool:
+        pending = {}
+        page, next_page = 1, 1
+        while True:
+            while next_page < page + window:
+                pending[next_page] = pool.submit(crawl_page, next_page, threshold, code, last_nid)
+                next_page += 1
+            page_data, should_stop = pending.pop(page).result()
+            posts.extend(page_data)
+            if progress is not None:
+                progress(page, len(posts))
+            if should_stop or not page_data:
+                # 이미 보낸 요청의 결과(와 오류)는 버림
+                for future in pending.values():
+                    future.cancel()
+                break
+            page += 1
+    return posts
+
+class PageProbe:
+    """
+    페이지 번호 -> 그 페이지의 게시글(전부). 한 번 받은 페이지는 다시 요청하지 않습니다.
+    게시글이 없는 페이지(마지막 페이지 이후)는 빈 목록입니다.
+    마지막 페이지를 넘기면 마지막 페이지를 다시 보여 주는 경우가 있어, 마지막 nid가 같은 페이지가
+    둘 이상이면 가장 앞의 페이지만 남기고 뒤의 페이지는 빈 목록(마지막 페이지 이후)으로 봅니다.
+    """
+
+    def __init__(self, code):
+        self.code = code
+        self.pages = {}
+        self.probes = 0
+        self.last_nids = {}   # 페이지의 마지막 nid -> 그 게시글을 보여 준 가장 앞의 페이지
+
+    def __call__(self, page):
+        if page not in self.pages:
+            posts = crawl_page(page, datetime.min, self.code)[0]
+            self.probes += 1
+            self.pages[page] = posts if self._first_seen(page, posts) else []
+        return self.pages[page]
+
+    def _first_seen(self, page, posts):
+        """
+        page가 마지막 nid가 같은 페이지 중 가장 앞이면 True. 더 뒤에서 먼저 받은 같은 페이지는 빈 목록으로 바꿉니다.
+        """
+        nid = posts[-1]["nid"] if posts else None
+        if nid is None:
+            return True
+        seen = self.last_nids.get(nid)
+        if seen is not None and seen < page:
+            return False
+        if seen is not None:
+            self.pages[seen] = []
+        self.last_nids[nid] = page
+        return True
+
+    def first_page(self, before, start=1, max_page=MAX_PAGE):
+        """
+        start 이후에서 가장 오래된 글이 before보다 이전인 첫 페이지. max_page까지 없으면 max_page.
+        (페이지가 날짜 내림차순이므로 1, 2, 4, 8...로 범위를 넓힌 뒤 이진 탐색)
+        """
+        def passed(page):
+            posts = self(page)
+            return not posts or posts[-1]["date"] < before
+
+        lo, step = start - 1, 1      # lo: 조건을 만족하지 않는 마지막 페이지
+        hi = start
+        while not passed(hi):
+            if hi >= max_page:
+                return max_page
+            lo, hi = hi, min(hi + step, max_page)
+            step *= 2
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if passed(mid):
+                hi = mid
+            else:
+                lo = mid
+        return hi
+
+def backfill(code, from_str, to_str, progress=None, window=PREFETCH):
+    """
+    [from, to] 기간의 게시글을 {code}_board.csv 끝에 추가하고, 추가된 게시글 DataFrame을 반환합니다.
+    1페이지부터 차례로 넘기지 않고, 페이지 번호를 이진 탐색해 기간의 첫/마지막 페이지를 찾은 뒤
+    그 범위만 window개씩 동시에 요청합니다. 이미 수집한 nid는 건너뜁니다.
+    progress(pages, total)가 주어지면 탐색 뒤 남은 페이지를 하나 받을 때마다 호출합니다.
+    """
+    date_from = datetime.strptime(from_str, "%Y.%m.%d %H:%M")
+    date_to = datetime.strptime(to_str, "%Y.%m.%d %H:%M")
     csv_path = os.path.join(DATA_DIR, f"{code}_board.csv")
-    
-    # 기존 CSV가 존재하면 로드 후 URL 집합 생성, 아니면 빈 DataFrame
-    if os.path.exists(csv_path):
-        old_df = pd.read_csv(csv_path, encoding="utf-8-sig")
-        old_df["date"] = pd.to_datetime(old_df["date"])
-        existing_urls = set(old_df["url"])
-    else:
-        old_df = pd.DataFrame()
-        existing_urls = set()
-    
-    new_posts = []
-    page = 1
-    while True:
-        page_data, should_stop = crawl_page(page, threshold, code, existing_urls)
-        new_posts.extend(page_data)
-        if should_stop or not page_data:
-            break
-        page += 1
-        time.sleep(0.7)
-    
-    df_new = pd.DataFrame(new_posts)
-    if not old_df.empty:
-        df_combined = pd.concat([df_new, old_df], ignore_index=True)
-        df_combined.drop_duplicates(subset=["url"], inplace=True)
-    else:
-        df_combined = df_new
+    with checkpoint.file_lock(csv_path):
+        known_nids = nid_index(code)
 
-    os.makedirs(DATA_DIR, exist_ok=True)
-    df_combined.sort_values("date", ascending=False, inplace=True)
-    df_combined.to_csv(csv_path, index=False, encoding="utf-8-sig")
-    
-    log_msg = (f"[{datetime.now()}] [종목코드: {code}] {len(df_new)}개 신규 게시글 추가 수집됨, "
-               f"누적 데이터 {len(df_combined)}개\n")
+    probe = PageProbe(code)
+    # first: to 이하의 글이 처음 나오는 페이지, last: from 이전 글이 처음 나오는 페이지
+    first = probe.first_page(date_to + timedelta(minutes=1))
+    last = probe.first_page(date_from, start=first)
+    # 탐색하는 동안 새 글이 올라와 경계가 뒤로 밀렸을 수 있으므로 한 페이지 더 받음
+    pages = range(first, last + 2)
+    probes = probe.probes
+
+    missing = [page for page in pages if page not in probe.pages]
+    with ThreadPoolExecutor(max_workers=window) as pool:
+        fetched = pool.map(lambda page: crawl_page(page, datetime.min, code)[0], missing)
+        for done, (page, page_data) in enumerate(zip(missing, fetched), 1):
+            probe.pages[page] = page_data
+            if progress is not None:
+                progress(done, len(missing))
+    posts = [post for page in pages for post in probe.pages[page]]
+
+    df_new = pd.DataFrame(posts)
+    if not df_new.empty:
+        df_new = df_new[(df_new["date"] >= date_from) & (df_new["date"] <= date_to)]
+        df_new = df_new.drop_duplicates(subset=["url"])
+        df_new["nid"] = df_new["nid"].astype("Int64")
+        df_new = df_new[~known_nids.contains(df_new["nid"].fillna(0))]
+        df_new = df_new.sort_values("date", ascending=False)
+
+    df_new = save_posts(csv_path, df_new, known_nids)
+    write_log(code, f"{from_str} ~ {to_str} 백필: {len(df_new)}개 게시글 추가 수집됨 "
+                    f"(탐색 {probes}회, {first}~{last + 1} 페이지)", known_nids)
+    return df_new
+
+def save_posts(csv_path, df_new, known_nids):
+    """
+    df_new를 CSV 끝에 추가하고 nid 인덱스를 갱신한 뒤, 실제로 추가한 게시글 DataFrame을 반환합니다.
+    CSV 추가와 인덱스 저장을 하나의 저널 안에서 처리합니다. (중간에 중단되면 다음 실행에서 되돌림)
+    크롤링하는 동안 같은 종목의 다른 작업(update/backfill)이 먼저 저장했을 수 있으므로,
+    잠금 안에서 인덱스를 파일에서 다시 읽고 이미 있는 nid를 한 번 더 걸러냅니다.
+    """
+    def save_index():
+        known_nids.add(df_new["nid"].dropna())
+        known_nids.save()
+
+    with checkpoint.file_lock(csv_path):
+        known_nids.reload(force=True)
+        if not df_new.empty:
+            df_new = df_new[~known_nids.contains(df_new["nid"].fillna(0))]
+        header = csv_header(csv_path)
+        if header:
+            if not df_new.empty:
+                # 기존 헤더 순서에 맞춰 끝에 추가
+                checkpoint.append_csv(df_new.reindex(columns=header), csv_path, done=save_index)
+        else:
+            checkpoint.write_csv(df_new, csv_path)
+            if not df_new.empty:
+                save_index()
+    return df_new
+
+def write_log(code, message, known_nids):
+    retries = request_policy.stats.get(f"naver:{code}")["retries"]
+    log_msg = (f"[{datetime.now()}] [종목코드: {code}] {message}, "
+               f"누적 데이터 {len(known_nids)}개 (재시도 누적 {retries}회, "
+               f"{http_pool.counters('naver').summary()})\n")
     with open(LOG_PATH, "a", encoding="utf-8") as f:
         f.write(log_msg)
     print(log_msg.strip())
-    return df_combined
+
+def update(code, threshold_str, progress=None, window=PREFETCH):  # removed max_pages parameter
+    """
+    새 게시글만 {code}_board.csv 끝에 추가하고, 추가된 게시글 DataFrame을 반환합니다.
+    지난 update()의 커서(watermark)에 닿으면 멈추고, 그 사이 backfill 등으로 이미 저장한 nid는
+    nid 인덱스로 걸러내므로 기존 CSV를 읽지 않습니다.
+    progress(pages, rows)가 주어지면 페이지를 하나 읽을 때마다 호출합니다.
+    window는 미리 요청해 두는 페이지 수 (1이면 순차 크롤링).
+    """
+    threshold = datetime.strptime(threshold_str, "%Y.%m.%d %H:%M")
+    csv_path = os.path.join(DATA_DIR, f"{code}_board.csv")
+    with checkpoint.file_lock(csv_path):
+        known_nids = nid_index(code)
+        last_nid = watermark(code)
+    
+    new_posts = crawl_pages(code, threshold, last_nid, window=window, progress=progress)
+    
+    df_crawled = pd.DataFrame(new_posts)
+    df_new = df_crawled
+    if not df_crawled.empty:
+        df_crawled = df_crawled.drop_duplicates(subset=["url"])
+        df_crawled["nid"] = df_crawled["nid"].astype("Int64")
+        # backfill로 이미 저장했거나, 저장 후 커서를 옮기기 전에 중단됐던 게시글
+        df_new = df_crawled[~known_nids.contains(df_crawled["nid"].fillna(0))]
+        df_new = df_new.sort_values("date", ascending=False)
+
+    df_new = save_posts(csv_path, df_new, known_nids)
+    # 저장이 끝난 뒤에 watermark 이동 (이미 저장돼 있던 게시글까지 포함해 이번에 훑은 가장 큰 nid)
+    if not df_crawled.empty and df_crawled["nid"].notna().any():
+        newest = df_crawled.loc[df_crawled["nid"].idxmax()]
+        if last_nid is None or newest["nid"] > last_nid:
+            cursors.save(f"naver:{code}", newest["date"].timestamp(), int(newest["nid"]))
+    write_log(code, f"{len(df_new)}개 신규 게시글 추가 수집됨", known_nids)
+    return df_new
 
 if __name__ == "__main__":
-    if len(sys.argv) > 2:
-        code = sys.argv[1]
-        threshold_date = sys.argv[2]
-        update(code, threshold_date)
+    args = sys.argv[1:]
+    window = PREFETCH
+    if "--window" in args:
+        i = args.index("--window")
+        window = int(args[i + 1])
+        del args[i:i + 2]
+    if len(args) > 3 and args[1] == "--backfill":
+        backfill(args[0], args[2], args[3], window=window)
+    elif len(args) > 1:
+        code = args[0]
+        threshold_date = args[1]
+        update(code, threshold_date, window=window)
     else:
-        print("사용법: python naver_board.py 종목코드 'YYYY.MM.DD HH:MM'")
\ No newline at end of file
+        print("사용법: python naver_board.py 종목코드 'YYYY.MM.DD HH:MM' [--window 4]")
+        print("      python naver_board.py 종목코드 --backfill 'YYYY.MM.DD HH:MM' 'YYYY.MM.DD HH:MM' [--window 4]")
\ No newline at end of file
@@ -1,37 +1,111 @@
 import os
-import time
-import requests
-from bs4 import BeautifulSoup
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_DIR = os.path.join(BASE_DIR, "data", "debate")
+sys.path.append(BASE_DIR)
+from module import request_policy, rate_limit, checkpoint, http_pool, naver_parse, naver_board, body_store
+
+FLUSH_EVERY = 200   # 본문 N개마다 본문 저장소에 저장하고 재개 위치를 기록
+WORKERS = 6         # 동시에 본문을 가져오는 작업자 수 (전체 요청 속도는 rate_limit.naver_bucket이 제한)
 
 def extract_body(url: str) -> str:
-    if not url:
+    """
+    게시글 본문을 가져옵니다. 삭제된 게시글(request_policy.is_gone)은 ""를 반환하고,
+    재시도 뒤에도 실패한 요청은 예외를 발생시켜 수집을 멈춥니다. (차단/장애 중에 빈 본문으로 넘어가지 않음)
+    """
+    if not isinstance(url, str) or not url:
         return ""
-    try:
-        resp = requests.get(url, headers=HEADERS)
-        resp.encoding = "euc-kr"
-        soup = BeautifulSoup(resp.text, "lxml")
-        body_div = soup.find("div", id="body", class_="view_se")
-        if body_div:
-            return body_div.get_text(separator="\n", strip=True)
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-    return ""
-
-def update_bodies(code: str, delay: float = 0.7):
+    session = http_pool.get_session("naver", headers=HEADERS)
+    resp = request_policy.get(url, target="naver:body", bucket=rate_limit.naver_bucket, session=session)
+    if request_policy.is_gone(resp):
+        return ""
+    resp.raise_for_status()
+    return naver_parse.body_text(resp.content)
+
+def move_bodies(code, csv_path):
+    """
+    content 컬럼이 있는 예전 CSV의 본문을 body_store로 옮기고, CSV에서는 content 컬럼을 뺍니다. (한 번만)
+    """
+    if "content" not in naver_board.csv_header(csv_path):
+        return
+    df = pd.read_csv(csv_path, encoding="utf-8-sig", dtype=naver_board.DTYPES)
+    filled = df[df["nid"].notna() & df["content"].notna() & (df["content"] != "")]
+    body_store.BodyStore(code).put_many(dict(zip(filled["nid"], filled["content"])))
+    checkpoint.write_csv(df.drop(columns="content"), csv_path)
+    print(f"📦 {code} 본문 {len(filled)}개를 본문 저장소로 옮겼습니다")
+
+
+def fetch_bodies(urls, workers=WORKERS):
+    """
+    urls의 본문을 작업자 풀에서 동시에 가져오되, 입력 순서대로 하나씩 생성합니다.
+    동시에 요청 중인 URL은 workers * 2개로 제한되고, 소비를 멈추면 대기 중인 요청은 취소됩니다.
+    """
+    urls = iter(urls)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque(pool.submit(extract_body, url) for _, url in zip(range(workers * 2), urls))
+        try:
+            while in_flight:
+                body = in_flight.popleft().result()
+                for url in urls:
+                    in_flight.append(pool.submit(extract_body, url))
+                    break
+                yield body
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+def update_bodies(code: str, progress=None, flush_every: int = FLUSH_EVERY, workers: int = WORKERS):
+    """
+    본문 저장소(body_store)에 없는 게시글의 본문을 채웁니다. progress(done, total)는 진행 상황 콜백.
+    본문이 없는 게시글은 ""로 저장하므로 게시글마다 한 번만 요청합니다.
+    본문은 workers개 작업자가 동시에 가져오고, flush_every개마다 본문 저장소에 저장하고 재개 위치를 기록하므로
+    중단된 실행은 다음 호출에서 이어서 진행합니다.
+    """
     csv_path = os.path.join(DATA_DIR, f"{code}_board.csv")
-    df = pd.read_csv(csv_path, encoding="utf-8-sig")
-    if "content" not in df.columns:
-        df["content"] = ""
+    ckpt = checkpoint.Checkpoint(f"{code}_bodies")
+    with checkpoint.file_lock(csv_path):
+        naver_board.add_nid_column(csv_path)
+        move_bodies(code, csv_path)
+    store = body_store.BodyStore(code)
+    # 게시글 CSV에서는 nid와 url만 읽음 (본문은 본문 저장소에 있음)
+    df = pd.read_csv(csv_path, encoding="utf-8-sig", usecols=["nid", "url"], dtype=naver_board.DTYPES)
 
-    empty = df["content"].isnull() | (df["content"] == "")
-    for idx, row in df.loc[empty].iterrows():
-        url = row.get("url", "")
-        df.at[idx, "content"] = extract_body(url)
-        time.sleep(delay)
+    # 재개: 이전 실행이 처리한 위치까지는 (본문이 비어 있더라도) 다시 요청하지 않음
+    resume = ckpt.load()
+    start = resume["position"] if resume else -1
+    missing = df["nid"].notna() & ~df["nid"].isin(store.nids())
+    pending = df.index[missing & (df.index > start)]
+    if resume:
+        print(f"▶️ {code} 본문 수집 재개: {start + 1}행부터 {len(pending)}개 남음")
+
+    total = len(pending)
+    bodies = {}
+    last = None
+    # 결과가 행 순서대로 오므로, 저장 시점의 idx까지는 모두 처리된 상태 (재개 위치로 사용)
+    try:
+        for done, (idx, body) in enumerate(zip(pending, fetch_bodies(df.loc[pending, "url"], workers)), start=1):
+            # 빈 본문(삭제된 게시글, 본문 없는 글)도 ""로 저장해 다음 실행에서 다시 요청하지 않음
+            # (요청 실패는 빈 본문이 아니라 예외로 오므로 여기까지 오지 않음)
+            bodies[int(df.at[idx, "nid"])] = body
+            last = idx
+            if done % flush_every == 0:
+                store.put_many(bodies)
+                ckpt.save(position=int(idx))
+                bodies = {}
+            if progress is not None:
+                progress(done, total)
+    except BaseException:
+        # 실패 직전까지 가져온 본문과 재개 위치는 남기고, 실패는 호출한 쪽(작업 상태)으로 전달
+        store.put_many(bodies)
+        if last is not None:
+            ckpt.save(position=int(last))
+        raise
 
-    df.to_csv(csv_path, index=False, encoding="utf-8-sig")
\ No newline at end of file
+    store.put_many(bodies)
+    ckpt.clear()
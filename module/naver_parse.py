@@ -0,0 +1,122 @@
+# 핵심 기능:
+#   네이버 증권 토론방 목록/본문 HTML 파싱.
+#   - "lxml"(기본): 응답 바이트를 선언된 문자셋(euc-kr)으로 한 번 디코딩해 lxml 트리를 만들고,
+#     XPath로 table.type2의 게시글 행과 div#body.view_se 노드만 찾아 텍스트를 꺼냅니다.
+#   - "bs4": 기존 BeautifulSoup 방식. 결과 비교용으로 남겨 둡니다.
+#   두 방식의 결과는 같습니다. (BeautifulSoup.get_text처럼 주석과 script/style 등의 텍스트는 제외)
+#
+# 사용 예:
+#   rows = board_rows(resp.content)     # [(날짜, 제목, href, 글쓴이, 조회, 공감, 비공감), ...] 또는 None
+#   text = body_text(resp.content)
+#
+# 벤치마크: python benchmarks/naver_parse.py
+
+import lxml.html
+from bs4 import BeautifulSoup
+
+ENCODING = "euc-kr"   # 네이버 증권 페이지가 선언하는 문자셋
+BACKEND = "lxml"
+
+# BeautifulSoup이 일반 문자열로 보지 않는 텍스트의 부모 태그
+_HIDDEN = {"script", "style", "template", "rt", "rp"}
+
+_CONTENT_TABLE = ("(//div[@id='content'])[1]"
+                  "//table[contains(concat(' ', normalize-space(@class), ' '), ' type2 ')][1]")
+_BODY_DIV = "//div[@id='body'][contains(concat(' ', normalize-space(@class), ' '), ' view_se ')][1]"
+
+
+def decode(content, encoding=ENCODING):
+    # requests의 r.text와 같은 규칙 (잘못된 바이트는 U+FFFD로 대체)
+    if isinstance(content, str):
+        return content
+    return content.decode(encoding, errors="replace")
+
+
+def _strings(node, hidden=False):
+    """
+    node 아래 텍스트 조각을 문서 순서대로 생성합니다. (주석/처리 명령과 _HIDDEN 태그 안의 텍스트 제외)
+    """
+    hidden = hidden or node.tag in _HIDDEN
+    if node.text and not hidden:
+        yield node.text
+    for child in node:
+        if isinstance(child.tag, str):
+            yield from _strings(child, hidden)
+        if child.tail and not hidden:
+            yield child.tail
+
+
+def _text(node, separator=""):
+    # BeautifulSoup get_text(separator, strip=True)와 같은 규칙
+    return separator.join(s.strip() for s in _strings(node) if s.strip())
+
+
+def _parse(content):
+    text = decode(content)
+    return lxml.html.fromstring(text) if text.strip() else None
+
+
+def _board_rows_lxml(content):
+    root = _parse(content)
+    tables = root.xpath(_CONTENT_TABLE) if root is not None else []
+    if not tables:
+        return None
+    rows = []
+    for tr in tables[0].xpath(".//tr[@onmouseover]"):
+        cells = tr.xpath(".//td")
+        if len(cells) < 6:
+            continue
+        links = cells[1].xpath(".//a")
+        href = links[0].get("href", "") if links else None
+        title = _text(links[0] if links else cells[1])
+        rows.append((_text(cells[0]), title, href,
+                     _text(cells[2]), _text(cells[3]), _text(cells[4]), _text(cells[5])))
+    return rows
+
+
+def _board_rows_bs4(content):
+    soup = BeautifulSoup(decode(content), "lxml")
+    content_div = soup.find("div", id="content")
+    if content_div is None:
+        return None
+    table = content_div.find("table", class_="type2")
+    if table is None:
+        return None
+    rows = []
+    for row in table.find_all("tr", attrs={"onmouseover": True}):
+        cells = row.find_all("td")
+        if len(cells) < 6:
+            continue
+        link_tag = cells[1].find("a")
+        href = link_tag.get("href", "") if link_tag else None
+        title = (link_tag or cells[1]).get_text(strip=True)
+        rows.append((cells[0].get_text(strip=True), title, href,
+                     cells[2].get_text(strip=True), cells[3].get_text(strip=True),
+                     cells[4].get_text(strip=True), cells[5].get_text(strip=True)))
+    return rows
+
+
+def _body_text_lxml(content):
+    root = _parse(content)
+    nodes = root.xpath(_BODY_DIV) if root is not None else []
+    return _text(nodes[0], "\n") if nodes else ""
+
+
+def _body_text_bs4(content):
+    body_div = BeautifulSoup(decode(content), "lxml").find("div", id="body", class_="view_se")
+    return body_div.get_text(separator="\n", strip=True) if body_div else ""
+
+
+def board_rows(content, backend=BACKEND):
+    """
+    목록 페이지의 게시글 행을 (날짜, 제목, href, 글쓴이, 조회, 공감, 비공감) 튜플 목록으로 반환합니다.
+    href는 링크가 없으면 None. 게시글 표가 없으면 None을 반환합니다.
+    """
+    return _board_rows_lxml(content) if backend == "lxml" else _board_rows_bs4(content)
+
+
+def body_text(content, backend=BACKEND):
+    """
+    본문 페이지의 div#body.view_se 텍스트(줄 단위)를 반환합니다. 없으면 "".
+    """
+    return _body_text_lxml(content) if backend == "lxml" else _body_text_bs4(content)
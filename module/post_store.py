@@ -0,0 +1,544 @@
+# 핵심 기능:
+#   Reddit 수집 데이터를 data/store/{dataset}/month=YYYY-MM/ 아래의 Parquet 조각(fragment)으로 저장합니다.
+#   수집기는 새 행만 새 조각으로 추가(append)하고, 한 달 파티션에 조각이 쌓이면 하나로 병합(compaction)합니다.
+#   time 컬럼은 int64 epoch(초)로 저장하고, 읽을 때 UTC datetime으로 되돌립니다.
+#
+# 주요 함수:
+#   append(dataset, df): 기존 key와 중복되지 않는 행만 새 조각으로 저장하고 추가된 행 수를 반환.
+#   read(dataset, columns, start, end): 컬럼 선택 + 월 파티션 프루닝으로 데이터를 읽어 DataFrame 반환.
+#   time_bounds(dataset): 데이터 전체를 읽지 않고 Parquet 통계로 최소/최대 시간을 반환.
+#   compact(dataset, month): 월 파티션의 조각들을 하나의 파일로 병합.
+#   key_index(dataset): 중복 제거용 id 인덱스(_index.npy). append는 데이터 파일 대신 이 인덱스만 확인.
+#   update_metrics(dataset, df): score/num_comments 같은 지표만 _metrics.parquet에 덮어써 기록
+#                                (본문 등 텍스트 컬럼이 든 조각은 다시 쓰지 않음).
+#   rollup(dataset, start, end): (UTC 날짜, subreddit)별 post_count / score_sum / num_comments_sum.
+#                                _rollup.parquet에 미리 집계해 두고, append는 새 행만 더하고
+#                                update_metrics는 지표가 바뀐 게시글의 날짜만 다시 집계합니다.
+#
+# 저장소가 아직 없는 dataset은 기존 data/{dataset}.csv 를 읽으며, 첫 append 시 CSV를 저장소로 옮깁니다.
+# append/update_metrics/compact 뒤에는 대시보드 캐시(module/datasets.py)에서 그 dataset만 무효화합니다.
+
+import os
+import sys
+import glob
+import uuid
+import threading
+from datetime import datetime, timezone
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import id_index
+
+DATA_DIR = os.path.join(BASE_DIR, "data")
+STORE_DIR = os.path.join(DATA_DIR, "store")
+
+COMPACT_THRESHOLD = 8          # 월 파티션당 조각 수가 이 값 이상이면 병합
+UNKNOWN_MONTH = "unknown"      # 시간 값이 없는 행의 파티션
+METRIC_COLUMNS = ["score", "num_comments"]   # update_metrics로 갱신되는 컬럼
+ROLLUP_KEYS = ["day", "subreddit"]
+ROLLUP_SUMS = {"score": "score_sum", "num_comments": "num_comments_sum"}   # 원본 컬럼 -> 일별 합계 컬럼
+EPOCH = pd.Timestamp(0, tz="UTC")
+
+_locks = {}
+_indexes = {}
+_locks_guard = threading.Lock()
+
+
+def _dataset_lock(dataset):
+    """
+    같은 dataset에 여러 수집 작업이 동시에 쓰지 않도록 dataset별 락을 반환합니다.
+    """
+    with _locks_guard:
+        return _locks.setdefault(dataset, threading.RLock())
+
+
+def dataset_dir(dataset):
+    return os.path.join(STORE_DIR, dataset)
+
+
+def _changed(dataset):
+    """
+    dataset을 새로 쓴 뒤 호출합니다. 대시보드 캐시(datasets)에서 이 dataset을 읽은 항목만 버립니다.
+    """
+    from module import datasets
+    datasets.invalidate(dataset)
+
+
+def _csv_path(dataset):
+    return os.path.join(DATA_DIR, f"{dataset}.csv")
+
+
+def _month_dirs(dataset):
+    """
+    (month, 경로) 목록을 월 순서대로 반환합니다.
+    """
+    root = dataset_dir(dataset)
+    if not os.path.isdir(root):
+        return []
+    months = []
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        if name.startswith("month=") and os.path.isdir(path):
+            months.append((name[len("month="):], path))
+    return months
+
+
+def _metrics_path(dataset):
+    return os.path.join(dataset_dir(dataset), "_metrics.parquet")
+
+
+def _index_path(dataset):
+    return os.path.join(dataset_dir(dataset), "_index.npy")
+
+
+def _rollup_path(dataset):
+    return os.path.join(dataset_dir(dataset), "_rollup.parquet")
+
+
+def _fragments(month_dir):
+    return sorted(glob.glob(os.path.join(month_dir, "*.parquet")))
+
+
+def exists(dataset):
+    return any(_fragments(path) for _, path in _month_dirs(dataset))
+
+
+def list_datasets(suffix):
+    """
+    저장소와 data 폴더의 CSV를 합쳐 이름이 suffix로 끝나는 dataset 목록을 반환합니다.
+    (예: suffix="_subreddit" -> ["hoka_subreddit", ...])
+    """
+    names = set()
+    if os.path.isdir(STORE_DIR):
+        names.update(n for n in os.listdir(STORE_DIR) if n.endswith(suffix))
+    if os.path.isdir(DATA_DIR):
+        names.update(f[:-len(".csv")] for f in os.listdir(DATA_DIR) if f.endswith(f"{suffix}.csv"))
+    return sorted(names)
+
+
+def _to_epoch(values):
+    ts = pd.to_datetime(values, utc=True, errors="coerce")
+    return ((ts - EPOCH) // pd.Timedelta(seconds=1)).astype("Int64")
+
+
+def _from_epoch(values):
+    return pd.to_datetime(values.astype("float64"), unit="s", utc=True)
+
+
+def _month_keys(epochs):
+    months = _from_epoch(epochs).dt.strftime("%Y-%m")
+    return months.fillna(UNKNOWN_MONTH)
+
+
+def _write_fragment(month_dir, df):
+    """
+    임시 파일에 쓴 뒤 이름을 바꿔, 읽는 쪽에서 반쯤 쓰인 조각을 보지 않도록 합니다.
+    """
+    os.makedirs(month_dir, exist_ok=True)
+    name = f"part-{datetime.now(timezone.utc):%Y%m%d%H%M%S%f}-{uuid.uuid4().hex[:8]}.parquet"
+    path = os.path.join(month_dir, name)
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _prepare(df, key, time_col):
+    df = df.copy()
+    df[key] = df[key].astype(str)
+    df[time_col] = _to_epoch(df[time_col])
+    return df
+
+
+def _write_partitioned(dataset, df, time_col):
+    months = _month_keys(df[time_col])
+    touched = []
+    for month, part in df.groupby(months, sort=True):
+        month_dir = os.path.join(dataset_dir(dataset), f"month={month}")
+        _write_fragment(month_dir, part)
+        touched.append(month)
+    return touched
+
+
+def _read_legacy_csv(dataset, key):
+    path = _csv_path(dataset)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    return pd.read_csv(path, encoding="utf-8-sig", dtype={key: str})
+
+
+def _import_csv(dataset, key, time_col):
+    """
+    저장소가 없고 기존 CSV가 있으면 한 번만 저장소로 옮깁니다.
+    """
+    if exists(dataset):
+        return
+    old = _read_legacy_csv(dataset, key)
+    if old.empty:
+        return
+    old = old.drop_duplicates(subset=[key], keep="first")
+    _write_partitioned(dataset, _prepare(old, key, time_col), time_col)
+
+
+def _prune(months, start, end):
+    """
+    [start, end] 날짜 범위와 겹치지 않는 월 파티션을 제외합니다.
+    """
+    if start is None and end is None:
+        return months
+    lo = f"{start:%Y-%m}" if start is not None else None
+    hi = f"{end:%Y-%m}" if end is not None else None
+    kept = []
+    for month, path in months:
+        if month == UNKNOWN_MONTH:
+            continue
+        if lo is not None and month < lo:
+            continue
+        if hi is not None and month > hi:
+            continue
+        kept.append((month, path))
+    return kept
+
+
+def read(dataset, columns=None, start=None, end=None, key="id", time_col="time"):
+    """
+    dataset을 읽어 시간 역순으로 정렬된 DataFrame을 반환합니다.
+
+    - columns: 읽을 컬럼 목록 (None이면 전체). Parquet에서 해당 컬럼만 읽습니다.
+    - start, end: date 범위 (양 끝 포함). 범위 밖의 월 파티션은 파일을 열지 않습니다.
+    """
+    read_columns = None
+    if columns is not None:
+        read_columns = list(columns)
+        if (start is not None or end is not None) and time_col not in read_columns:
+            read_columns.append(time_col)
+        if (os.path.exists(_metrics_path(dataset)) and key not in read_columns
+                and any(c in METRIC_COLUMNS for c in read_columns)):
+            read_columns.append(key)
+
+    if exists(dataset):
+        frames = []
+        for _, month_dir in _prune(_month_dirs(dataset), start, end):
+            for path in _fragments(month_dir):
+                frames.append(pd.read_parquet(path, columns=read_columns))
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=read_columns or [])
+        if key in df.columns:
+            df = df.drop_duplicates(subset=[key], keep="last")
+            df = _apply_metrics(dataset, df.reset_index(drop=True), key)
+        if time_col in df.columns:
+            df[time_col] = _from_epoch(df[time_col])
+    else:
+        df = _read_legacy_csv(dataset, key)
+        if df.empty:
+            return pd.DataFrame(columns=columns or [])
+        if time_col in df.columns:
+            df[time_col] = pd.to_datetime(df[time_col], utc=True, errors="coerce")
+        if read_columns is not None:
+            df = df[[c for c in read_columns if c in df.columns]]
+
+    if time_col in df.columns:
+        if start is not None:
+            df = df[df[time_col].dt.date >= start]
+        if end is not None:
+            df = df[df[time_col].dt.date <= end]
+        df = df.sort_values(time_col, ascending=False)
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df.reset_index(drop=True)
+
+
+def _apply_metrics(dataset, df, key):
+    """
+    _metrics.parquet에 기록된 최신 지표 값으로 df의 지표 컬럼을 덮어씁니다.
+    """
+    path = _metrics_path(dataset)
+    cols = [c for c in METRIC_COLUMNS if c in df.columns]
+    if not cols or not os.path.exists(path):
+        return df
+    metrics = pd.read_parquet(path)
+    cols = [c for c in cols if c in metrics.columns]
+    latest = df[[key]].merge(metrics[[key] + cols], on=key, how="left")
+    for c in cols:
+        df[c] = latest[c].fillna(df[c]).astype(df[c].dtype)
+    return df
+
+
+def update_metrics(dataset, df, key="id", time_col="time"):
+    """
+    df(key + 지표 컬럼)의 값을 _metrics.parquet에 병합해 기록합니다.
+    게시글 조각은 건드리지 않으며, read()가 읽을 때 이 값을 적용합니다.
+    """
+    cols = [c for c in METRIC_COLUMNS if c in df.columns]
+    if df.empty or not cols:
+        return 0
+    with _dataset_lock(dataset):
+        _import_csv(dataset, key, time_col)
+        rollup_before = _load_rollup(dataset) if time_col == "time" else None
+        path = _metrics_path(dataset)
+        new = df[[key] + cols].copy()
+        new[key] = new[key].astype(str)
+        if os.path.exists(path):
+            merged = pd.concat([pd.read_parquet(path), new], ignore_index=True)
+            # 이번에 갱신하지 않은 지표 컬럼은 이전 값을 유지
+            merged = merged.groupby(key, sort=False).last().reset_index()
+        else:
+            merged = new
+        tmp_path = path + ".tmp"
+        merged.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        if time_col == "time":
+            _rollup_refresh(dataset, rollup_before, new[key], key=key)
+        _changed(dataset)
+    return len(new)
+
+
+def time_bounds(dataset, time_col="time"):
+    """
+    (최소 date, 최대 date)를 반환합니다. 저장소에서는 Parquet 행 그룹 통계만 읽습니다.
+    """
+    if not exists(dataset):
+        df = read(dataset, columns=[time_col], time_col=time_col).dropna()
+        if df.empty:
+            return None, None
+        return df[time_col].min().date(), df[time_col].max().date()
+
+    lo, hi = None, None
+    for month, month_dir in _month_dirs(dataset):
+        if month == UNKNOWN_MONTH:
+            continue
+        for path in _fragments(month_dir):
+            meta = pq.ParquetFile(path).metadata
+            idx = meta.schema.names.index(time_col)
+            for i in range(meta.num_row_groups):
+                stats = meta.row_group(i).column(idx).statistics
+                if stats is None or not stats.has_min_max:
+                    continue
+                lo = stats.min if lo is None else min(lo, stats.min)
+                hi = stats.max if hi is None else max(hi, stats.max)
+    if lo is None:
+        return None, None
+    to_date = lambda s: datetime.fromtimestamp(s, tz=timezone.utc).date()
+    return to_date(lo), to_date(hi)
+
+
+def _aggregate(df, time_col="time"):
+    """
+    게시글 df를 (day, subreddit)별로 집계합니다. day는 UTC 날짜의 epoch(초), 시간 값이 없는 행은 빠집니다.
+    """
+    days = _to_epoch(df[time_col]) // 86400 * 86400
+    rows = pd.DataFrame({
+        "day": days,
+        "subreddit": df["subreddit"] if "subreddit" in df.columns else None,
+        "post_count": 1,
+    })
+    for col, total in ROLLUP_SUMS.items():
+        rows[total] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int64") if col in df.columns else 0
+    rows = rows.dropna(subset=["day"])
+    return rows.groupby(ROLLUP_KEYS, dropna=False, sort=True).sum().reset_index()
+
+
+def _rollup_stamp(dataset):
+    """
+    rollup이 반영한 저장소 상태: (조각 행 수, _metrics.parquet mtime_ns).
+    rollup을 거치지 않고 저장소가 바뀌면(다른 버전의 코드, 중단된 쓰기) 값이 달라져 다시 집계합니다.
+    """
+    path = _metrics_path(dataset)
+    return {"rows": str(count(dataset)), "metrics": str(os.stat(path).st_mtime_ns if os.path.exists(path) else 0)}
+
+
+def _load_rollup(dataset):
+    """
+    저장된 rollup이 지금 저장소와 맞으면 반환하고, 없거나 맞지 않으면 None.
+    """
+    path = _rollup_path(dataset)
+    if not os.path.exists(path):
+        return None
+    table = pq.read_table(path)
+    meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+    stamp = _rollup_stamp(dataset)
+    if any(meta.get(k) != v for k, v in stamp.items()):
+        return None
+    return table.to_pandas()[ROLLUP_KEYS + ["post_count"] + list(ROLLUP_SUMS.values())]
+
+
+def _save_rollup(dataset, df):
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **_rollup_stamp(dataset)})
+    path = _rollup_path(dataset)
+    tmp_path = path + ".tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _build_rollup(dataset, start=None, end=None):
+    return _aggregate(read(dataset, columns=["time", "subreddit"] + list(ROLLUP_SUMS), start=start, end=end))
+
+
+def _merge_rollup(old, new):
+    return (pd.concat([old, new], ignore_index=True)
+            .groupby(ROLLUP_KEYS, dropna=False, sort=True).sum().reset_index())
+
+
+def rollup(dataset, start=None, end=None):
+    """
+    (day, subreddit)별 post_count, score_sum, num_comments_sum을 반환합니다.
+    day는 UTC 날짜(자정, tz 없음)이고 start, end(date, 양 끝 포함)로 자를 수 있습니다.
+    저장소가 있으면 _rollup.parquet을 읽고(없거나 오래됐으면 한 번 전체 집계해 저장),
+    아직 CSV만 있는 dataset은 CSV를 읽어 그때그때 집계합니다.
+    """
+    if not exists(dataset):
+        df = _build_rollup(dataset)
+    else:
+        with _dataset_lock(dataset):
+            df = _load_rollup(dataset)
+            if df is None:
+                df = _build_rollup(dataset)
+                _save_rollup(dataset, df)
+    df = df.assign(day=pd.to_datetime(df["day"], unit="s"))
+    if start is not None:
+        df = df[df["day"] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df["day"] <= pd.Timestamp(end)]
+    return df.reset_index(drop=True)
+
+
+def _rollup_add(dataset, rollup_before, new):
+    """
+    append 뒤 호출: 쓰기 전에 유효했던 rollup에 새 행의 집계만 더합니다. (아니면 전체 다시 집계)
+    """
+    if rollup_before is None:
+        merged = _build_rollup(dataset)
+    else:
+        merged = _merge_rollup(rollup_before, _aggregate(new))
+    _save_rollup(dataset, merged)
+
+
+def _rollup_refresh(dataset, rollup_before, keys, key="id"):
+    """
+    update_metrics 뒤 호출: 지표가 갱신된 게시글(keys)이 있는 날짜만 다시 집계해 바꿔 넣습니다.
+    """
+    if rollup_before is None:
+        _save_rollup(dataset, _build_rollup(dataset))
+        return
+    posts = read(dataset, columns=[key, "time"], key=key)
+    times = posts.loc[posts[key].isin(set(keys)), "time"].dropna()
+    if times.empty:
+        _save_rollup(dataset, rollup_before)
+        return
+    days = _to_epoch(times) // 86400 * 86400
+    fresh = _build_rollup(dataset, start=times.min().date(), end=times.max().date())
+    fresh = fresh[fresh["day"].isin(days)]
+    kept = rollup_before[~rollup_before["day"].isin(days)]
+    _save_rollup(dataset, _merge_rollup(kept, fresh))
+
+
+def key_index(dataset, key="id", time_col="time"):
+    """
+    dataset의 중복 제거용 id 인덱스(id_index.IdIndex)를 반환합니다.
+    인덱스 파일이 없으면 저장소의 key 컬럼만 읽어 한 번 만들어 둡니다.
+    """
+    with _dataset_lock(dataset):
+        index = _indexes.get(dataset)
+        if index is None:
+            index = id_index.IdIndex(_index_path(dataset), base=36, bloom=True)
+            _indexes[dataset] = index
+        else:
+            index.reload()
+        if not index.on_disk():
+            _import_csv(dataset, key, time_col)
+            if exists(dataset):
+                index.add(read(dataset, columns=[key], key=key, time_col=time_col)[key])
+                index.save()
+        return index
+
+
+def append(dataset, df, key="id", time_col="time"):
+    """
+    df 중 저장소에 없는 key의 행만 새 조각으로 추가하고, 추가된 행 수를 반환합니다.
+    기존 파일은 다시 쓰지 않고, 중복 여부는 id 인덱스로만 확인합니다.
+    """
+    with _dataset_lock(dataset):
+        index = key_index(dataset, key=key, time_col=time_col)
+        if df is None or df.empty:
+            return 0
+        keys = df[key].astype(str)
+        new = df[~index.contains(keys) & ~keys.duplicated().values]
+        if new.empty:
+            return 0
+
+        # 일별 집계(rollup)는 게시글 dataset(time 컬럼)만 유지
+        rollup_before = _load_rollup(dataset) if time_col == "time" else None
+        touched = _write_partitioned(dataset, _prepare(new, key, time_col), time_col)
+        index.add(new[key].astype(str))
+        index.save()
+        for month in touched:
+            month_dir = os.path.join(dataset_dir(dataset), f"month={month}")
+            if len(_fragments(month_dir)) >= COMPACT_THRESHOLD:
+                compact(dataset, month, key=key, time_col=time_col)
+        if time_col == "time":
+            _rollup_add(dataset, rollup_before, new)
+        _changed(dataset)
+        return len(new)
+
+
+def count(dataset, key="id"):
+    """
+    저장된 행 수를 반환합니다. 저장소에서는 Parquet 메타데이터만 읽습니다.
+    """
+    if not exists(dataset):
+        return len(_read_legacy_csv(dataset, key))
+    return sum(
+        pq.ParquetFile(path).metadata.num_rows
+        for _, month_dir in _month_dirs(dataset)
+        for path in _fragments(month_dir)
+    )
+
+
+def compact(dataset, month=None, key="id", time_col="time"):
+    """
+    월 파티션(미지정 시 전체)의 조각들을 key 기준 중복 제거 후 하나의 파일로 병합합니다.
+    """
+    with _dataset_lock(dataset):
+        for m, month_dir in _month_dirs(dataset):
+            if month is not None and m != month:
+                continue
+            paths = _fragments(month_dir)
+            if len(paths) < 2:
+                continue
+            merged = pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True)
+            merged = merged.drop_duplicates(subset=[key], keep="last")
+            merged = merged.sort_values(time_col, ascending=False)
+            _write_fragment(month_dir, merged)
+            for p in paths:
+                os.remove(p)
+        _changed(dataset)
+
+
+def export_csv(dataset, path=None):
+    """
+    저장소 내용을 하나의 CSV로 내보냅니다. (기본: data/{dataset}.csv)
+    """
+    path = path or _csv_path(dataset)
+    read(dataset).to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+
+# CLI 실행 예시:
+#   python post_store.py compact hoka_subreddit
+#   python post_store.py export hoka_subreddit
+#   python post_store.py rollup hoka_subreddit
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "compact":
+        compact(sys.argv[2])
+        print(f"✅ {sys.argv[2]} 병합 완료 ({count(sys.argv[2])}개)")
+    elif len(sys.argv) > 2 and sys.argv[1] == "export":
+        print(f"✅ {export_csv(sys.argv[2])} 저장 완료")
+    elif len(sys.argv) > 2 and sys.argv[1] == "rollup":
+        days = rollup(sys.argv[2])
+        print(f"✅ {sys.argv[2]} 일별 집계 {days['day'].nunique()}일, 게시글 {days['post_count'].sum()}개")
+    else:
+        print("사용법: python post_store.py [compact|export|rollup] dataset")
@@ -0,0 +1,89 @@
+# 핵심 기능:
+#   여러 수집 작업(스레드)이 하나의 요청 예산을 나눠 쓰도록 하는 토큰 버킷(TokenBucket)과,
+#   praw의 모든 HTTP 요청이 공유 쿼터(reddit_quota)와 재시도 정책(request_policy)을 거치도록 하는
+#   LimitedRequestor를 제공합니다.
+#
+# 사용 예:
+#   praw.Reddit(..., requestor_class=rate_limit.LimitedRequestor)
+#   -> 같은 프로세스의 모든 Reddit 클라이언트가 reddit_quota 하나를 공유합니다.
+#      응답 헤더로 남은 쿼터를 알기 전에는 reddit_bucket(분당 100회)으로 속도를 제한합니다.
+
+import os
+import sys
+import time
+import threading
+from urllib.parse import urlparse
+import prawcore
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from module import request_policy
+
+REDDIT_QPM = 100    # Reddit OAuth 클라이언트 쿼터: 분당 100회
+REDDIT_BURST = 10   # 쉬고 있던 버킷이 한 번에 허용하는 요청 수
+NAVER_QPS = 3       # 네이버 증권 요청 속도 (초당), 쿼터 헤더가 없으므로 고정
+NAVER_BURST = 3
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 토큰이 채워지고 최대 capacity개까지 쌓이는 스레드 안전 토큰 버킷.
+    acquire()는 토큰이 생길 때까지 필요한 만큼만 기다립니다.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0      # 누적 대기 시간(초)
+        self.acquired = 0      # 누적 요청 수
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """
+        토큰을 가져가고, 기다린 시간(초)을 반환합니다.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    self.acquired += 1
+                    self.waited += waited
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+reddit_bucket = TokenBucket(rate=REDDIT_QPM / 60, capacity=REDDIT_BURST)
+reddit_quota = request_policy.Quota(fallback=reddit_bucket)
+naver_bucket = TokenBucket(rate=NAVER_QPS, capacity=NAVER_BURST)
+
+
+def _target(url):
+    """
+    재시도 기록용 대상 이름: /r/{name}/... -> r/{name}, 그 외 -> 첫 경로 (예: comments, api)
+    """
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    if len(parts) >= 2 and parts[0] == "r":
+        return f"r/{parts[1].lower()}"
+    return parts[0] if parts else "reddit"
+
+
+class LimitedRequestor(prawcore.Requestor):
+    """
+    모든 요청이 공유 쿼터를 거치고, 429/5xx/연결 오류는 request_policy로 재시도하는 prawcore Requestor.
+    """
+
+    quota = reddit_quota
+
+    def request(self, method, url, *args, **kwargs):
+        send = super().request
+        return request_policy.send(lambda: send(method, url, *args, **kwargs), _target(url), quota=self.quota)
@@ -0,0 +1,137 @@
+# 핵심 기능:
+#   praw.Reddit 클라이언트를 프로세스 전체의 작은 풀에서 빌려 씁니다. praw는 스레드 안전하지 않아
+#   (토큰 갱신과 prawcore RateLimiter 상태) 한 클라이언트는 한 번에 한 스레드만 쓰며, 스레드는 처음 요청할 때
+#   풀에서 클라이언트를 하나 빌려 끝날 때까지 씁니다. 스레드가 끝나면 클라이언트는 풀로 돌아가고, 다음에 생기는
+#   작업자 스레드(댓글 수집 풀, 일괄 수집, jobs 작업자)가 그 클라이언트와 OAuth 토큰을 그대로 이어 씁니다.
+#   따라서 만들어지는 클라이언트(토큰) 수는 스레드를 만든 횟수가 아니라 동시에 요청하는 스레드 수의 최댓값입니다.
+#   수집 모듈은 import 시점에 praw/secrets를 건드리지 않고, 실제로 요청할 때 get_reddit()을 호출합니다.
+#   클라이언트들은 연결을 재사용하는 http_pool 세션("reddit")과, 공유 쿼터(rate_limit.reddit_quota)를 거치는
+#   rate_limit.LimitedRequestor를 함께 씁니다.
+#   재시도는 LimitedRequestor(request_policy)에서 한 번만 합니다. prawcore Session의 5xx/연결 오류 재시도는 꺼서
+#   두 재시도 층의 대기가 겹치지 않게 하고, prawcore에는 401(토큰 만료) 뒤 토큰을 새로 받는 재시도만 남깁니다.
+#   prawcore RateLimiter는 클라이언트(스레드)별 요청 간격만 조절하고, 프로세스 전체의 예산은 reddit_quota가 지킵니다.
+#   REDDIT_OAUTH_URL / REDDIT_URL 환경 변수가 있으면 그 주소로 요청합니다. (예: benchmarks/fake_reddit.py 로컬 서버)
+#
+# 사용 예:
+#   from module.reddit_client import get_reddit
+#   for post in get_reddit().subreddit("hoka").new(limit=100): ...
+
+import os
+import threading
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+REQUIRED_KEYS = ["REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET", "USERNAME", "PASSWORD", "REDDIT_USER_AGENT"]
+POOL_SIZE = 16   # 호스트당 유지하는 연결 수 (댓글 수집 작업자 + 일괄 수집 작업자)
+ENDPOINT_KEYS = {"REDDIT_OAUTH_URL": "oauth_url", "REDDIT_URL": "reddit_url"}   # 환경 변수 -> praw 설정
+
+_local = threading.local()
+_idle = []        # 쓰던 스레드가 끝나 반납된 클라이언트 (list.append/pop은 GIL 안에서 원자적)
+_created = 0      # 지금까지 만든 클라이언트 수
+_secrets_cache = None
+_lock = threading.Lock()
+_warned = False   # _single_retry_layer 경고를 한 번만 출력
+
+
+def _secrets():
+    """
+    Streamlit secrets에 키가 모두 있으면 그것을, 아니면 .env/환경 변수를 사용합니다.
+    """
+    try:
+        import streamlit as st
+        if all(key in st.secrets for key in REQUIRED_KEYS):
+            return st.secrets
+    except Exception:
+        pass
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(BASE_DIR, ".env"))
+    missing = [key for key in REQUIRED_KEYS if not os.environ.get(key)]
+    if missing:
+        raise ValueError(f"Missing environment variables: {', '.join(missing)}")
+    return os.environ
+
+
+def _endpoints():
+    """
+    API 주소 재정의 (praw 설정 oauth_url / reddit_url). 없으면 praw 기본값(reddit.com)을 사용합니다.
+    """
+    return {option: os.environ[key] for key, option in ENDPOINT_KEYS.items() if os.environ.get(key)}
+
+
+def _single_retry_layer(client):
+    """
+    prawcore Session의 자체 재시도(5xx 상태, 연결 오류)를 끕니다. 이런 오류는 LimitedRequestor 안의
+    request_policy.send가 이미 재시도하므로, 남겨 두면 prawcore 재시도마다 request_policy 재시도가 다시 돕니다.
+    401 뒤 토큰을 새로 받아 한 번 더 보내는 처리는 prawcore에 그대로 남습니다.
+    (prawcore Session 인스턴스 속성을 바꾸므로 praw 8 / prawcore 4 기준, requirements.txt에서 고정)
+    속성 이름이 바뀐 버전이면 바꾸지 않고 경고만 남깁니다. (이때는 두 층의 재시도가 겹칠 수 있음)
+    """
+    global _warned
+    cores = [getattr(client, name, None) for name in ("_authorized_core", "_read_only_core")]
+    cores = [core for core in cores if core is not None]
+    patchable = [core for core in cores if hasattr(core, "RETRY_STATUSES") and hasattr(core, "RETRY_EXCEPTIONS")]
+    if not patchable or len(patchable) < len(cores):
+        with _lock:
+            if not _warned:
+                _warned = True
+                print("⚠️ prawcore Session의 재시도 설정을 찾지 못해 prawcore 재시도를 끄지 못했습니다. "
+                      "(praw 8 / prawcore 4 기준)")
+    for core in patchable:
+        core.RETRY_STATUSES = frozenset()
+        core.RETRY_EXCEPTIONS = ()
+
+
+def _new_client():
+    global _secrets_cache, _created
+    import praw
+    from module import rate_limit, http_pool
+    with _lock:
+        if _secrets_cache is None:
+            _secrets_cache = _secrets()
+        _created += 1
+    secrets = _secrets_cache
+    client = praw.Reddit(
+        client_id=secrets["REDDIT_CLIENT_ID"],
+        client_secret=secrets["REDDIT_CLIENT_SECRET"],
+        username=secrets["USERNAME"],
+        password=secrets["PASSWORD"],
+        user_agent=secrets["REDDIT_USER_AGENT"],
+        requestor_class=rate_limit.LimitedRequestor,
+        requestor_kwargs={"session": http_pool.get_session("reddit", pool_maxsize=POOL_SIZE)},
+        **_endpoints(),
+    )
+    _single_retry_layer(client)
+    return client
+
+
+class _Lease:
+    """
+    스레드가 빌린 클라이언트. 스레드가 끝나 thread-local 값이 정리되면 클라이언트를 풀(_idle)로 돌려놓습니다.
+    (가비지 컬렉션 중에 불릴 수 있으므로 잠금 없이 list.append만 함)
+    """
+
+    def __init__(self, client, idle):
+        self.client = client
+        self.idle = idle
+
+    def __del__(self):
+        self.idle.append(self.client)
+
+
+def get_reddit():
+    """
+    현재 스레드가 빌린 praw.Reddit 클라이언트를 반환합니다.
+    스레드에서 처음 호출하면 풀에서 쉬는 클라이언트를 빌리고, 없으면 새로 만듭니다.
+    """
+    lease = getattr(_local, "lease", None)
+    if lease is None:
+        try:
+            client = _idle.pop()
+        except IndexError:
+            client = _new_client()
+        lease = _local.lease = _Lease(client, _idle)
+    return lease.client
+
+
+def clients_created():
+    return _created
@@ -0,0 +1,75 @@
+# 핵심 기능:
+#   저장된 게시글의 score/num_comments를 현재 값으로 갱신합니다.
+#   update()는 이미 본 id를 버리기 때문에 지표가 처음 수집한 시점에 멈춰 있는데,
+#   이 작업은 최근 `days`일 게시글 id를 reddit.info(fullnames=...)로 100개씩 조회해
+#   post_store.update_metrics로 지표만 기록합니다. (본문 등 텍스트 컬럼은 다시 쓰지 않음)
+#   게시글 1만 개 갱신에 약 100회의 요청이 듭니다.
+#
+# CLI 실행 예시:
+#   python reddit_refresh.py hoka_subreddit            # 최근 14일
+#   python reddit_refresh.py hoka_subreddit hoka_posts --days 30
+#   python reddit_refresh.py --all
+
+import os
+import sys
+import math
+from datetime import datetime, timezone, timedelta
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import post_store
+
+LOG_PATH = os.path.join(BASE_DIR, "run_log.txt")
+
+INFO_BATCH = 100   # reddit.info 한 번의 요청으로 조회하는 게시글 수
+DAYS = 14          # 기본 갱신 기간(일)
+
+
+def fetch_metrics(reddit, post_ids) -> pd.DataFrame:
+    """
+    post_ids의 현재 지표를 id, score, num_comments 컬럼의 DataFrame으로 반환합니다.
+    (삭제 등으로 조회되지 않는 게시글은 빠집니다)
+    """
+    post_ids = list(dict.fromkeys(post_ids))
+    rows = []
+    for i in range(0, len(post_ids), INFO_BATCH):
+        fullnames = [f"t3_{pid}" for pid in post_ids[i:i + INFO_BATCH]]
+        for post in reddit.info(fullnames=fullnames):
+            rows.append({"id": post.id, "score": post.score, "num_comments": post.num_comments})
+    return pd.DataFrame(rows, columns=["id", "score", "num_comments"])
+
+
+def refresh(reddit, dataset, days=DAYS):
+    """
+    dataset(_subreddit / _posts)의 최근 `days`일 게시글 지표를 갱신하고 갱신된 게시글 수를 반환합니다.
+    """
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+    ids = post_store.read(dataset, columns=["id"], start=since)["id"]
+    live = fetch_metrics(reddit, ids)
+    post_store.update_metrics(dataset, live)
+
+    log_msg = (f"[{datetime.now()}] [{dataset}] 지표 갱신: 최근 {days}일 게시글 {len(ids)}개 중 "
+               f"{len(live)}개 갱신 (요청 {math.ceil(len(ids) / INFO_BATCH)}회)\n")
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(log_msg)
+    print(log_msg.strip())
+    return len(live)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    days = DAYS
+    if "--days" in args:
+        i = args.index("--days")
+        days = int(args[i + 1])
+        del args[i:i + 2]
+    if "--all" in args:
+        args = post_store.list_datasets("_subreddit") + post_store.list_datasets("_posts")
+    if not args:
+        print("❗ dataset 이름을 입력하세요. 예: python reddit_refresh.py hoka_subreddit [--days 14] | --all")
+        sys.exit(1)
+
+    from module.reddit_client import get_reddit
+    for dataset in args:
+        refresh(get_reddit(), dataset, days)
@@ -4,113 +4,81 @@
 #
 # 주요 파라미터:
 #   get_new_posts(keyword, subreddit, limit): 서브레딧에서 게시글을 검색 후 DataFrame 반환.
+#   dataset_name(keyword, csv_filename_base): update()가 저장하는 dataset 이름.
 #   update(search_subreddit, keyword, csv_filename_base): CSV 업데이트 및 로그 기록.
 
 import os
 import sys
-import time
 import pandas as pd
-import praw
 from datetime import datetime, timezone
-from dotenv import load_dotenv
-
-try:
-    import streamlit as st
-    if hasattr(st, "secrets") and "REDDIT_CLIENT_ID" in st.secrets:
-        secrets = st.secrets
-        IS_STREAMLIT = True
-    else:
-        raise ImportError("Streamlit secrets not configured properly.")
-except:
-    BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    load_dotenv(os.path.join(BASE_DIR, ".env"))
-    secrets = os.environ
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import post_store, cursors
+from module.reddit_client import get_reddit
+
 DATA_DIR = os.path.join(BASE_DIR, "data")
 LOG_PATH = os.path.join(BASE_DIR, "run_log.txt")
 LIMIT = 500
 
-reddit = praw.Reddit(
-    client_id=secrets["REDDIT_CLIENT_ID"],
-    client_secret=secrets["REDDIT_CLIENT_SECRET"],
-    username=secrets["USERNAME"],
-    password=secrets["PASSWORD"],
-    user_agent=secrets["REDDIT_USER_AGENT"]
-)
-
-def load_csv(path):
+def dataset_name(keyword="hoka", csv_filename_base=None):
     """
-    주어진 경로의 CSV 파일을 DataFrame으로 로드합니다.
-    (시간 컬럼은 datetime으로 파싱)
+    update()가 게시글을 저장하는 dataset 이름 ({keyword 또는 csv_filename_base}_posts).
     """
-    if os.path.exists(path):
-        return pd.read_csv(path, parse_dates=["time"])
-    return pd.DataFrame()
+    if csv_filename_base is None:
+        return f"{keyword.lower().replace(' ', '_')}_posts"
+    return f"{csv_filename_base.lower()}_posts"
 
-def get_new_posts(keyword, subreddit="all", limit=LIMIT):
+def get_new_posts(keyword, subreddit="all", limit=LIMIT, scan=None):
     """
     지정된 subreddit(기본: "all")에서, 입력받은 keyword를 기준으로 최신 게시글을 검색하여
     DataFrame으로 반환합니다.
+    scan(cursors.ListingScan)이 주어지면 이미 수집한 게시글에 닿는 즉시 검색을 멈춥니다.
+    request_policy의 재시도 뒤에도 실패한 요청은 예외로 전달됩니다. (검색 결과가 중간에 끊긴 채 저장되지 않음)
     """
     results = []
-    try:
-        for post in reddit.subreddit(subreddit).search(keyword, sort="new", limit=limit):
-            post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
-            results.append({
-                "id": post.id,
-                "subreddit": post.subreddit.display_name,
-                "title": post.title,
-                "selftext": post.selftext,
-                "time": post_time,
-                "score": post.score,
-                "num_comments": post.num_comments
-            })
-        time.sleep(2)
-    except Exception as e:
-        print(f"🔴 Error during fetching: {e}")
+    for post in get_reddit().subreddit(subreddit).search(keyword, sort="new", limit=limit):
+        if scan is not None and scan.reached(post.created_utc, post.id):
+            break
+        post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
+        results.append({
+            "id": post.id,
+            "subreddit": post.subreddit.display_name,
+            "title": post.title,
+            "selftext": post.selftext,
+            "time": post_time,
+            "score": post.score,
+            "num_comments": post.num_comments
+        })
+    if scan is not None:
+        scan.finish()
     return pd.DataFrame(results)
 
-def update(search_subreddit="all", keyword="hoka", csv_filename_base=None):
+def update(search_subreddit="all", keyword="hoka", csv_filename_base=None, progress=None):
     """
     [매개변수]
       - search_subreddit: 검색 대상 서브레딧 (기본: "all")
       - keyword: 검색어 (기본: "hoka")
-      - csv_filename_base: CSV 파일명 기본이름; 미지정 시 keyword 기반 파일("hoka_posts.csv") 사용,
-                            지정 시 data/{csv_filename_base}_posts.csv 형식으로 저장.
+      - csv_filename_base: 저장 dataset 기본이름; 미지정 시 keyword 기반 dataset("hoka_posts") 사용,
+                            지정 시 {csv_filename_base}_posts dataset에 저장.
+      - progress: progress(fetched, limit) 게시글 목록 진행 상황 콜백
 
-    CSV 파일에 새로운 포스트를 추가하고, 작업 결과를 로그에 기록합니다.
+    저장소(post_store)에 새로운 포스트만 추가하고, 작업 결과를 로그에 기록합니다.
     """
 
-    if csv_filename_base is None:
-        csv_path = os.path.join(DATA_DIR, f"{keyword.lower().replace(' ', '_')}_posts.csv")
-        display_name = keyword.lower().replace(" ", "_")
-    else:
-        csv_path = os.path.join(DATA_DIR, f"{csv_filename_base.lower()}_posts.csv")
-        display_name = csv_filename_base.lower()
-
-    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    dataset = dataset_name(keyword, csv_filename_base)
+    display_name = dataset[:-len("_posts")]
 
-    old = load_csv(csv_path)
-    new = get_new_posts(keyword, subreddit=search_subreddit)
-
-    if not old.empty:
-        before = len(new)
-        new = new[~new['id'].isin(old['id'])]
-        duplicates = before - len(new)
-    else:
-        duplicates = 0
+    scan = cursors.ListingScan(f"{dataset}:search:{search_subreddit.lower()}:{keyword.lower()}", LIMIT, progress=progress)
+    new = get_new_posts(keyword, subreddit=search_subreddit, scan=scan)
+    added = post_store.append(dataset, new)
+    scan.commit(new)
+    duplicates = len(new) - added
 
-    if not new.empty:
-        combined = pd.concat([old, new], ignore_index=True)
-        combined = combined.sort_values("time", ascending=False)
-        combined.to_csv(csv_path, index=False, encoding="utf-8-sig")
-        msg = f"[{datetime.now()}] [Subreddit: {search_subreddit}] [{display_name}] {len(new)}개 저장 / 중복 {duplicates}개 제거\n"
+    if added:
+        msg = f"[{datetime.now()}] [Subreddit: {search_subreddit}] [{display_name}] {added}개 저장 / 중복 {duplicates}개 제거 ({scan.summary()})\n"
     else:
-        if not old.empty:
-            old = old.sort_values("time", ascending=False)
-            old.to_csv(csv_path, index=False, encoding="utf-8-sig")
-        msg = f"[{datetime.now()}] [Subreddit: {search_subreddit}] [{display_name}] 새로운 포스트 없음 / 중복 {duplicates}개\n"
+        msg = f"[{datetime.now()}] [Subreddit: {search_subreddit}] [{display_name}] 새로운 포스트 없음 / 중복 {duplicates}개 ({scan.summary()})\n"
 
     with open(LOG_PATH, "a", encoding="utf-8") as f:
         f.write(msg)
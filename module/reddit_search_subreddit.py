@@ -5,155 +5,143 @@
 #       python reddit_search_subreddit.py askreddit
 #   댓글까지 함께 수집:
 #       python reddit_search_subreddit.py hoka --with-comments
+#   최근 30일 게시글 중 댓글 수가 늘어난 게시글만 댓글 다시 수집:
+#       python reddit_search_subreddit.py hoka --refresh-comments [일수]
 
 import os
 import sys
-import time
 import pandas as pd
-import praw
 from datetime import datetime, timezone, timedelta   
 
-try:
-    import streamlit as st
-    if hasattr(st, "secrets") and "REDDIT_CLIENT_ID" in st.secrets:
-        secrets = st.secrets
-        IS_STREAMLIT = True
-    else:
-        raise ImportError
-except ImportError:
-    from dotenv import load_dotenv
-    BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    load_dotenv(os.path.join(BASE_DIR, ".env"))
-    secrets = os.environ
-
-reddit = praw.Reddit(
-    client_id=secrets["REDDIT_CLIENT_ID"],
-    client_secret=secrets["REDDIT_CLIENT_SECRET"],
-    username=secrets["USERNAME"],
-    password=secrets["PASSWORD"],
-    user_agent=secrets["REDDIT_USER_AGENT"]
-)
-
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+from module import post_store, cursors, comment_harvester, reddit_refresh
+from module.reddit_client import get_reddit
+
 DATA_DIR = os.path.join(BASE_DIR, "data")
 LOG_PATH = os.path.join(BASE_DIR, "run_log.txt")
 
 LIMIT        = 1000   # 최대 게시글 수 
 DAYS_WINDOW  = 7      # 최근 일수 
+DAYS_REFRESH = 30     # 댓글 갱신 대상 게시글 기간(일)
+
+def dataset_names(subreddit: str):
+    """
+    서브레딧의 (게시글 dataset, 댓글 dataset) 이름.
+    """
+    subreddit_safe = subreddit.lower().replace(" ", "_")
+    return f"{subreddit_safe}_subreddit", f"{subreddit_safe}_comments"
 
-def get_new_posts(subreddit: str, days_window: int = DAYS_WINDOW, limit: int = LIMIT) -> pd.DataFrame:
+def get_new_posts(subreddit: str, days_window: int = DAYS_WINDOW, limit: int = LIMIT, scan=None) -> pd.DataFrame:
     """
     지정한 서브레딧에서 최근 `days_window`일 이내의 게시글을
     최대 `limit`개까지 가져와 DataFrame으로 반환.
+    scan(cursors.ListingScan)이 주어지면 이미 수집한 게시글에 닿는 즉시 멈춤.
+    요청 실패는 request_policy가 재시도한 뒤에도 남은 것이므로 그대로 발생시킴 (목록이 중간에 끊긴 채 저장되지 않음).
     """
     cutoff  = datetime.now(timezone.utc) - timedelta(days=days_window)
     results = []
     
-    try:
-        for post in reddit.subreddit(subreddit).new(limit=None):
-            post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
-            if post_time < cutoff:
-                break                     
-            results.append({
-                "id": post.id,
-                "subreddit": post.subreddit.display_name,
-                "title": post.title,
-                "selftext": post.selftext,
-                "time": post_time,
-                "score": post.score,
-                "num_comments": post.num_comments
-            })
-            if len(results) >= limit:    
-                break
-        time.sleep(1.5)                      
-    except Exception as e:
-        print(f"🔴 Error during fetching posts: {e}")
+    for post in get_reddit().subreddit(subreddit).new(limit=None):
+        if scan is not None and scan.reached(post.created_utc, post.id):
+            break
+        post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
+        if post_time < cutoff:
+            break                     
+        results.append({
+            "id": post.id,
+            "subreddit": post.subreddit.display_name,
+            "title": post.title,
+            "selftext": post.selftext,
+            "time": post_time,
+            "score": post.score,
+            "num_comments": post.num_comments
+        })
+        if len(results) >= limit:    
+            break
+    if scan is not None:
+        scan.finish()
 
     return pd.DataFrame(results)
 
 def get_comments_for_posts(posts_df: pd.DataFrame, existing_comment_ids=None) -> pd.DataFrame:
-    if existing_comment_ids is None:
-        existing_comment_ids = set()
-
-    comments = []
-    for _, row in posts_df.iterrows():
-        post_id = row["id"]
-        try:
-            submission = reddit.submission(id=post_id)
-            submission.comments.replace_more(limit=None)
-            for comment in submission.comments.list():
-                if comment.id in existing_comment_ids:
-                    continue  
-                comment_time = datetime.fromtimestamp(comment.created_utc, tz=timezone.utc)
-                comments.append({
-                    "post_id": post_id,
-                    "comment_id": comment.id,
-                    "comment_author": str(comment.author),
-                    "comment_body": comment.body,
-                    "comment_time": comment_time,
-                    "comment_score": comment.score
-                })
-            time.sleep(1.5)
-        except Exception as e:
-            print(f"Error getting comments for post {post_id}: {e}")
-
-    return pd.DataFrame(comments)
-
-def update(subreddit: str, collect_comments: bool = False):
     """
-    서브레딧 데이터를 CSV로 저장하고 로그를 기록.
-    댓글 수집 여부는 collect_comments 플래그로 제어.
+    posts_df 게시글들의 댓글을 동시에 수집해 하나의 DataFrame으로 반환.
+    (저장까지 함께 하려면 harvest_comments 사용)
     """
-    subreddit_safe = subreddit.lower().replace(" ", "_")
-    posts_csv_path = os.path.join(DATA_DIR, f"{subreddit_safe}_subreddit.csv")
-    comments_csv_path = os.path.join(DATA_DIR, f"{subreddit_safe}_comments.csv")
-    os.makedirs(DATA_DIR, exist_ok=True)
-
-    new_posts = get_new_posts(subreddit)
-    new_posts_count = len(new_posts)
-
-    if os.path.exists(posts_csv_path):
-        old_posts = pd.read_csv(posts_csv_path, encoding="utf-8-sig")
-        old_posts["time"] = pd.to_datetime(old_posts["time"])
-        old_posts_count = len(old_posts)
-
-        combined_posts = (
-            pd.concat([old_posts, new_posts], ignore_index=True).drop_duplicates(subset=["id"]).sort_values("time", ascending=False)
-        )
-        new_posts_added = len(combined_posts) - old_posts_count
-    else:
-        combined_posts = new_posts
-        new_posts_added = new_posts_count
+    batches = []
+    comment_harvester.harvest(get_reddit, list(posts_df["id"]) if not posts_df.empty else [],
+                              batches.append, existing_ids=existing_comment_ids)
+    if not batches:
+        return pd.DataFrame(columns=comment_harvester.COMMENT_COLUMNS)
+    return pd.concat(batches, ignore_index=True)
+
+def harvest_comments(comments_dataset: str, post_ids, progress=None) -> int:
+    """
+    post_ids(+ 지난 실행에서 실패한 게시글)의 댓글을 동시에 수집하면서,
+    comment_harvester.CHUNK_SIZE개씩 저장소에 바로 추가 (comment_id 중복은 id 인덱스로 제거). 추가된 댓글 수를 반환.
+    """
+    existing_ids = post_store.key_index(comments_dataset, key="comment_id", time_col="comment_time")
+    post_ids = list(post_ids) + comment_harvester.load_failed(comments_dataset)
+    added = 0
 
-    combined_posts.to_csv(posts_csv_path, index=False, encoding="utf-8-sig")
+    def store_chunk(chunk):
+        nonlocal added
+        added += post_store.append(comments_dataset, chunk, key="comment_id", time_col="comment_time")
 
-    if collect_comments:
-        if os.path.exists(comments_csv_path):
-            old_comments = pd.read_csv(comments_csv_path, encoding="utf-8-sig")
-            old_comments["comment_time"] = pd.to_datetime(old_comments["comment_time"])
-            existing_ids = set(old_comments["comment_id"])
-            old_count = len(old_comments)
-        else:
-            old_comments = pd.DataFrame()
-            existing_ids = set()
-            old_count = 0
+    result = comment_harvester.harvest(get_reddit, post_ids, store_chunk,
+                                       existing_ids=existing_ids, progress=progress)
+    comment_harvester.save_failed(comments_dataset, result["failed"])
+    return added
 
-        new_comments = get_comments_for_posts(new_posts, existing_comment_ids=existing_ids)
+def update(subreddit: str, collect_comments: bool = False, progress=None, listing_progress=None):
+    """
+    서브레딧 게시글을 저장소(post_store)에 추가하고 로그를 기록.
+    댓글 수집 여부는 collect_comments 플래그로 제어.
+    progress(done, total, failed)는 댓글 수집 진행 상황 콜백.
+    listing_progress(fetched, limit)는 게시글 목록 진행 상황 콜백.
+    """
+    subreddit_safe = subreddit.lower().replace(" ", "_")
+    posts_dataset, comments_dataset = dataset_names(subreddit)
 
-        if not old_comments.empty:
-            combined_comments = (pd.concat([old_comments, new_comments], ignore_index=True).drop_duplicates(subset=["comment_id"]))
-            new_comments_added = len(combined_comments) - old_count
-        else:
-            combined_comments  = new_comments
-            new_comments_added = len(new_comments)
+    scan = cursors.ListingScan(f"{posts_dataset}:new:{subreddit_safe}", LIMIT, progress=listing_progress)
+    new_posts = get_new_posts(subreddit, scan=scan)
+    new_posts_added = post_store.append(posts_dataset, new_posts)
+    scan.commit(new_posts)
+    total_posts = post_store.count(posts_dataset)
 
-        combined_comments.to_csv(comments_csv_path, index=False, encoding="utf-8-sig")
+    if collect_comments:
+        post_ids = new_posts["id"] if not new_posts.empty else []
+        new_comments_added = harvest_comments(comments_dataset, post_ids, progress=progress)
     else:
         new_comments_added = 0
 
     log_msg = (f"[{datetime.now()}] [{subreddit}] "
-               f"게시글 {new_posts_added}개 추가(총 {len(combined_posts)}개), "
-               f"댓글 {new_comments_added}개 추가.\n")
+               f"게시글 {new_posts_added}개 추가(총 {total_posts}개), "
+               f"댓글 {new_comments_added}개 추가. ({scan.summary()})\n")
+    with open(LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(log_msg)
+    print(log_msg.strip())
+
+def refresh_comments(subreddit: str, days: int = DAYS_REFRESH, progress=None):
+    """
+    최근 `days`일 게시글의 저장된 num_comments와 현재 값을 비교해,
+    댓글 수가 늘어난 게시글만 댓글을 다시 수집 (comment_id 기준으로 새 댓글만 추가).
+    """
+    posts_dataset, comments_dataset = dataset_names(subreddit)
+
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+    saved = post_store.read(posts_dataset, columns=["id", "num_comments"], start=since)
+    live = reddit_refresh.fetch_metrics(get_reddit(), saved["id"])
+
+    compared = saved.merge(live, on="id", suffixes=("_saved", ""))
+    grown = compared[compared["num_comments"] > compared["num_comments_saved"]]
+    new_comments_added = harvest_comments(comments_dataset, grown["id"], progress=progress)
+    # 다음 갱신은 지금 값과 비교하도록 현재 지표를 기록
+    post_store.update_metrics(posts_dataset, live)
+
+    log_msg = (f"[{datetime.now()}] [{subreddit}] 댓글 갱신: 게시글 {len(saved)}개 중 "
+               f"{len(grown)}개 댓글 증가, 댓글 {new_comments_added}개 추가.\n")
     with open(LOG_PATH, "a", encoding="utf-8") as f:
         f.write(log_msg)
     print(log_msg.strip())
@@ -161,7 +149,12 @@ def update(subreddit: str, collect_comments: bool = False):
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         subreddit_name  = sys.argv[1]
-        collect_comments = "--with-comments" in sys.argv[2:]
-        update(subreddit_name, collect_comments)
+        if "--refresh-comments" in sys.argv[2:]:
+            rest = sys.argv[sys.argv.index("--refresh-comments") + 1:]
+            days = int(rest[0]) if rest and rest[0].isdigit() else DAYS_REFRESH
+            refresh_comments(subreddit_name, days)
+        else:
+            collect_comments = "--with-comments" in sys.argv[2:]
+            update(subreddit_name, collect_comments)
     else:
-        print("❗ 서브레딧 이름을 입력하세요. 예: python reddit_search_subreddit.py hoka [--with-comments]")
+        print("❗ 서브레딧 이름을 입력하세요. 예: python reddit_search_subreddit.py hoka [--with-comments | --refresh-comments [일수]]")
@@ -0,0 +1,207 @@
+# 핵심 기능:
+#   수집기 공통 요청 정책. 고정 sleep 대신 필요한 만큼만 기다리고, 일시적인 실패는 다시 시도합니다.
+#   - Quota: 응답 헤더(x-ratelimit-remaining / x-ratelimit-reset)로 남은 요청 수를 추적해,
+#            쿼터가 남아 있으면 기다리지 않고 바닥나면 초기화 시각까지만 기다립니다.
+#   - send(): 429/5xx 응답과 연결 오류를 지수 백오프(지터 포함)로 재시도합니다. Retry-After 헤더가 있으면 그 값을 따릅니다.
+#   - stats: 대상(target)별 요청/재시도/대기 시간/실패 기록.
+#   - is_gone(): 404/410처럼 대상이 사라진 응답. 그 밖의 오류는 재시도 뒤 호출한 쪽으로 전달됩니다.
+#
+# 사용 예:
+#   resp = request_policy.get(url, target=f"naver:{code}", bucket=rate_limit.naver_bucket, headers=HEADERS)
+#   request_policy.send(lambda: session.get(url), target="r/hoka", quota=reddit_quota)
+#   print(request_policy.stats.summary())
+
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import requests
+
+RETRIES = 4                # 재시도 횟수
+BACKOFF_BASE = 1.0         # 첫 재시도 대기 시간(초), 회차마다 2배
+BACKOFF_CAP = 60.0         # 재시도 대기 시간 상한(초)
+TIMEOUT = 15               # 요청 타임아웃(초)
+RESERVE = 5                # 동시에 나가 있는 요청을 위해 남겨 두는 쿼터
+
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504, 520, 522}
+GONE_STATUSES = {404, 410}   # 대상이 삭제됨: 다시 요청해도 같으므로 실행 실패가 아닌 항목 하나의 결과로 다룸
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def backoff(attempt):
+    """
+    attempt번째 재시도 대기 시간. 여러 스레드가 동시에 다시 몰리지 않도록 절반은 무작위(지터)입니다.
+    """
+    delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def retry_after(headers):
+    """
+    Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 반환합니다. 없으면 None.
+    """
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_gone(response):
+    return response.status_code in GONE_STATUSES
+
+
+def is_transient(exc):
+    # prawcore.RequestException은 원래 예외를 original_exception에 담고 있음
+    return isinstance(getattr(exc, "original_exception", exc), TRANSIENT_ERRORS)
+
+
+class Quota:
+    """
+    응답 헤더로 알려진 남은 쿼터를 여러 스레드가 나눠 씁니다.
+    헤더를 아직 못 받았거나 창(window)이 초기화된 직후에는 fallback 버킷으로 속도를 제한합니다.
+    """
+
+    def __init__(self, fallback=None, reserve=RESERVE):
+        self.fallback = fallback
+        self.reserve = reserve
+        self.remaining = None
+        self.reset_at = None      # time.monotonic() 기준 초기화 시각
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        if "x-ratelimit-remaining" not in headers:
+            return
+        with self._lock:
+            self.remaining = float(headers["x-ratelimit-remaining"])
+            self.reset_at = time.monotonic() + float(headers.get("x-ratelimit-reset", 0))
+
+    def block(self, seconds):
+        """
+        429 응답 등으로 seconds 동안 모든 요청을 멈춥니다.
+        """
+        with self._lock:
+            self.remaining = 0
+            self.reset_at = max(self.reset_at or 0, time.monotonic() + seconds)
+
+    def wait(self):
+        """
+        요청 하나를 보낼 수 있을 때까지 기다리고, 기다린 시간(초)을 반환합니다.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.reset_at is not None and now >= self.reset_at:
+                    self.remaining = self.reset_at = None
+                if self.remaining is None:
+                    delay = None
+                elif self.remaining > self.reserve:
+                    self.remaining -= 1
+                    self.waited += waited
+                    return waited
+                else:
+                    delay = self.reset_at - now
+            if delay is None:
+                if self.fallback is not None:
+                    waited += self.fallback.acquire()
+                self.waited += waited
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+
+class RetryStats:
+    """
+    대상별 요청 수, 재시도 수, 재시도 대기 시간, 최종 실패 수.
+    """
+
+    def __init__(self):
+        self.targets = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, target):
+        return self.targets.setdefault(target, {"requests": 0, "retries": 0, "waited": 0.0, "failed": 0})
+
+    def record(self, target, retries=0, waited=0.0, failed=False):
+        with self._lock:
+            entry = self._entry(target)
+            entry["requests"] += 1
+            entry["retries"] += retries
+            entry["waited"] += waited
+            entry["failed"] += int(failed)
+
+    def get(self, target):
+        with self._lock:
+            return dict(self._entry(target))
+
+    def summary(self, prefix=""):
+        with self._lock:
+            rows = [(t, e) for t, e in sorted(self.targets.items()) if t.startswith(prefix)]
+        return "\n".join(
+            f"{t:<30} 요청 {e['requests']}회 / 재시도 {e['retries']}회 ({e['waited']:.1f}초) / 실패 {e['failed']}회"
+            for t, e in rows
+        )
+
+
+stats = RetryStats()
+
+
+def send(request, target, quota=None, bucket=None, retries=RETRIES):
+    """
+    request()를 정책에 따라 보내고 응답을 반환합니다.
+
+    - quota(Quota) 또는 bucket(rate_limit.TokenBucket)으로 요청 전 속도를 제한합니다.
+    - RETRY_STATUSES 응답과 일시적인 연결 오류는 retries번까지 다시 시도하고,
+      그래도 실패하면 마지막 응답을 그대로 반환하거나 예외를 다시 발생시킵니다.
+    """
+    waited = 0.0
+    for attempt in range(retries + 1):
+        if quota is not None:
+            quota.wait()
+        elif bucket is not None:
+            bucket.acquire()
+        try:
+            response = request()
+        except Exception as e:
+            if not is_transient(e) or attempt == retries:
+                stats.record(target, attempt, waited, failed=True)
+                raise
+            delay = backoff(attempt)
+        else:
+            if quota is not None:
+                quota.update(response.headers)
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                stats.record(target, attempt, waited, failed=response.status_code in RETRY_STATUSES)
+                return response
+            delay = retry_after(response.headers)
+            if delay is None:
+                delay = backoff(attempt)
+            if response.status_code == 429 and quota is not None:
+                # 다른 스레드도 함께 멈추도록 쿼터를 막고, 다음 quota.wait()에서 기다림
+                quota.block(delay)
+                waited += delay
+                continue
+        time.sleep(delay)
+        waited += delay
+
+
+def get(url, target, bucket=None, retries=RETRIES, session=None, **kwargs):
+    """
+    requests.get을 send() 정책으로 보냅니다.
+    """
+    kwargs.setdefault("timeout", TIMEOUT)
+    http = session or requests
+    return send(lambda: http.get(url, **kwargs), target, bucket=bucket, retries=retries)
@@ -1,12 +1,13 @@
 import streamlit as st
 import pandas as pd
 import os
+from module import datasets
 from datetime import date
 
 st.set_page_config(page_title="📱 TikTok Trending Analysis", layout="wide")
 st.title("📱 TikTok Trending Analysis")
 
-@st.cache_data
+@datasets.cached("data/tiktok.csv")
 def load_data():
     csv_path = os.path.join("data", "tiktok.csv")
     df = pd.read_csv(csv_path, encoding="cp949")
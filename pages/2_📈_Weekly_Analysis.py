@@ -1,35 +1,38 @@
 import streamlit as st
 import pandas as pd
 from datetime import date, timedelta
-import os
+from module import post_store, datasets
 
 st.set_page_config(page_title="📈 Reddit Weekly Analysis", layout="wide")
 st.title("📈 Reddit Weekly Analysis")
 
-base_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(base_dir)
-data_dir = os.path.join(project_root, "data")  
+@datasets.cached(lambda dataset: dataset)
+def load_rollup(dataset):
+    # 수집할 때 미리 집계해 둔 (날짜, 서브레딧)별 합계. 게시글 수가 아니라 날짜 수만큼의 행
+    return post_store.rollup(dataset)
 
-@st.cache_data
-def load_csv(file_name):
-    csv_path = os.path.join(data_dir, file_name)
-    df = pd.read_csv(csv_path)
-    df["time"] = pd.to_datetime(df["time"], errors="coerce")
-    df = df.dropna(subset=["time"])
-    df["week"] = df["time"].dt.to_period("W-SAT").apply(lambda r: r.start_time)
-    return df
+def summarize(rollup, start, end, weekly, subreddits=None):
+    """
+    일별 rollup을 기간/서브레딧으로 거른 뒤 날짜별(weekly면 일요일 시작 주별) score, num_comments, post_count 합계.
+    """
+    df = rollup[(rollup["day"] >= pd.Timestamp(start)) & (rollup["day"] <= pd.Timestamp(end))]
+    if subreddits is not None:
+        df = df[df["subreddit"].isin(subreddits)]
+    period = df["day"]
+    if weekly:
+        # W-SAT 주의 시작(일요일): 월=0 ... 일=6
+        period = period - pd.to_timedelta((period.dt.dayofweek + 1) % 7, unit="D")
+    grouped = df.groupby(period)[["score_sum", "num_comments_sum", "post_count"]].sum()
+    return grouped.rename(columns={"score_sum": "score", "num_comments_sum": "num_comments"})
 
-def get_csv_list(suffix):
-    return sorted([f for f in os.listdir(data_dir) if f.endswith(suffix)])
-
-csv_files_subreddit = get_csv_list("_subreddit.csv")
-if not csv_files_subreddit:
-    st.error("데이터 폴더 내에 _subreddit.csv 파일이 없습니다.")
+datasets_subreddit = post_store.list_datasets("_subreddit")
+if not datasets_subreddit:
+    st.error("데이터 폴더 내에 _subreddit 데이터가 없습니다.")
     st.stop()
 
-csv_files_posts = get_csv_list("_posts.csv")
-if not csv_files_posts:
-    st.error("데이터 폴더 내에 _posts.csv 파일이 없습니다.")
+datasets_posts = post_store.list_datasets("_posts")
+if not datasets_posts:
+    st.error("데이터 폴더 내에 _posts 데이터가 없습니다.")
     st.stop()
 
 tab1, tab2 = st.tabs(["📈 단일 서브레딧 주간 분석", "📈 기타 서브레딧 주간 분석"])
@@ -37,12 +40,10 @@ tab1, tab2 = st.tabs(["📈 단일 서브레딧 주간 분석", "📈 기타 서
 # ========= Tab1: r/Hoka 주간 활동 =========
 with tab1:
     st.markdown("### 📈 단일 서브레딧 주간 분석")
-    default_idx = csv_files_subreddit.index("hoka_subreddit.csv") if "hoka_subreddit.csv" in csv_files_subreddit else 0
-    selected_file = st.selectbox("파일 선택", csv_files_subreddit, index=default_idx, key="weekly_tab1")
-    df = load_csv(selected_file)
+    default_idx = datasets_subreddit.index("hoka_subreddit") if "hoka_subreddit" in datasets_subreddit else 0
+    selected_file = st.selectbox("데이터 선택", datasets_subreddit, index=default_idx, key="weekly_tab1")
     
-    min_date = df["time"].min().date()
-    max_date = df["time"].max().date()
+    min_date, max_date = post_store.time_bounds(selected_file)
     default_end = min(date.today(), max_date)
     
     default_start_date = max_date - timedelta(days=365)
@@ -57,16 +58,10 @@ with tab1:
         key="hoka_date"
     )
     
-    df_filtered = df[(df["time"].dt.date >= start_date) & (df["time"].dt.date <= end_date)]
+    rollup = load_rollup(selected_file)
     
     if (end_date - start_date).days <= 90:
-        df_filtered["day"] = df_filtered["time"].dt.to_period("D").apply(lambda r: r.start_time)
-        grouped = df_filtered.groupby("day").agg({
-            "score": "sum",
-            "num_comments": "sum"
-        })
-        grouped["post_count"] = df_filtered.groupby("day").size()
-        grouped.index = pd.to_datetime(grouped.index)
+        grouped = summarize(rollup, start_date, end_date, weekly=False)
         
         st.subheader("📊 Daily Total Score and Comments Count")
         st.line_chart(grouped[["score", "num_comments"]])
@@ -74,12 +69,7 @@ with tab1:
         st.subheader("📝 Daily Posts Count")
         st.line_chart(grouped["post_count"])
     else:
-        grouped = df_filtered.groupby("week").agg({
-            "score": "sum",
-            "num_comments": "sum"
-        })
-        grouped["post_count"] = df_filtered.groupby("week").size()
-        grouped.index = pd.to_datetime(grouped.index)
+        grouped = summarize(rollup, start_date, end_date, weekly=True)
         
         st.subheader("📊 Weekly Total Score and Comments Count")
         st.line_chart(grouped[["score", "num_comments"]])
@@ -90,11 +80,12 @@ with tab1:
 # ========= Tab2: 기타 서브레딧 주간 활동 =========
 with tab2:
     st.markdown("### 📈 기타 서브레딧 주간 분석")
-    default_idx_posts = csv_files_posts.index("hoka_posts.csv") if "hoka_posts.csv" in csv_files_posts else 0
-    selected_file = st.selectbox("파일 선택", csv_files_posts, index=default_idx_posts, key="weekly_tab2")
-    df = load_csv(selected_file)
+    default_idx_posts = datasets_posts.index("hoka_posts") if "hoka_posts" in datasets_posts else 0
+    selected_file = st.selectbox("데이터 선택", datasets_posts, index=default_idx_posts, key="weekly_tab2")
     
-    subreddits = sorted(df["subreddit"].dropna().unique()) if "subreddit" in df.columns else []
+    min_date, max_date = post_store.time_bounds(selected_file)
+    rollup = load_rollup(selected_file)
+    subreddits = sorted(rollup["subreddit"].dropna().unique())
     use_filter = st.checkbox("🔍 서브레딧 필터링", key="subreddit_filter")
     if use_filter and subreddits:
         selected_subs = st.multiselect("서브레딧 선택", subreddits, default=subreddits[:3])
@@ -102,8 +93,6 @@ with tab2:
         selected_subs = subreddits  
     
     # 전체 날짜 범위
-    min_date = df["time"].min().date()
-    max_date = df["time"].max().date()
     default_end = min(date.today(), max_date)
 
     default_start_date = max_date - timedelta(days=365)
@@ -118,19 +107,10 @@ with tab2:
         key="subreddit_date"
     )
     
-    df_filtered = df.copy()
-    if selected_subs:
-        df_filtered = df_filtered[df_filtered["subreddit"].isin(selected_subs)]
-    df_filtered = df_filtered[(df_filtered["time"].dt.date >= start_date) & (df_filtered["time"].dt.date <= end_date)]
+    subs_filter = selected_subs if selected_subs else None
     
     if (end_date - start_date).days <= 180:
-        df_filtered["day"] = df_filtered["time"].dt.to_period("D").apply(lambda r: r.start_time)
-        grouped = df_filtered.groupby("day").agg({
-            "score": "sum",
-            "num_comments": "sum"
-        })
-        grouped["post_count"] = df_filtered.groupby("day").size()
-        grouped.index = pd.to_datetime(grouped.index)
+        grouped = summarize(rollup, start_date, end_date, weekly=False, subreddits=subs_filter)
         
         st.subheader("📊 Daily Total Score and Comments Count")
         st.line_chart(grouped[["score", "num_comments"]])
@@ -138,12 +118,7 @@ with tab2:
         st.subheader("📝 Daily Posts Count")
         st.line_chart(grouped["post_count"])
     else:
-        grouped = df_filtered.groupby("week").agg({
-            "score": "sum",
-            "num_comments": "sum"
-        })
-        grouped["post_count"] = df_filtered.groupby("week").size()
-        grouped.index = pd.to_datetime(grouped.index)
+        grouped = summarize(rollup, start_date, end_date, weekly=True, subreddits=subs_filter)
         
         st.subheader("📊 Weekly Total Score and Comments Count")
         st.line_chart(grouped[["score", "num_comments"]])
@@ -2,10 +2,12 @@ import streamlit as st
 import os
 from datetime import datetime
 
-from module.reddit import update as update_hoka
-from module.reddit_other_subreddits import update as update_subreddits
-from module.reddit_search import update as keyword_search
-from module.reddit_search_subreddit import update as subreddit_search 
+from module import jobs, datasets
+from module.reddit import update as update_hoka, DATASET as HOKA_DATASET
+from module.reddit_other_subreddits import update as update_subreddits, dataset_name as other_dataset
+from module.reddit_search import update as keyword_search, dataset_name as search_dataset
+from module.reddit_search_subreddit import update as subreddit_search, refresh_comments, dataset_names
+from module.batch_collect import run_batch, batch_datasets
 
 st.set_page_config(page_title="🔄 Reddit Data Collection", layout="wide")
 st.title("🔄 Reddit Data Collection")
@@ -14,40 +16,130 @@ CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(CURRENT_DIR)
 LOG_PATH = os.path.join(BASE_DIR, "run_log.txt")
 
-tab1, tab2, tab3, tab4 = st.tabs([
+
+@st.fragment(run_every=2)
+def show_jobs(prefix):
+    """
+    prefix로 시작하는 작업의 진행 상황을 2초마다 다시 그립니다. (수집 자체는 다시 실행하지 않음)
+    """
+    recent = jobs.recent(prefix, limit=3)
+    for job in recent:
+        text, fraction = jobs.describe(job)
+        if fraction is None:
+            st.write(text)
+        else:
+            st.progress(fraction, text=text)
+
+    if recent and recent[0]["status"] not in jobs.ACTIVE and os.path.exists(LOG_PATH):
+        with open(LOG_PATH, encoding="utf-8") as f:
+            lines = f.readlines()
+        if lines:
+            st.markdown("### 📝 최근 수집 로그")
+            st.code(lines[-1], language="text")
+
+
+@st.fragment
+def show_cache():
+    """
+    대시보드 데이터셋 캐시 상태. 수집 작업이 쓴 dataset은 자동으로 무효화되고,
+    다른 프로세스가 고친 파일도 mtime/크기로 감지하므로 여기서는 필요할 때 하나씩만 다시 읽게 합니다.
+    """
+    cached = datasets.entries()
+    if not cached:
+        st.write("캐시된 데이터셋이 없습니다.")
+        return
+    stats = datasets.stats()
+    st.caption(f"캐시 적중 {stats['hits']}회 / 읽기 {stats['misses']}회")
+    for item in cached:
+        loaded = datetime.fromtimestamp(item["loaded"]).strftime("%H:%M:%S")
+        col1, col2 = st.columns([4, 1])
+        col1.write(f"`{os.path.basename(item['source'])}` · 항목 {item['entries']}개 · "
+                   f"{loaded} 읽음 ({item['seconds']:.2f}초)")
+        if col2.button("🔄 다시 읽기", key=f"invalidate:{item['source']}"):
+            datasets.invalidate(item["source"])
+            st.rerun(scope="fragment")
+
+    report = datasets.memory_report()
+    st.markdown("#### 💾 메모리 사용량")
+    st.dataframe([{
+        "데이터셋": os.path.basename(d["source"]),
+        "항목": d["entries"],
+        "공유 (MB, 메모리 맵)": round(d["shared_bytes"] / 2 ** 20, 2),
+        "힙 (MB)": round(d["heap_bytes"] / 2 ** 20, 2),
+    } for d in report["datasets"]], hide_index=True)
+    st.dataframe([{
+        "세션": s["session"] or "-",
+        "뷰": s["views"],
+        "뷰 크기 (MB)": round(s["view_bytes"] / 2 ** 20, 2),
+        "세션 전용 (MB)": round(s["private_bytes"] / 2 ** 20, 2),
+    } for s in report["sessions"]], hide_index=True)
+
+
+def submit(key, label, target, datasets_used=()):
+    """
+    datasets_used는 작업이 쓰는 dataset 이름들. 같은 dataset을 쓰는 작업이 실행 중이면 새로 띄우지 않습니다.
+    """
+    claims = [jobs.dataset_key(name) for name in datasets_used]
+    running = jobs.active([key, *claims])
+    if running is not None:
+        st.info(f"'{running['label']}' 작업이 같은 데이터를 수집 중입니다. 진행 상황을 확인하세요.")
+    else:
+        jobs.submit(key, label, target, claims)
+
+
+def listing_progress(report):
+    return lambda fetched, limit: report(fetched, unit="게시글")
+
+
+tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "🔍 서브레딧 데이터 수집",
     "🔍 검색어 기반 수집",
     "🔄 r/Hoka 서브레딧 데이터 수집",
     "🔄 전체 서브레딧 수집",
+    "📦 일괄 수집",
 ])
 
 with tab1:
     st.markdown("### 🔄 서브레딧 기반 데이터 수집")
 
     target_subreddit = st.text_input("서브레딧 이름", placeholder="ex. askrunningshoegeeks")
-    
+
     collect_comments_option = st.checkbox("댓글 수집", value=False)
-    
+
+    def comment_progress(report):
+        return lambda done, total, failed: report(done, total, "게시글 댓글",
+                                                  note=f"실패 {failed}개 재시도 예정" if failed else None)
+
     if st.button("🔍 데이터 수집 실행"):
         if target_subreddit.strip():
-            with st.spinner(f"'{target_subreddit}' 서브레딧 데이터를 수집 중입니다..."):
-                subreddit_search(target_subreddit, collect_comments=collect_comments_option)
-            st.success(f"✅ '{target_subreddit}' 데이터 수집 완료!")
-            
-            if os.path.exists(LOG_PATH):
-                with open(LOG_PATH, encoding="utf-8") as f:
-                    last_log = f.readlines()[-1]
-                st.markdown("### 📝 최근 수집 로그")
-                st.code(last_log, language="text")
+            name = target_subreddit.strip()
+            posts_dataset, comments_dataset = dataset_names(name)
+            submit(f"reddit:sub:{posts_dataset}", f"r/{name} 수집",
+                   lambda report, name=name, with_comments=collect_comments_option: subreddit_search(
+                       name, collect_comments=with_comments, progress=comment_progress(report),
+                       listing_progress=listing_progress(report)),
+                   [posts_dataset, comments_dataset])
         else:
             st.warning("올바른 서브레딧 이름을 입력하세요!")
 
+    if st.button("💬 댓글 갱신 실행 (댓글 수가 늘어난 게시글만)"):
+        if target_subreddit.strip():
+            name = target_subreddit.strip()
+            posts_dataset, comments_dataset = dataset_names(name)
+            submit(f"reddit:sub-refresh:{posts_dataset}", f"r/{name} 댓글 갱신",
+                   lambda report, name=name: refresh_comments(name, progress=comment_progress(report)),
+                   [posts_dataset, comments_dataset])
+        else:
+            st.warning("올바른 서브레딧 이름을 입력하세요!")
+
+    show_jobs("reddit:sub")
+
 with tab2:
     st.markdown("### 🔍 전체 서브레딧에서 검색")
     st.info("세 개의 항목을 입력하세요:\n"
             "1. 검색 대상 서브레딧 (입력하지 않으면 기본값 'all' 사용)\n"
             "2. 검색 대상 키워드 (입력하지 않으면 기본값 'hoka' 사용)\n"
-            "3. 참조 대상 CSV 파일 이름 (선택사항: 입력하지 않으면 키워드 기반 파일 이름 사용)")
+            "3. 저장 대상 dataset 이름 (선택사항: 입력하면 {이름}_posts, 입력하지 않으면 {키워드}_posts에 저장)")
 
     input_subreddit = st.text_input("검색 대상 서브레딧", placeholder="ex. all, askrunningshoegeeks")
     if input_subreddit.strip() == "":
@@ -57,45 +149,72 @@ with tab2:
     if input_keyword.strip() == "":
         input_keyword = "hoka"
 
-    input_csv = st.text_input("참조 대상 CSV 파일", placeholder="ex. hoka (선택사항)")
+    input_csv = st.text_input("저장 대상 dataset 이름", placeholder="ex. hoka → hoka_posts (선택사항)")
     if input_csv.strip() == "":
         input_csv = None
 
     if st.button("🔍 키워드로 수집 실행"):
-        with st.spinner(f"'{input_keyword}' 키워드로 '{input_subreddit}' 서브레딧에서 수집 중입니다..."):
-            keyword_search(search_subreddit=input_subreddit, keyword=input_keyword, csv_filename_base=input_csv)
-        st.success(f"✅ '{input_keyword}' 키워드 수집 완료!")
+        dataset = search_dataset(input_keyword, input_csv)
+        submit(f"reddit:search:{input_subreddit.lower()}:{input_keyword.lower()}:{dataset}",
+               f"'{input_keyword}' 검색 (r/{input_subreddit})",
+               lambda report, sub=input_subreddit, kw=input_keyword, base=input_csv: keyword_search(
+                   search_subreddit=sub, keyword=kw, csv_filename_base=base, progress=listing_progress(report)),
+               [dataset])
 
-        if os.path.exists(LOG_PATH):
-            with open(LOG_PATH, encoding="utf-8") as f:
-                logs = f.readlines()[-1]
-            st.markdown("### 📝 최근 수집 로그")
-            st.code(logs, language="text")
+    show_jobs("reddit:search:")
 
 with tab3:
     st.markdown("### 🔄 r/Hoka 서브레딧 데이터 수집")
 
     if st.button("🌍 r/Hoka 수집 실행"):
-        with st.spinner("r/Hoka 데이터를 수집 중입니다..."):
-            update_hoka()
-        st.success("✅ r/Hoka 수집 완료!")
+        submit("reddit:hoka", "r/Hoka 수집",
+               lambda report: update_hoka(progress=listing_progress(report)), [HOKA_DATASET])
 
-        if os.path.exists(LOG_PATH):
-            with open(LOG_PATH, encoding="utf-8") as f:
-                logs = f.readlines()[-1]
-            st.markdown("### 📝 최근 수집 로그")
-            st.code(logs, language="text")
+    show_jobs("reddit:hoka")
 
 with tab4:
     st.markdown("### 🔄 전체 서브레딧에서 'hoka' 키워드 검색")
 
     if st.button("🌍 전체 서브레딧 수집 실행"):
-        with st.spinner("전체 subreddit에서 데이터를 수집 중입니다..."):
-            update_subreddits()
-        st.success("✅ 전체 서브레딧 수집 완료!")
+        submit("reddit:other:hoka", "전체 서브레딧 'hoka' 수집",
+               lambda report: update_subreddits(progress=listing_progress(report)), [other_dataset()])
+
+    show_jobs("reddit:other:")
+
+with tab5:
+    st.markdown("### 📦 여러 대상 동시 수집")
+    st.info("한 줄에 하나씩 입력하세요:\n"
+            "- `r/hoka` : 서브레딧 신규 게시글\n"
+            "- `r/askrunningshoegeeks:hoka` : 서브레딧 안에서 키워드 검색\n"
+            "- `hoka` : 전체 서브레딧에서 키워드 검색")
+
+    batch_input = st.text_area("수집 대상", placeholder="r/hoka\nr/handbags\nhoka")
+    batch_workers = st.slider("동시 작업 수", min_value=1, max_value=8, value=4)
+    batch_comments = st.checkbox("댓글 수집 (서브레딧 대상)", value=False, key="batch_comments")
+
+    def run_batch_job(report, specs, workers, with_comments):
+        finished = []
+
+        def on_done(result):
+            finished.append(result)
+            report(len(finished), len(specs), "대상", note=f"{result['target']} {result['seconds']}초")
+
+        results = run_batch(specs, workers=workers, collect_comments=with_comments, on_done=on_done)
+        errors = [r["target"] for r in results if r["error"]]
+        if errors:
+            raise RuntimeError(f"실패한 대상: {', '.join(errors)}")
+
+    if st.button("📦 일괄 수집 실행"):
+        specs = [line.strip() for line in batch_input.splitlines() if line.strip()]
+        if specs:
+            submit("reddit:batch:" + ",".join(sorted(specs)), f"일괄 수집 {len(specs)}개 대상",
+                   lambda report, specs=specs, workers=batch_workers, with_comments=batch_comments:
+                   run_batch_job(report, specs, workers, with_comments),
+                   batch_datasets(specs))
+        else:
+            st.warning("수집 대상을 입력하세요!")
 
-        if os.path.exists(LOG_PATH):
-            with open(LOG_PATH, encoding="utf-8") as f:
-                logs = f.readlines()[-1]
-            st.markdown("### 📝 최근 수집 로그")
-            st.code(logs, language="text")
\ No newline at end of file
+    show_jobs("reddit:batch:")
+
+with st.expander("🗂️ 대시보드 데이터셋 캐시"):
+    show_cache()
@@ -1,25 +1,25 @@
-import os
 import streamlit as st
 import pandas as pd
 import re
+from module import post_store, datasets
 
 st.set_page_config(page_title="#️⃣ Reddit Keyword Analysis", layout="wide")
 st.title("#️⃣ Reddit Keyword Analysis")
 
-base_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(base_dir)
-data_dir = os.path.join(project_root, "data")
+@datasets.cached(lambda dataset: dataset)
+def load_dataset(dataset):
+    return post_store.read(dataset)
 
-@st.cache_data
-def load_csv(file_name):
-    return pd.read_csv(os.path.join(data_dir, file_name))
+@datasets.cached(lambda dataset: dataset)
+def load_comments(dataset):
+    return post_store.read(dataset, key="comment_id", time_col="comment_time")
 
 subreddit = st.selectbox('주제 선택', ['askrunningshoegeeks', 'handbags'])
 default_brands = ['coach', 'louis vuitton'] if subreddit.lower() == 'handbags' else ['hoka', 'asics']
 
 if subreddit.lower() == 'handbags':
-    df_sub = load_csv('handbags_subreddit.csv')
-    df_comm = load_csv('handbags_comments.csv')
+    df_sub = load_dataset('handbags_subreddit')
+    df_comm = load_comments('handbags_comments')
     df_sub['text'] = df_sub['title'].fillna('') + ' ' + df_sub['selftext'].fillna('')
     df_comm['text'] = df_comm['comment_body'].fillna('')
     df_comm.rename(columns={'comment_time': 'time'}, inplace=True)
@@ -45,8 +45,8 @@ if subreddit.lower() == 'handbags':
         'miu miu': ['miu miu', 'miumiu', 'wander matelassé', 'leather beau', 'arcadie', 'aventure']
     }
 else:
-    df_sub = load_csv('askrunningshoegeeks_subreddit.csv')
-    df_comm = load_csv('askrunningshoegeeks_comments.csv')
+    df_sub = load_dataset('askrunningshoegeeks_subreddit')
+    df_comm = load_comments('askrunningshoegeeks_comments')
     df_sub['text'] = df_sub['title'].fillna('') + ' ' + df_sub['selftext'].fillna('')
     df_comm['text'] = df_comm['comment_body'].fillna('')
     df_comm.rename(columns={'comment_time': 'time'}, inplace=True)
@@ -67,7 +67,7 @@ else:
         'skechers': ['go walk 7', 'go walk joy', 'skechers', 'go walk 6', 'arch fit', 'summits', 'skech lite pro', 'skech-lite', 'glide step']
     }
 
-df['time'] = pd.to_datetime(df['time'], errors='coerce')
+df['time'] = pd.to_datetime(df['time'], errors='coerce', utc=True)
 aggregation_period = st.selectbox('집계 기준', ['Daily', 'Weekly'])
 lower_text = df['text'].str.lower()
 
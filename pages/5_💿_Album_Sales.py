@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import os
+from module import datasets
 
 st.set_page_config(page_title="💿 Album Sales Analysis", layout="wide")
 st.title("💿 Album Sales Analysis")
@@ -9,7 +10,7 @@ st.title("💿 Album Sales Analysis")
 base_dir = os.path.dirname(os.path.abspath(__file__))
 data_dir = os.path.join(os.path.dirname(base_dir), "data")
 
-@st.cache_data
+@datasets.cached(os.path.join(data_dir, "album_sales.csv"))
 def load_data():
     csv_path = os.path.join(data_dir, "album_sales.csv")
     df = pd.read_csv(csv_path)
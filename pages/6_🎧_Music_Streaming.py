@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 import os
+from module import datasets
 
 st.set_page_config(page_title="🎧 Music Streaming Analysis", layout="wide")
 st.title("🎧 Music Streaming Analysis")
@@ -12,7 +13,7 @@ tab1, tab2 = st.tabs(["🟢 Spotify", "🔴 YouTube Music"])
 with tab1:
     st.info("[스포티파이 일간 스트리밍 분석](https://charts.spotify.com/charts/view/regional-us-daily/latest)")
 
-    @st.cache_data
+    @datasets.cached("data/us_daily_stream.csv")
     def load_spotify_data():
         csv_path = os.path.join("data", "us_daily_stream.csv")
         df = pd.read_csv(csv_path)
@@ -99,7 +100,7 @@ with tab1:
 with tab2:
     st.info("[유튜브 뮤직 주간 스트리밍 분석](https://charts.youtube.com/charts/TopArtists/us/weekly)") 
 
-    @st.cache_data
+    @datasets.cached("data/us_weekly_yt.csv")
     def load_yt_data():
         csv_path = os.path.join("data", "us_weekly_yt.csv")
         df = pd.read_csv(
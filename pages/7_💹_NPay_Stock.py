@@ -2,8 +2,10 @@ import os
 import streamlit as st
 import pandas as pd
 from datetime import datetime, date, time, timedelta
-from module.naver_board import update as update_naver
+from module import jobs, datasets
+from module.naver_board import update as update_naver, read_posts, job_claims
 from module.naver_content import update_bodies
+from module.body_store import BodyStore, with_bodies
 
 st.set_page_config(page_title="💹 Naver Pay Stock Board", layout="wide")
 st.title("💹 Naver Pay Stock Board")
@@ -11,6 +13,42 @@ st.title("💹 Naver Pay Stock Board")
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_DIR = os.path.join(BASE_DIR, "data", "debate")
 
+
+@datasets.cached(lambda csv_path, code=None, bodies_mtime=None: csv_path)
+def load_preview(csv_path, code=None, bodies_mtime=None):
+    # CSV가 바뀔 때만 다시 읽음 (진행 상황을 다시 그릴 때마다 CSV 전체를 읽지 않도록)
+    # CSV는 추가한 순서로 저장되어 있으므로 최신순으로 정렬해 읽음
+    preview = read_posts(csv_path).head()
+    # code가 주어지면 미리보기 행의 본문만 본문 저장소에서 꺼내 붙임
+    return with_bodies(preview, code) if code else preview
+
+
+@st.fragment(run_every=2)
+def show_jobs(prefix, csv_path, title, log_path=None, code=None):
+    """
+    작업 진행 상황을 2초마다 다시 그리고, 작업이 끝나면 최근 로그와 데이터 미리보기를 보여줍니다.
+    """
+    recent = jobs.recent(prefix, limit=3)
+    for job in recent:
+        text, fraction = jobs.describe(job)
+        if fraction is None:
+            st.write(text)
+        else:
+            st.progress(fraction, text=text)
+    if not recent or recent[0]["status"] in jobs.ACTIVE:
+        return
+
+    if log_path and os.path.exists(log_path):
+        logs = open(log_path, encoding="utf-8").read().splitlines()
+        if logs:
+            st.markdown("### 📝 최근 수집 로그")
+            st.code(logs[-1], language="text")
+    if os.path.exists(csv_path):
+        st.markdown(title)
+        bodies_mtime = BodyStore(code).mtime() if code else None
+        st.dataframe(load_preview(csv_path, code, bodies_mtime))
+
+
 tab1, tab2 = st.tabs(["데이터 수집", "본문 수집"])
 
 with tab1:
@@ -27,21 +65,18 @@ with tab1:
     st.markdown(f"**선택한 기준 날짜 및 시간:** {threshold_str}")
 
     if st.button("🔄 수집 실행"):
-        with st.spinner("데이터 수집 중..."):
-            df = update_naver(code_input, threshold_str)
-        st.success("수집 완료!")
-        log_path = os.path.join(BASE_DIR, "naver_board_log.txt")
-        if os.path.exists(log_path):
-            logs = open(log_path, encoding="utf-8").read().splitlines()
-            if logs:
-                st.markdown("### 📝 최근 수집 로그")
-                st.code(logs[-1], language="text")
-
-        csv_path = os.path.join(DATA_DIR, f"{code_input}_board.csv")
-        if os.path.exists(csv_path):
-            df_updated = pd.read_csv(csv_path, encoding="utf-8-sig")
-            st.markdown("### 📊 업데이트된 데이터 미리보기")
-            st.dataframe(df_updated.head())
+        key = f"naver:board:{code_input}"
+        running = jobs.active([key, *job_claims(code_input)])
+        if running is not None:
+            st.info(f"'{running['label']}' 작업이 이미 실행 중입니다. 끝난 뒤 다시 실행하세요.")
+        else:
+            jobs.submit(key, f"{code_input} 게시글 수집",
+                        lambda report, code=code_input, threshold=threshold_str: update_naver(
+                            code, threshold, progress=lambda pages, rows: report(pages, unit="페이지", note=f"신규 {rows}개")),
+                        claims=job_claims(code_input))
+
+    show_jobs(f"naver:board:{code_input}", os.path.join(DATA_DIR, f"{code_input}_board.csv"),
+              "### 📊 업데이트된 데이터 미리보기", log_path=os.path.join(BASE_DIR, "naver_board_log.txt"))
 
 with tab2:
     st.markdown("### 네이버페이증권 본문 업데이트")
@@ -50,10 +85,16 @@ with tab2:
     selected_code = st.selectbox("종목 코드 선택", codes)
 
     if st.button("🔄 본문 업데이트 실행"):
-        with st.spinner(f"{selected_code} 본문 업데이트 중..."):
-            update_bodies(selected_code)
-        st.success("본문 업데이트 완료!")
-        csv_path = os.path.join(DATA_DIR, f"{selected_code}_board.csv")
-        df_preview = pd.read_csv(csv_path, encoding="utf-8-sig")
-        st.markdown("### 📄 본문 포함 데이터 미리보기")
-        st.dataframe(df_preview.head())
+        key = f"naver:body:{selected_code}"
+        running = jobs.active([key, *job_claims(selected_code)])
+        if running is not None:
+            st.info(f"'{running['label']}' 작업이 이미 실행 중입니다. 끝난 뒤 다시 실행하세요.")
+        else:
+            jobs.submit(key, f"{selected_code} 본문 업데이트",
+                        lambda report, code=selected_code: update_bodies(
+                            code, progress=lambda done, total: report(done, total, "게시글")),
+                        claims=job_claims(selected_code))
+
+    if selected_code:
+        show_jobs(f"naver:body:{selected_code}", os.path.join(DATA_DIR, f"{selected_code}_board.csv"),
+                  "### 📄 본문 포함 데이터 미리보기", code=selected_code)
@@ -1,11 +1,12 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
+from module import datasets
 
 st.set_page_config(page_title="🚗 Global Car Sales", layout="wide")
 st.title("Global Car Sales")
 
-@st.cache_data
+@datasets.cached(lambda region, path: path)
 def load_region_data(region: str, path: str) -> pd.DataFrame:
     df = pd.read_excel(path, engine="openpyxl")
     cols = df.columns.tolist()
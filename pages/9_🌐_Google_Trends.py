@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import os
+from module import datasets
 
 st.set_page_config(
     page_title="Google Trends",
@@ -8,7 +9,7 @@ st.set_page_config(
 )
 st.title("🌐 Google Trends Analysis")
 
-@st.cache_data
+@datasets.cached("data/vtuber_5.csv")
 def load_data():
     csv_path = os.path.join("data", "vtuber_5.csv")
     df = pd.read_csv(csv_path, encoding="utf-8", skiprows=1)
@@ -58,7 +59,7 @@ st.subheader("📈 VTuber 키워드 검색량 추이")
 st.line_chart(filtered_df)
 
 # 추가: vtuber20 데이터의 line plot (2018-01-01 이후, 필터링 없음)
-@st.cache_data
+@datasets.cached("data/vtuber_20.csv")
 def load_data_vtuber20():
     csv_path = os.path.join("data", "vtuber_20.csv")
     df20 = pd.read_csv(csv_path, encoding="utf-8", skiprows=1)
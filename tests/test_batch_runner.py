@@ -0,0 +1,25 @@
+from module import batch_runner
+
+
+def test_run_all_records_errors_per_target():
+    def work(target, result):
+        result["code"] = target
+        if target == "bad":
+            raise RuntimeError("503 Server Error")
+
+    done = []
+    results = batch_runner.run_all(["ok", "bad"], work, workers=2, on_done=done.append)
+    by_code = {r["code"]: r for r in results}
+    assert by_code["ok"]["error"] is None
+    assert by_code["bad"]["error"] == "503 Server Error"
+    assert len(done) == 2 and all("seconds" in r for r in results)
+
+
+def test_parse_args_reads_options_flags_and_target_file(tmp_path):
+    codes = tmp_path / "codes.txt"
+    codes.write_text("# 종목\n005930\n\n012450\n", encoding="utf-8")
+    specs, options = batch_runner.parse_args(
+        ["009830", "-f", str(codes), "--since", "2025.05.17 00:00", "--workers", "3", "--with-comments"],
+        {"since": None, "workers": 5}, flags=("with-comments",))
+    assert specs == ["009830", "005930", "012450"]
+    assert options == {"since": "2025.05.17 00:00", "workers": 3, "with_comments": True}
@@ -0,0 +1,53 @@
+import os
+
+import pandas as pd
+import pytest
+
+from module import checkpoint
+
+
+def read(path):
+    return pd.read_csv(path, encoding="utf-8-sig")["n"].tolist()
+
+
+def test_atomic_write_keeps_the_old_file_when_interrupted(tmp_path):
+    path = str(tmp_path / "posts.csv")
+    checkpoint.write_csv(pd.DataFrame({"n": [1, 2]}), path)
+    with pytest.raises(RuntimeError):
+        with checkpoint.atomic_write(path, "w", encoding="utf-8") as f:
+            f.write("n\n9\n")
+            raise RuntimeError("중단")
+    assert read(path) == [1, 2]
+    assert os.listdir(tmp_path) == ["posts.csv"]
+
+
+def test_interrupted_append_is_rolled_back_and_resumed(tmp_path):
+    path = str(tmp_path / "posts.csv")
+    checkpoint.write_csv(pd.DataFrame({"n": [1, 2]}), path)
+
+    def crash():
+        raise RuntimeError("인덱스 저장 중 중단")
+
+    # 행은 추가됐지만 done()에서 중단: 저널이 남음
+    with pytest.raises(RuntimeError):
+        checkpoint.append_csv(pd.DataFrame({"n": [3, 4]}), path, done=crash)
+    assert read(path) == [1, 2, 3, 4]
+    assert os.path.exists(path + ".journal")
+
+    # 다음 실행: 추가 전으로 되돌린 뒤 다시 추가
+    assert checkpoint.recover(path)
+    assert read(path) == [1, 2]
+    assert not checkpoint.recover(path)
+    checkpoint.append_csv(pd.DataFrame({"n": [3, 4]}), path)
+    assert read(path) == [1, 2, 3, 4]
+    assert not os.path.exists(path + ".journal")
+
+
+def test_checkpoint_save_load_clear(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path))
+    ckpt = checkpoint.Checkpoint("000000_bodies")
+    assert ckpt.load() is None
+    ckpt.save(position=41, total=100)
+    assert checkpoint.Checkpoint("000000_bodies").load() == {"position": 41, "total": 100}
+    ckpt.clear()
+    assert ckpt.load() is None
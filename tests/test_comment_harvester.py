@@ -0,0 +1,67 @@
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from module import comment_harvester
+
+
+def fake_comments(reddit, post_id, existing_ids=None):
+    for i in range(200):
+        yield {
+            "post_id": post_id,
+            "comment_id": f"{post_id}_{i}",
+            "comment_author": "author",
+            "comment_body": "body",
+            "comment_time": datetime(2025, 5, 1, tzinfo=timezone.utc),
+            "comment_score": 1,
+        }
+
+
+def test_harvest_raises_instead_of_hanging_when_on_chunk_fails(monkeypatch):
+    monkeypatch.setattr(comment_harvester, "iter_comments", fake_comments)
+    monkeypatch.setattr(comment_harvester, "QUEUE_SIZE", 5)
+    monkeypatch.setattr(comment_harvester, "PUT_TIMEOUT", 0.05)
+
+    def on_chunk(df):
+        raise OSError("disk full")
+
+    outcome = {}
+
+    def run():
+        try:
+            comment_harvester.harvest(lambda: None, [f"p{i}" for i in range(20)], on_chunk, workers=4, chunk_size=3)
+        except OSError as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "harvest()가 작업자를 기다리며 멈춤"
+    assert str(outcome["error"]) == "disk full"
+
+
+def test_harvest_collects_all_comments(monkeypatch):
+    monkeypatch.setattr(comment_harvester, "iter_comments", fake_comments)
+    monkeypatch.setattr(comment_harvester, "QUEUE_SIZE", 5)
+    chunks = []
+
+    result = comment_harvester.harvest(lambda: None, ["a", "b", "c"], chunks.append, workers=2, chunk_size=7)
+    assert result == {"posts": 3, "comments": 600, "failed": []}
+    assert sum(len(c) for c in chunks) == 600
+
+
+def test_save_failed_keeps_previous_list_when_write_is_interrupted(tmp_path, monkeypatch):
+    monkeypatch.setattr(comment_harvester, "DATA_DIR", str(tmp_path))
+    comment_harvester.save_failed("sub_comments", ["b", "a"])
+
+    def interrupted(obj, f):
+        f.write("[")
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(comment_harvester.json, "dump", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        comment_harvester.save_failed("sub_comments", ["c"])
+    monkeypatch.undo()
+    monkeypatch.setattr(comment_harvester, "DATA_DIR", str(tmp_path))
+    assert comment_harvester.load_failed("sub_comments") == ["a", "b"]
@@ -0,0 +1,51 @@
+import os
+
+import pandas as pd
+import pytest
+
+from module import datasets
+
+
+@pytest.fixture(autouse=True)
+def arrow_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets, "ARROW_DIR", str(tmp_path / "arrow_cache"))
+    yield
+    datasets.clear()
+
+
+def make_loader(path):
+    @datasets.cached(str(path))
+    def load():
+        return pd.read_csv(path)
+    return load
+
+
+def test_string_columns_are_zero_copy_views(tmp_path):
+    path = tmp_path / "posts.csv"
+    pd.DataFrame({"title": ["a", "b", "c"], "score": [1, 2, 3]}).to_csv(path, index=False)
+    view = make_loader(path)()
+    bounds = datasets._views[-1][3]
+    assert list(view["title"]) == ["a", "b", "c"]
+    assert datasets._zero_copy(view["title"].array, bounds)
+    assert datasets._zero_copy(view["score"].array, bounds)
+
+
+def test_file_is_kept_until_its_views_are_gone(tmp_path):
+    path = tmp_path / "posts.csv"
+    pd.DataFrame({"title": ["a"]}).to_csv(path, index=False)
+    load = make_loader(path)
+    view = load()
+    old_path = datasets._views[-1][4]
+
+    datasets.invalidate(str(path))
+    assert os.path.exists(old_path)
+
+    # 다시 읽으면 이전 뷰가 가리키는 파일과 다른 파일에 씀
+    new_view = load()
+    assert datasets._views[-1][4] != old_path
+    assert list(view["title"]) == ["a"]
+
+    del view
+    load()
+    assert not os.path.exists(old_path)
+    assert list(new_view["title"]) == ["a"]
@@ -0,0 +1,62 @@
+import numpy as np
+
+from module import id_index
+from module.id_index import IdIndex, BloomFilter
+
+
+def test_contains_add_save_reload_base36(tmp_path):
+    path = str(tmp_path / "_index.npy")
+    index = IdIndex(path, base=36, bloom=True)
+    assert not index.on_disk()
+    assert not index.contains(["1kx9a2"]).any()
+
+    index.add(["1kx9a2", "zz", "1kx9a2", "a"])
+    assert len(index) == 3
+    assert index.contains(["a", "b", "zz", "1kx9a2"]).tolist() == [True, False, True, True]
+    index.save()
+
+    # 다른 프로세스처럼 새로 연 인덱스와, 파일이 바뀐 뒤 reload한 인덱스 모두 같은 내용을 봄
+    other = IdIndex(path, base=36, bloom=True)
+    assert "zz" in other and "b" not in other
+    index.add(["b"])
+    index.save()
+    other.reload()
+    assert other.contains(["a", "b", "zz", "1kx9a2"]).all()
+    assert IdIndex(path, base=36, bloom=True).bloom is not None
+
+
+def test_base10_keys(tmp_path):
+    index = IdIndex(str(tmp_path / "000000_nid.npy"), base=10, bloom=True)
+    index.add([305123456, "305123457", 10])
+    index.save()
+    index = IdIndex(str(tmp_path / "000000_nid.npy"), base=10, bloom=True)
+    assert index.contains(["305123456", 305123457, "10", "11"]).tolist() == [True, True, True, False]
+    # 같은 문자열이라도 36진수와 10진수는 다른 키
+    assert id_index.to_ints(["10"], base=10)[0] == 10
+    assert id_index.to_ints(["10"], base=36)[0] == 36
+
+
+def test_bloom_resize_keeps_every_key(tmp_path):
+    index = IdIndex(str(tmp_path / "_index.npy"), base=10, bloom=True)
+    index.add(range(10))
+    first_bits = index.bloom.n_bits
+    for start in range(10, 5000, 500):
+        index.add(range(start, start + 500))
+    assert index.bloom.n_bits > first_bits
+    assert index.bloom.n_bits >= len(index) * id_index.BLOOM_BITS_PER_KEY
+    # Bloom 필터에 거짓 음성이 있으면 이미 있는 id를 새 id로 보고 행이 중복 저장됨
+    assert index.contains(range(5010)).all()
+    index.save()
+    reloaded = IdIndex(index.path, base=10, bloom=True)
+    assert reloaded.bloom.n_bits == index.bloom.n_bits
+    assert reloaded.contains(range(5010)).all()
+    assert not reloaded.contains(range(5010, 5100)).any()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000 * id_index.BLOOM_BITS_PER_KEY)
+    keys = np.arange(0, 1000 * 7919, 7919, dtype=np.int64)
+    bloom.add(keys)
+    assert bloom.might_contain(keys).all()
+    others = np.arange(1, 10000 * 7919, 7919, dtype=np.int64)
+    assert bloom.might_contain(others).mean() < 0.05
@@ -0,0 +1,76 @@
+import time
+import threading
+
+import pytest
+
+from module import jobs, batch_collect, naver_board
+
+
+@pytest.fixture(autouse=True)
+def jobs_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOBS_PATH", str(tmp_path / "jobs.json"))
+
+
+def wait_done(job, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if jobs.get(job["id"])["status"] not in jobs.ACTIVE:
+            return
+        time.sleep(0.01)
+    raise AssertionError("작업이 끝나지 않음")
+
+
+def test_jobs_sharing_a_dataset_do_not_run_together():
+    release = threading.Event()
+    hoka = [jobs.dataset_key(name) for name in batch_collect.batch_datasets(["r/hoka"])]
+    batch = [jobs.dataset_key(name) for name in batch_collect.batch_datasets(["r/handbags", "r/Hoka"])]
+
+    first = jobs.submit("reddit:batch:r/Hoka,r/handbags", "일괄", lambda report: release.wait(5), batch)
+    second = jobs.submit("reddit:sub:hoka_subreddit", "r/hoka", lambda report: None, hoka)
+    assert second["id"] == first["id"]
+    assert jobs.active(hoka)["id"] == first["id"]
+
+    release.set()
+    wait_done(first)
+    assert jobs.active(hoka) is None
+    third = jobs.submit("reddit:sub:hoka_subreddit", "r/hoka", lambda report: None, hoka)
+    assert third["id"] != first["id"]
+    wait_done(third)
+
+
+def test_batch_datasets_cover_every_target():
+    assert batch_collect.batch_datasets(["r/Hoka", "hoka", "r/askrunningshoegeeks:hoka"]) == [
+        "askrunningshoegeeks_hoka_posts", "hoka_comments", "hoka_posts", "hoka_subreddit"]
+
+
+def test_finished_jobs_are_trimmed_in_memory(monkeypatch):
+    monkeypatch.setattr(jobs, "KEEP", 3)
+    monkeypatch.setattr(jobs, "_jobs", {})
+    release = threading.Event()
+    running = jobs.submit("test:running", "실행 중", lambda report: release.wait(5))
+    for i in range(5):
+        wait_done(jobs.submit(f"test:{i}", f"작업 {i}", lambda report: None))
+
+    kept = {job["key"] for job in jobs.recent("test:", limit=10)}
+    assert kept == {"test:running", "test:3", "test:4"}
+    release.set()
+    wait_done(running)
+
+
+def test_board_and_body_jobs_for_one_code_do_not_run_together():
+    release = threading.Event()
+    board = jobs.submit("naver:board:005930", "005930 게시글 수집", lambda report: release.wait(5),
+                        naver_board.job_claims("005930"))
+    body = jobs.submit("naver:body:005930", "005930 본문 업데이트", lambda report: None,
+                       naver_board.job_claims("005930"))
+    assert body["id"] == board["id"]
+    other = jobs.submit("naver:body:000660", "000660 본문 업데이트", lambda report: None,
+                        naver_board.job_claims("000660"))
+    assert other["id"] != board["id"]
+
+    release.set()
+    wait_done(board)
+    wait_done(other)
+    body = jobs.submit("naver:body:005930", "005930 본문 업데이트", lambda report: None,
+                       naver_board.job_claims("005930"))
+    assert body["id"] != board["id"]
+    wait_done(body)
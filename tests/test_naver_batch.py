@@ -0,0 +1,20 @@
+from module import naver_batch
+
+
+def test_duplicate_codes_collapse_to_the_earliest_threshold():
+    targets = naver_batch.parse_targets(
+        ["005930", "012450:2025.05.18 09:00", "005930:2025.05.16 23:00", "012450", " "],
+        since="2025.05.17 00:00")
+    assert targets == [
+        {"code": "005930", "threshold": "2025.05.16 23:00"},
+        {"code": "012450", "threshold": "2025.05.17 00:00"},
+    ]
+
+
+def test_run_batch_updates_each_code_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(naver_batch.naver_board, "update",
+                        lambda code, threshold, progress=None, window=None: calls.append((code, threshold)) or [])
+    results = naver_batch.run_batch(["005930", "005930", "005930:2025.05.01 00:00"], since="2025.05.17 00:00")
+    assert calls == [("005930", "2025.05.01 00:00")]
+    assert len(results) == 1
@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from module import naver_board, cursors
+
+CODE = "000000"
+PER_PAGE = 20
+START = datetime(2025, 5, 1)
+
+
+class FakeBoard:
+    """
+    네이버 게시판 대역. nid 1..n, nid가 클수록 최신(1분 간격), 1페이지가 가장 최신입니다.
+    """
+
+    def __init__(self, newest):
+        self.newest = newest
+        self.requests = 0
+
+    def date(self, nid):
+        return START + timedelta(minutes=nid)
+
+    def rows(self, page):
+        top = self.newest - (page - 1) * PER_PAGE
+        return [(self.date(nid).strftime("%Y.%m.%d %H:%M"), f"title {nid}",
+                 f"/item/board_read.naver?code={CODE}&nid={nid}", "writer", "1", "0", "0")
+                for nid in range(top, max(top - PER_PAGE, 0), -1)]
+
+
+class FakeResponse:
+    def __init__(self, page):
+        self.content = page
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def board(tmp_path, monkeypatch):
+    fake = FakeBoard(newest=100)
+
+    def get(url, **kwargs):
+        fake.requests += 1
+        return FakeResponse(int(url.rsplit("page=", 1)[1]))
+
+    monkeypatch.setattr(naver_board, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(naver_board, "LOG_PATH", str(tmp_path / "log.txt"))
+    monkeypatch.setattr(cursors, "CURSOR_PATH", str(tmp_path / "cursors.json"))
+    monkeypatch.setattr(naver_board.request_policy, "get", get)
+    monkeypatch.setattr(naver_board.naver_parse, "board_rows", lambda page: fake.rows(page) or None)
+    return fake
+
+
+def stored_nids(tmp_path):
+    df = pd.read_csv(tmp_path / f"{CODE}_board.csv", encoding="utf-8-sig", dtype=naver_board.DTYPES)
+    return df["nid"].tolist()
+
+
+def fmt(nid):
+    return (START + timedelta(minutes=nid)).strftime("%Y.%m.%d %H:%M")
+
+
+def test_update_after_newer_backfill_has_no_gap(board, tmp_path):
+    threshold = fmt(1)
+    naver_board.update(CODE, threshold, window=1)
+    assert sorted(stored_nids(tmp_path)) == list(range(1, 101))
+    assert naver_board.watermark(CODE) == 100
+
+    # 새 글 101..300이 올라온 뒤, 커서보다 새로운 구간(250..270)만 먼저 백필
+    board.newest = 300
+    naver_board.backfill(CODE, fmt(250), fmt(270), window=1)
+    assert naver_board.watermark(CODE) == 100
+
+    added = naver_board.update(CODE, threshold, window=1)
+    assert sorted(added["nid"]) == [n for n in range(101, 301) if not 250 <= n <= 270]
+    assert sorted(stored_nids(tmp_path)) == list(range(1, 301))
+    assert naver_board.watermark(CODE) == 300
+
+
+def test_update_skips_posts_saved_before_cursor_moved(board, tmp_path, monkeypatch):
+    threshold = fmt(1)
+    # CSV 저장 후 커서를 옮기기 전에 중단된 경우
+    save = cursors.save
+    monkeypatch.setattr(cursors, "save", lambda *args: None)
+    naver_board.update(CODE, threshold, window=1)
+    assert naver_board.watermark(CODE) is None
+
+    monkeypatch.setattr(cursors, "save", save)
+    added = naver_board.update(CODE, threshold, window=1)
+    assert added.empty
+    assert sorted(stored_nids(tmp_path)) == list(range(1, 101))
+    assert naver_board.watermark(CODE) == 100
+
+
+def fake_crawl_page(board, last_page=None):
+    """
+    PageProbe용 crawl_page 대역. last_page가 주어지면 그 뒤 페이지도 마지막 페이지를 다시 보여 줍니다.
+    """
+    def crawl_page(page, threshold, code, last_nid=None):
+        if last_page is not None:
+            page = min(page, last_page)
+        return [{"date": board.date(nid), "nid": nid} for nid in range(
+            board.newest - (page - 1) * PER_PAGE, board.newest - page * PER_PAGE, -1)], False
+    return crawl_page
+
+
+def test_first_page_stops_when_pages_repeat(monkeypatch):
+    board = FakeBoard(newest=10 * PER_PAGE)
+    monkeypatch.setattr(naver_board, "crawl_page", fake_crawl_page(board, last_page=10))
+    probe = naver_board.PageProbe(CODE)
+    # 모든 글보다 이전 날짜: 마지막 페이지를 지나야 만족
+    page = probe.first_page(START)
+    assert page > 10
+    assert probe(page) == []
+    assert probe.probes < 15
+    # 마지막 페이지의 게시글은 한 페이지에만 남음
+    assert len([p for p, posts in probe.pages.items() if posts and posts[-1]["nid"] == 1]) == 1
+
+
+def test_first_page_stops_at_max_page(monkeypatch):
+    board = FakeBoard(newest=10 ** 9)
+    monkeypatch.setattr(naver_board, "crawl_page", fake_crawl_page(board))
+    probe = naver_board.PageProbe(CODE)
+    assert probe.first_page(START, max_page=50) == 50
+    assert probe.probes == 7    # 1, 2, 4, 8, 16, 32, 50
+
+
+def test_read_posts_returns_newest_first_after_backfill(board, tmp_path):
+    naver_board.backfill(CODE, fmt(50), fmt(80), window=1)
+    naver_board.update(CODE, fmt(1), window=1)
+    # CSV는 추가한 순서 (backfill 80..50 뒤에 update 100..81, 49..1)
+    assert stored_nids(tmp_path) == list(range(80, 49, -1)) + list(range(100, 80, -1)) + list(range(49, 0, -1))
+    df = naver_board.read_posts(str(tmp_path / f"{CODE}_board.csv"))
+    assert df["nid"].tolist() == list(range(100, 0, -1))
+
+
+def test_update_resumes_after_interrupted_append(board, tmp_path, monkeypatch):
+    naver_board.update(CODE, fmt(1), window=1)
+    board.newest = 150
+
+    # CSV에 101..150을 추가한 뒤 인덱스 저장 전에 중단
+    save = naver_board.IdIndex.save
+
+    def crash(self):
+        raise RuntimeError("중단")
+    monkeypatch.setattr(naver_board.IdIndex, "save", crash)
+    with pytest.raises(RuntimeError):
+        naver_board.update(CODE, fmt(1), window=1)
+    assert len(stored_nids(tmp_path)) == 150
+
+    monkeypatch.setattr(naver_board.IdIndex, "save", save)
+    added = naver_board.update(CODE, fmt(1), window=1)
+    assert sorted(added["nid"]) == list(range(101, 151))
+    assert sorted(stored_nids(tmp_path)) == list(range(1, 151))
+    df = naver_board.read_posts(str(tmp_path / f"{CODE}_board.csv"))
+    assert df["nid"].tolist() == list(range(150, 0, -1))
+
+
+def test_backfill_during_update_does_not_duplicate_rows(board, tmp_path, monkeypatch):
+    naver_board.update(CODE, fmt(1), window=1)
+    board.newest = 200
+
+    # update가 크롤링하는 동안 같은 구간을 backfill이 먼저 저장
+    crawl_pages = naver_board.crawl_pages
+
+    def crawl_during_backfill(*args, **kwargs):
+        posts = crawl_pages(*args, **kwargs)
+        naver_board.backfill(CODE, fmt(120), fmt(180), window=1)
+        return posts
+    monkeypatch.setattr(naver_board, "crawl_pages", crawl_during_backfill)
+
+    added = naver_board.update(CODE, fmt(1), window=1)
+    assert sorted(added["nid"]) == [n for n in range(101, 201) if not 120 <= n <= 180]
+    assert sorted(stored_nids(tmp_path)) == list(range(1, 201))
+    assert len(naver_board.nid_index(CODE)) == 200
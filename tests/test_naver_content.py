@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+import requests
+
+from module import naver_content, body_store, checkpoint
+
+CODE = "000000"
+BodyStore = body_store.BodyStore
+
+
+class FakeResponse:
+    def __init__(self, status, text=""):
+        self.status_code = status
+        self.content = text
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+@pytest.fixture
+def board(tmp_path, monkeypatch):
+    """
+    nid 1..10 게시글 CSV. responses[nid]로 본문 응답을 정합니다. (기본: 200, "body {nid}")
+    """
+    df = pd.DataFrame({"nid": range(1, 11), "url": [f"https://example.com/read?nid={n}" for n in range(1, 11)]})
+    df.to_csv(tmp_path / f"{CODE}_board.csv", index=False, encoding="utf-8-sig")
+    responses = {}
+
+    def get(url, **kwargs):
+        nid = int(url.rsplit("nid=", 1)[1])
+        return responses.get(nid, FakeResponse(200, f"body {nid}"))
+
+    monkeypatch.setattr(naver_content, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(naver_content.body_store, "BodyStore", lambda code: BodyStore(code, data_dir=str(tmp_path)))
+    monkeypatch.setattr(naver_content.request_policy, "get", get)
+    monkeypatch.setattr(naver_content.naver_parse, "body_text", lambda content: content)
+    return responses
+
+
+def test_extract_body_returns_empty_only_for_deleted_posts(board):
+    board[3] = FakeResponse(404)
+    board[4] = FakeResponse(503)
+    assert naver_content.extract_body("https://example.com/read?nid=1") == "body 1"
+    assert naver_content.extract_body("https://example.com/read?nid=3") == ""
+    with pytest.raises(requests.HTTPError):
+        naver_content.extract_body("https://example.com/read?nid=4")
+
+
+def test_update_bodies_keeps_progress_and_raises_on_failure(board):
+    board[6] = FakeResponse(503)
+    with pytest.raises(requests.HTTPError):
+        naver_content.update_bodies(CODE, workers=1, flush_every=100)
+    assert BodyStore(CODE, data_dir=naver_content.DATA_DIR).nids() == {1, 2, 3, 4, 5}
+
+    del board[6]
+    naver_content.update_bodies(CODE, workers=1, flush_every=100)
+    assert BodyStore(CODE, data_dir=naver_content.DATA_DIR).nids() == set(range(1, 11))
+
+
+def test_update_bodies_does_not_refetch_empty_bodies(board, monkeypatch):
+    board[3] = FakeResponse(404)
+    board[7] = FakeResponse(200, "")
+    naver_content.update_bodies(CODE, workers=1)
+    store = BodyStore(CODE, data_dir=naver_content.DATA_DIR)
+    assert store.nids() == set(range(1, 11))
+    assert store.get(3) == "" and store.get(7) == ""
+
+    def fail(url, **kwargs):
+        raise AssertionError(f"다시 요청함: {url}")
+
+    monkeypatch.setattr(naver_content.request_policy, "get", fail)
+    naver_content.update_bodies(CODE, workers=1)
@@ -0,0 +1,137 @@
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from module import post_store
+
+DATASET = "test_subreddit"
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(post_store, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(post_store, "STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(post_store, "_indexes", {})
+
+
+def posts(ids, times, score=1):
+    return pd.DataFrame({
+        "id": ids,
+        "subreddit": "sub",
+        "title": [f"title {i}" for i in ids],
+        "time": pd.to_datetime(times, utc=True),
+        "score": score,
+        "num_comments": 0,
+    })
+
+
+def fragments(dataset=DATASET):
+    return {month: len(post_store._fragments(path)) for month, path in post_store._month_dirs(dataset)}
+
+
+def test_first_append_imports_legacy_csv(tmp_path):
+    old = posts(["a1", "a2", "a1"], ["2025-04-30 10:00", "2025-05-01 09:00", "2025-04-30 10:00"])
+    old.to_csv(tmp_path / f"{DATASET}.csv", index=False, encoding="utf-8-sig")
+    # 저장소가 생기기 전에는 CSV를 그대로 읽음
+    assert sorted(post_store.read(DATASET)["id"]) == ["a1", "a1", "a2"]
+
+    added = post_store.append(DATASET, posts(["a2", "a3"], ["2025-05-01 09:00", "2025-05-02 09:00"]))
+    assert added == 1
+    assert post_store.exists(DATASET)
+    assert post_store.read(DATASET)["id"].tolist() == ["a3", "a2", "a1"]
+    assert fragments() == {"2025-04": 1, "2025-05": 2}
+
+
+def test_append_compact_read_round_trip():
+    batches = [
+        posts(["b1", "b2"], ["2025-04-10 00:00", "2025-05-10 00:00"]),
+        posts(["b3"], ["2025-05-11 00:00"]),
+        posts(["b3", "b4"], ["2025-05-11 00:00", "2025-06-01 00:00"]),
+    ]
+    assert [post_store.append(DATASET, b) for b in batches] == [2, 1, 1]
+    before = post_store.read(DATASET)
+    assert fragments() == {"2025-04": 1, "2025-05": 2, "2025-06": 1}
+
+    post_store.compact(DATASET)
+    assert fragments() == {"2025-04": 1, "2025-05": 1, "2025-06": 1}
+    after = post_store.read(DATASET)
+    pd.testing.assert_frame_equal(after, before)
+    assert after["id"].tolist() == ["b4", "b3", "b2", "b1"]
+    assert str(after["time"].dt.tz) == "UTC"
+    assert post_store.count(DATASET) == 4
+
+
+def test_append_compacts_a_month_at_the_threshold(monkeypatch):
+    monkeypatch.setattr(post_store, "COMPACT_THRESHOLD", 3)
+    for i in range(3):
+        post_store.append(DATASET, posts([f"c{i}"], [f"2025-05-0{i + 1} 00:00"]))
+    assert fragments() == {"2025-05": 1}
+    assert post_store.read(DATASET)["id"].tolist() == ["c2", "c1", "c0"]
+
+
+def test_read_prunes_months_outside_the_time_bounds(monkeypatch):
+    post_store.append(DATASET, posts(["d1", "d2", "d3", "d4"],
+                                     ["2025-03-31 23:00", "2025-04-01 00:00", "2025-04-30 23:59", "2025-05-01 00:00"]))
+    opened = []
+    read_parquet = pd.read_parquet
+    monkeypatch.setattr(pd, "read_parquet", lambda path, **kwargs: opened.append(path) or read_parquet(path, **kwargs))
+
+    df = post_store.read(DATASET, columns=["id"], start=date(2025, 4, 1), end=date(2025, 4, 30))
+    assert df["id"].tolist() == ["d3", "d2"]
+    assert df.columns.tolist() == ["id"]
+    assert {os.path.basename(os.path.dirname(p)) for p in opened} == {"month=2025-04"}
+
+    opened.clear()
+    assert post_store.read(DATASET, start=date(2025, 4, 15))["id"].tolist() == ["d4", "d3"]
+    assert {os.path.basename(os.path.dirname(p)) for p in opened} == {"month=2025-04", "month=2025-05"}
+    assert len(post_store.read(DATASET)) == 4
+
+
+def test_time_bounds_come_from_parquet_statistics(monkeypatch):
+    assert post_store.time_bounds(DATASET) == (None, None)
+    post_store.append(DATASET, posts(["e1", "e2", "e3"], ["2025-05-20 12:00", "2025-04-02 01:00", "2025-06-03 23:00"]))
+    monkeypatch.setattr(post_store, "read", lambda *args, **kwargs: pytest.fail("데이터를 읽으면 안 됨"))
+    assert post_store.time_bounds(DATASET) == (date(2025, 4, 2), date(2025, 6, 3))
+
+
+def assert_rollup_current(dataset=DATASET):
+    """
+    저장된 rollup이 지금 저장소와 맞고, 처음부터 다시 집계한 값과 같은지 확인합니다.
+    """
+    stored = post_store._load_rollup(dataset)
+    assert stored is not None
+    pd.testing.assert_frame_equal(stored, post_store._build_rollup(dataset), check_dtype=False)
+
+
+def test_rollup_is_maintained_by_append_and_update_metrics(monkeypatch):
+    build = post_store._build_rollup
+    post_store.append(DATASET, posts(["f1", "f2"], ["2025-05-01 10:00", "2025-05-01 23:00"], score=2))
+    assert_rollup_current()
+
+    # 이후 append는 새 행의 집계만 더함 (전체 다시 집계하지 않음)
+    monkeypatch.setattr(post_store, "_build_rollup", lambda *args, **kwargs: pytest.fail("전체 집계"))
+    post_store.append(DATASET, posts(["f2", "f3", "f4"], ["2025-05-01 23:00", "2025-05-02 00:00", "2025-06-15 08:00"]))
+    monkeypatch.setattr(post_store, "_build_rollup", build)
+    assert_rollup_current()
+
+    # update_metrics는 지표가 바뀐 게시글의 날짜만 다시 집계
+    post_store.update_metrics(DATASET, pd.DataFrame({"id": ["f1", "f4"], "score": [10, 7], "num_comments": [3, 1]}))
+    assert_rollup_current()
+    post_store.update_metrics(DATASET, pd.DataFrame({"id": ["f3"], "num_comments": [5]}))
+    assert_rollup_current()
+
+    days = post_store.rollup(DATASET, start=date(2025, 5, 1), end=date(2025, 5, 2))
+    assert days["post_count"].tolist() == [2, 1]
+    assert days["score_sum"].tolist() == [12, 1]
+    assert days["num_comments_sum"].tolist() == [3, 5]
+
+
+def test_rollup_is_rebuilt_when_the_store_changes_behind_it():
+    post_store.append(DATASET, posts(["g1"], ["2025-05-01 10:00"]))
+    # rollup을 거치지 않고 조각을 추가 (예전 코드, 중단된 쓰기)
+    post_store._write_partitioned(DATASET, post_store._prepare(posts(["g2"], ["2025-05-03 10:00"]), "id", "time"), "time")
+    assert post_store._load_rollup(DATASET) is None
+    assert post_store.rollup(DATASET)["post_count"].sum() == 2
+    assert_rollup_current()
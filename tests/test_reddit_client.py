@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from module import reddit_client
+
+SECRETS = {
+    "REDDIT_CLIENT_ID": "id",
+    "REDDIT_CLIENT_SECRET": "secret",
+    "USERNAME": "user",
+    "PASSWORD": "password",
+    "REDDIT_USER_AGENT": "test-agent",
+}
+
+
+def http_session(reddit):
+    return reddit._core._authorizer._authenticator._requestor._http
+
+
+@pytest.fixture
+def fresh_clients(monkeypatch):
+    monkeypatch.setattr(reddit_client, "_local", threading.local())
+    monkeypatch.setattr(reddit_client, "_idle", [])
+    monkeypatch.setattr(reddit_client, "_created", 0)
+    monkeypatch.setattr(reddit_client, "_secrets_cache", None)
+    monkeypatch.setattr(reddit_client, "_secrets", lambda: SECRETS)
+
+
+def test_get_reddit_gives_each_thread_its_own_client(fresh_clients):
+    main = reddit_client.get_reddit()
+    assert reddit_client.get_reddit() is main
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(reddit_client.get_reddit()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main
+    # 연결 풀은 스레드끼리 공유
+    assert http_session(other[0]) is http_session(main)
+
+
+def test_finished_threads_return_their_client_to_the_pool(fresh_clients):
+    main = reddit_client.get_reddit()
+
+    def run_workers(n):
+        clients, barrier = [], threading.Barrier(n)
+
+        def worker():
+            clients.append(reddit_client.get_reddit())
+            barrier.wait()   # 동시에 빌린 상태를 만듦
+        threads = [threading.Thread(target=worker) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return clients
+
+    first = run_workers(3)
+    assert len({id(c) for c in first}) == 3 and main not in first
+    # 새 작업자 스레드들은 끝난 스레드의 클라이언트(와 토큰)를 이어 씀
+    second = run_workers(3)
+    assert {id(c) for c in second} == {id(c) for c in first}
+    assert reddit_client.clients_created() == 4
+
+
+def test_prawcore_leaves_retries_to_request_policy(fresh_clients):
+    reddit = reddit_client.get_reddit()
+    for core in (reddit._authorized_core, reddit._read_only_core):
+        if core is not None:
+            assert not core.RETRY_STATUSES
+            assert core.RETRY_EXCEPTIONS == ()
+
+
+def test_single_retry_layer_warns_when_prawcore_attributes_are_missing(monkeypatch, capsys):
+    monkeypatch.setattr(reddit_client, "_warned", False)
+
+    class Client:
+        _authorized_core = object()
+        _read_only_core = None
+
+    reddit_client._single_retry_layer(Client())
+    reddit_client._single_retry_layer(object())
+    assert capsys.readouterr().out.count("prawcore 재시도를 끄지 못했습니다") == 1
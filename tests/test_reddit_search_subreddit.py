@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from module import reddit_search_subreddit, cursors
+
+
+class FakeListing:
+    """
+    subreddit(name).new()가 posts개를 돌려준 뒤 error를 발생시키는 praw 대역.
+    """
+
+    def __init__(self, posts, error=None):
+        self.posts = posts
+        self.error = error
+
+    def subreddit(self, name):
+        return self
+
+    def new(self, limit=None):
+        yield from self.posts
+        if self.error is not None:
+            raise self.error
+
+
+def test_get_new_posts_raises_instead_of_returning_a_truncated_listing(tmp_path, monkeypatch):
+    monkeypatch.setattr(cursors, "CURSOR_PATH", str(tmp_path / "cursors.json"))
+    monkeypatch.setattr(reddit_search_subreddit, "get_reddit", lambda: FakeListing([], RuntimeError("503 Server Error")))
+    scan = cursors.ListingScan("test:new:sub", 100)
+    with pytest.raises(RuntimeError):
+        reddit_search_subreddit.get_new_posts("sub", scan=scan)
+    assert not scan.complete
+
+
+class FakePost:
+    def __init__(self, n):
+        self.id = f"x{n + 100}"   # Reddit id처럼 36진수
+        self.created_utc = datetime.now(timezone.utc).timestamp() - n * 60
+        self.subreddit = self
+        self.display_name = "sub"
+        self.title = self.selftext = ""
+        self.score = self.num_comments = 0
+
+
+def run_update(tmp_path, monkeypatch, board):
+    monkeypatch.setattr(cursors, "CURSOR_PATH", str(tmp_path / "cursors.json"))
+    monkeypatch.setattr(reddit_search_subreddit.post_store, "STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(reddit_search_subreddit, "LOG_PATH", str(tmp_path / "log.txt"))
+    monkeypatch.setattr(reddit_search_subreddit, "LIMIT", 10)
+    get_new_posts = reddit_search_subreddit.get_new_posts
+    monkeypatch.setattr(reddit_search_subreddit, "get_new_posts",
+                        lambda subreddit, scan=None: get_new_posts(subreddit, limit=10, scan=scan))
+    monkeypatch.setattr(reddit_search_subreddit, "get_reddit", lambda: board)
+
+    def update():
+        reddit_search_subreddit.update("sub")
+        return (tmp_path / "log.txt").read_text(encoding="utf-8").splitlines()[-1]
+    return update
+
+
+def test_update_sets_first_cursor_and_moves_it_when_listing_hits_limit(tmp_path, monkeypatch):
+    board = FakeListing([FakePost(n) for n in range(25)])
+    update = run_update(tmp_path, monkeypatch, board)
+    target = "sub_subreddit:new:sub"
+
+    # 첫 실행: 커서가 없으면 limit(10개)까지가 원래 수집 범위이므로 가장 최신 게시글에 커서를 둠
+    update()
+    assert cursors.load(target)["id"] == "x100"
+
+    # 새 글 5개: 커서에 닿아 멈추고 가장 최신 게시글로 커서 이동
+    board.posts = [FakePost(-n) for n in range(5, 0, -1)] + board.posts
+    assert "받지 못함" not in update()
+    assert cursors.load(target)["id"] == "x95"
+
+
+def test_consecutive_truncated_scans_keep_moving_the_cursor(tmp_path, monkeypatch):
+    board = FakeListing([FakePost(n) for n in range(10)])
+    update = run_update(tmp_path, monkeypatch, board)
+    target = "sub_subreddit:new:sub"
+    update()
+    assert cursors.load(target)["id"] == "x100"
+
+    # 실행마다 새 글 20개 (limit 초과): 커서는 가장 최신 게시글로 옮기고, 받지 못한 구간을 로그에 남김
+    for newest in (-20, -40):
+        board.posts = [FakePost(n) for n in range(newest, newest + 20)] + board.posts
+        log = update()
+        assert "10개 제한에 닿아" in log and "받지 못함" in log
+        assert cursors.load(target)["id"] == f"x{newest + 100}"